@@ -9,7 +9,7 @@ from alembic import context
 # Add the parent directory to sys.path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from app.database import CURRENT_DB_URL
+from app.database import get_database_url
 from app.models.qr import Base
 
 # this is the Alembic Config object, which provides
@@ -17,7 +17,7 @@ from app.models.qr import Base
 config = context.config
 
 # override sqlalchemy.url from alembic.ini with value from environment
-config.set_main_option("sqlalchemy.url", CURRENT_DB_URL)
+config.set_main_option("sqlalchemy.url", get_database_url())
 
 # Interpret the config file for Python logging.
 # This line sets up loggers basically.
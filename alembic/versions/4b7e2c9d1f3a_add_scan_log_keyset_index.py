@@ -0,0 +1,36 @@
+"""add_scan_log_keyset_index
+
+Revision ID: 4b7e2c9d1f3a
+Revises: 8d13a4dfeb1d
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b7e2c9d1f3a'
+down_revision: Union[str, None] = '8d13a4dfeb1d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Composite index for keyset pagination of scan logs per QR code
+    conn = op.get_bind()
+    inspector = sa.inspect(conn)
+    indexes = [index['name'] for index in inspector.get_indexes('scan_logs')]
+    if 'ix_scan_logs_qr_code_id_scanned_at_id' not in indexes:
+        op.create_index(
+            'ix_scan_logs_qr_code_id_scanned_at_id',
+            'scan_logs',
+            ['qr_code_id', 'scanned_at', 'id'],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_scan_logs_qr_code_id_scanned_at_id', table_name='scan_logs')
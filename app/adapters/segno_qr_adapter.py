@@ -15,9 +15,13 @@ import segno
 from PIL import Image
 
 from app.core.config import settings
+from app.core.server_timing import RENDER, timed
+from app.core.tracing import traced
 from app.schemas.common import ErrorCorrectionLevel
 from app.schemas.qr.parameters import QRImageParameters
 from app.services.interfaces.qr_generation_interfaces import QRCodeGenerator, QRImageFormatter
+from app.utils.encoding_profiles import encode_image, get_save_options, resolve_encoding_profile
+from app.utils.svg_emitter import render_svg
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +33,8 @@ class SegnoQRCodeGenerator(QRCodeGenerator):
     Uses the Segno library with optimizations for enhanced error correction.
     """
 
+    @traced("SegnoQRCodeGenerator.generate_qr_data")
+    @timed(RENDER)
     async def generate_qr_data(self, content: str, error_correction: ErrorCorrectionLevel) -> segno.QRCode:
         """
         Generate QR code data using Segno with optimizations.
@@ -107,6 +113,8 @@ class PillowQRImageFormatter(QRImageFormatter):
         
         return normalized_format
 
+    @traced("PillowQRImageFormatter.format_qr_image")
+    @timed(RENDER)
     async def format_qr_image(
         self, 
         qr_data: segno.QRCode, 
@@ -137,42 +145,35 @@ class PillowQRImageFormatter(QRImageFormatter):
             
             # Handle SVG format with optimizations
             if validated_format == "svg":
-                # SEGNO SVG OPTIMIZATIONS (PRIORITY 1, Issue 2)
-                svg_params = {
-                    "kind": "svg",
-                    "xmldecl": False,      # Remove XML declaration
-                    "svgns": False,        # Remove SVG namespace
-                    "svgclass": None,      # Remove CSS classes
-                    "lineclass": None,     # Remove line classes  
-                    "nl": False,           # Remove newlines
-                    "border": image_params.border,
-                    "dark": self._get_effective_color(image_params.fill_color, image_params.data_dark_color, is_dark=True),
-                    "light": self._handle_transparency(
-                        self._get_effective_color(image_params.back_color, image_params.data_light_color, is_dark=False), 
-                        "svg"
-                    )
-                }
+                # Compact SVG emitter shared with the legacy imaging path:
+                # single merged path, viewBox in modules, width/height set directly
+                dark_color = self._get_effective_color(image_params.fill_color, image_params.data_dark_color, is_dark=True)
+                light_color = self._handle_transparency(
+                    self._get_effective_color(image_params.back_color, image_params.data_light_color, is_dark=False), 
+                    "svg"
+                )
                 
                 # Task 0.2.4: Native SVG Unit Support
                 if (image_params.physical_unit and 
                     image_params.physical_size and 
                     image_params.dpi):
-                    svg_params["unit"] = image_params.physical_unit
-                    # Calculate scale per module for SVG (total size / module count)
-                    module_count_with_border = qr_data.symbol_size(border=image_params.border)[0]
-                    svg_params["scale"] = image_params.physical_size / module_count_with_border
-                    # Note: omitsize=False (default) when using unit for width/height attributes
+                    width = image_params.physical_size
+                    unit = image_params.physical_unit
                 else:
-                    svg_params["scale"] = image_params.size
-                    # Keep size attributes for better browser compatibility (omitsize=False is default)
+                    # image_params.size is the number of user units per module
+                    width = qr_data.symbol_size(border=image_params.border)[0] * image_params.size
+                    unit = None
                 
-                # Add SVG accessibility attributes if provided
-                if image_params.svg_title:
-                    svg_params["title"] = image_params.svg_title
-                if image_params.svg_description:
-                    svg_params["desc"] = image_params.svg_description
-                
-                qr_data.save(output, **svg_params)
+                output.write(render_svg(
+                    qr_data,
+                    border=image_params.border,
+                    dark=dark_color,
+                    light=light_color,
+                    width=width,
+                    unit=unit,
+                    title=image_params.svg_title,
+                    description=image_params.svg_description,
+                ))
                 
             # Handle raster formats (PNG, JPEG, WEBP) 
             elif validated_format in ["png", "jpeg", "webp"]:
@@ -186,6 +187,11 @@ class PillowQRImageFormatter(QRImageFormatter):
                     validated_format
                 )
                 
+                profile = resolve_encoding_profile(
+                    image_params.encoding_profile,
+                    is_print=bool(image_params.physical_size and image_params.physical_unit and image_params.dpi),
+                )
+                
                 # Check if logo embedding is requested
                 if hasattr(image_params, 'include_logo') and image_params.include_logo:
                     # DIRECT PILLOW INTEGRATION FOR LOGO (PRIORITY 1, Issue 3)
@@ -199,32 +205,38 @@ class PillowQRImageFormatter(QRImageFormatter):
                     # Add logo if available
                     pil_image = self._add_logo_to_image(pil_image)
                     
-                    # Save with format-specific options
-                    if validated_format == "jpeg":
-                        # JPEG doesn't support transparency
-                        if pil_image.mode in ("RGBA", "LA", "P"):
-                            background = Image.new("RGB", pil_image.size, "white")
-                            if pil_image.mode == "P":
-                                pil_image = pil_image.convert("RGBA")
-                            background.paste(pil_image, mask=pil_image.split()[-1] if pil_image.mode == "RGBA" else None)
-                            pil_image = background
-                        # Handle JPEG quality following Segno documentation pattern
-                        if image_params.image_quality is not None:
-                            pil_image.save(output, format="JPEG", quality=image_params.image_quality)
-                        else:
-                            pil_image.save(output, format="JPEG")  # Use Pillow's default quality
-                    else:
-                        pil_image.save(output, format=validated_format.upper())
-                else:
-                    # Direct Segno save for raster without logo
+                    # JPEG doesn't support transparency
+                    if validated_format == "jpeg" and pil_image.mode in ("RGBA", "LA", "P"):
+                        background = Image.new("RGB", pil_image.size, "white")
+                        if pil_image.mode == "P":
+                            pil_image = pil_image.convert("RGBA")
+                        background.paste(pil_image, mask=pil_image.split()[-1] if pil_image.mode == "RGBA" else None)
+                        pil_image = background
+                    output.write(encode_image(
+                        pil_image, validated_format, profile, image_quality=image_params.image_quality
+                    ))
+                elif validated_format == "png":
+                    # Segno writes a minimal-depth (1-bit or palette) PNG directly
                     qr_data.save(
                         output,
-                        kind=validated_format,
+                        kind="png",
+                        scale=scale,
+                        border=image_params.border,
+                        dark=dark_color,
+                        light=light_color,
+                        compresslevel=get_save_options("png", profile)["compress_level"],
+                    )
+                else:
+                    # Segno has no JPEG/WebP writer; encode via Pillow
+                    pil_image = qr_data.to_pil(
                         scale=scale,
                         border=image_params.border,
                         dark=dark_color,
                         light=light_color
                     )
+                    output.write(encode_image(
+                        pil_image, validated_format, profile, image_quality=image_params.image_quality
+                    ))
             else:
                 raise ValueError(f"Unsupported output format: {validated_format}")
                 
@@ -4,19 +4,27 @@ API router initialization and configuration.
 This module serves as the main entry point for the API router hierarchy.
 """
 
-from fastapi import APIRouter
+from fastapi import FastAPI
 
-from .v1 import api_router as api_v1_router
-from .v1 import web_router, health_router
+from .v1 import API_V1_PREFIX, api_routers, health_routers, web_routers
 from .v1.endpoints.redirect import router as redirect_router
 
-# Create the main API router that includes versioned routers
-api_router = APIRouter(prefix="/api")
+API_PREFIX = "/api"
 
-# Include versioned routers
-api_router.include_router(api_v1_router)
 
-# Create non-API routers without prefixes
-redirect_router_no_prefix = redirect_router  # Already has /r prefix
-web_router_no_prefix = web_router  # No prefix
-health_router_no_prefix = health_router  # No prefix 
\ No newline at end of file
+def include_routers(app: FastAPI) -> None:
+    """
+    Register all routers on the application with their full prefixes.
+
+    Routers are included directly, so each route is copied once.
+
+    Args:
+        app: The FastAPI application
+    """
+    for router, prefix, tags in api_routers:
+        app.include_router(router, prefix=f"{API_PREFIX}{API_V1_PREFIX}{prefix}", tags=tags)
+    app.include_router(redirect_router)  # Already has /r prefix
+    for router in web_routers:
+        app.include_router(router)  # No prefix (for web pages)
+    for router, tags in health_routers:
+        app.include_router(router, tags=tags)  # No prefix (for health checks)
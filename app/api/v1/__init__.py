@@ -1,25 +1,30 @@
 """
 API v1 router initialization and configuration.
 
-This module organizes all v1 API endpoints under a single router.
+This module lists all v1 endpoint routers with the prefix and tags they are
+mounted under. The routers are included into the application directly (see
+app.api.include_routers) rather than through intermediate routers: every
+nested include_router copies and re-analyses each route, which made route
+construction a large share of start-up time.
 """
 
-from fastapi import APIRouter
+from .endpoints import health, qr, pages, fragments, admin_metrics, admin_profiling
 
-from .endpoints import health, qr, pages, fragments, admin_metrics
+API_V1_PREFIX = "/v1"
 
-# Create the v1 API router
-api_router = APIRouter(prefix="/v1")
+# (router, prefix under /api/v1, tags)
+api_routers = [
+    (qr.router, "/qr", ["QR Codes"]),
+    (fragments.router, "", None),  # No prefix needed - router has its own prefix
+    (admin_metrics.router, "", None),  # No prefix needed - router has its own /admin prefix
+    (admin_profiling.router, "", None),  # Has its own /admin/profiling prefix
+]
 
-# Include endpoint routers
-api_router.include_router(qr.router, prefix="/qr", tags=["QR Codes"])
-api_router.include_router(fragments.router)  # No prefix needed - router has its own prefix
-api_router.include_router(admin_metrics.router)  # No prefix needed - router has its own /admin prefix
+# Health check and probe routers (no prefix)
+health_routers = [
+    (health.router, ["Health Check"]),
+    (health.probe_router, ["Health Check"]),
+]
 
-# Create the health router (no prefix under API router)
-health_router = APIRouter()
-health_router.include_router(health.router, tags=["Health Check"])
-
-# Include web page routers (no prefix)
-web_router = APIRouter()
-web_router.include_router(pages.router) 
\ No newline at end of file
+# Web page routers (no prefix)
+web_routers = [pages.router]
@@ -14,6 +14,7 @@ from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
 from app.core.config import Settings, get_settings
+from app.database import get_pool_status
 
 logger = logging.getLogger(__name__)
 
@@ -35,19 +36,21 @@ class ServiceStatusResponse(BaseModel):
     feature_flags: Dict[str, Any]
     canary_settings: Dict[str, Any]
     environment_info: Dict[str, Any]
+    database_pool: Dict[str, Any]
 
 
 @router.get(
     "/service-status",
     response_model=ServiceStatusResponse,
     summary="Service Status",
-    description="Get current feature flag statuses, canary settings, and application info",
+    description="Get current feature flag statuses, canary settings, application info and database pool usage",
 )
 def get_service_status(
     settings: Annotated[Settings, Depends(get_settings)]
 ) -> ServiceStatusResponse:
     """
-    Get comprehensive service status including feature flags and settings.
+    Get comprehensive service status including feature flags, settings and
+    a live summary of this worker's database connection pool.
     
     This endpoint is secured by Traefik middleware (IP whitelist + basic auth).
     
@@ -102,6 +105,7 @@ def get_service_status(
         feature_flags=feature_flags,
         canary_settings=canary_settings,
         environment_info=env_info,
+        database_pool=get_pool_status(),
     )
     
     logger.info("Admin service status response generated successfully")
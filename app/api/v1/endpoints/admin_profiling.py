@@ -0,0 +1,223 @@
+"""
+Admin profiling API endpoints.
+
+On-demand CPU profiles and allocation snapshots of the worker that serves the
+request. Like the other /admin routes these are secured by Traefik middleware
+(IP whitelist + basic auth) and can be switched off with ADMIN_PROFILING_ENABLED.
+"""
+
+import logging
+from enum import Enum
+from typing import Annotated, Any, Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse, Response
+
+from app.core.config import Settings, get_settings
+from app.utils.profiling import (
+    ProfilerBusyError,
+    TracemallocSession,
+    dump_pstats,
+    format_collapsed,
+    format_pstats,
+    profile_event_loop,
+    sample_stacks,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/admin/profiling",
+    tags=["Admin"],
+    responses={
+        200: {"description": "Admin operation successful"},
+        403: {"description": "Access forbidden"},
+        404: {"description": "Profiling is disabled"},
+        409: {"description": "A profile is already running"},
+    },
+)
+
+
+class ProfileMode(str, Enum):
+    """CPU profiler to run."""
+
+    SAMPLE = "sample"
+    CPROFILE = "cprofile"
+
+
+class ProfileFormat(str, Enum):
+    """Output format for cProfile results."""
+
+    TEXT = "text"
+    PSTATS = "pstats"
+
+
+class AllocationGrouping(str, Enum):
+    """How tracemalloc statistics are grouped."""
+
+    LINENO = "lineno"
+    FILENAME = "filename"
+    TRACEBACK = "traceback"
+
+
+def require_profiling_enabled(settings: Annotated[Settings, Depends(get_settings)]) -> Settings:
+    """
+    Reject profiling requests when profiling is disabled.
+
+    Raises:
+        HTTPException: 404 if ADMIN_PROFILING_ENABLED is off
+    """
+    if not settings.ADMIN_PROFILING_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profiling is disabled")
+    return settings
+
+
+ProfilingSettingsDep = Annotated[Settings, Depends(require_profiling_enabled)]
+
+_tracemalloc_session: TracemallocSession | None = None
+
+
+def get_tracemalloc_session(settings: ProfilingSettingsDep) -> TracemallocSession:
+    """Get the process-wide tracemalloc session."""
+    global _tracemalloc_session
+    if _tracemalloc_session is None:
+        _tracemalloc_session = TracemallocSession(settings.TRACEMALLOC_MAX_SECONDS)
+    return _tracemalloc_session
+
+
+TracemallocSessionDep = Annotated[TracemallocSession, Depends(get_tracemalloc_session)]
+
+
+@router.get(
+    "/cpu",
+    summary="CPU Profile",
+    description="Profile this worker for a number of seconds while it serves live requests",
+    response_class=PlainTextResponse,
+)
+async def profile_cpu(
+    settings: ProfilingSettingsDep,
+    seconds: Annotated[float, Query(gt=0, description="Profiling duration in seconds")] = 10,
+    mode: ProfileMode = ProfileMode.SAMPLE,
+    interval_ms: Annotated[float, Query(ge=1, le=1000, description="Sampling interval (sample mode)")] = 5,
+    include_idle: Annotated[bool, Query(description="Keep samples of idle threads (sample mode)")] = False,
+    output: Annotated[ProfileFormat, Query(alias="format", description="Output format (cprofile mode)")] = ProfileFormat.TEXT,
+    limit: Annotated[int, Query(ge=1, le=10000, description="Maximum stacks or functions in the output")] = 500,
+) -> Response:
+    """
+    Run a CPU profile across live requests.
+
+    In sample mode all threads are sampled and the result is returned as
+    collapsed stacks (flamegraph.pl / speedscope input). In cprofile mode the
+    event-loop thread is profiled with cProfile and returned as pstats text or
+    as a binary pstats file.
+
+    Args:
+        settings: Application settings dependency
+        seconds: Profiling duration, capped at PROFILING_MAX_SECONDS
+        mode: Sampling profiler or cProfile
+        interval_ms: Sampling interval in milliseconds
+        include_idle: Whether to keep samples of idle threads
+        output: cProfile output format
+        limit: Maximum stacks or functions in the output
+
+    Returns:
+        The profile
+
+    Raises:
+        HTTPException: 409 if another profile is running
+    """
+    seconds = min(seconds, settings.PROFILING_MAX_SECONDS)
+    logger.info(f"Admin CPU profile requested ({mode.value}, {seconds}s)")
+
+    try:
+        if mode == ProfileMode.SAMPLE:
+            counts = await sample_stacks(seconds, interval_ms / 1000, include_idle=include_idle)
+            return PlainTextResponse(format_collapsed(counts, limit))
+
+        profiler = await profile_event_loop(seconds)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    if output == ProfileFormat.PSTATS:
+        return Response(
+            dump_pstats(profiler),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="profile.pstats"'},
+        )
+    return PlainTextResponse(format_pstats(profiler, limit=limit))
+
+
+@router.post(
+    "/tracemalloc/start",
+    summary="Start Allocation Tracing",
+    description="Start tracemalloc in this worker; it stops automatically after TRACEMALLOC_MAX_SECONDS",
+)
+def start_tracemalloc(
+    session: TracemallocSessionDep,
+    frames: Annotated[int, Query(ge=1, le=25, description="Stack frames stored per allocation")] = 1,
+) -> Dict[str, Any]:
+    """
+    Start allocation tracing.
+
+    Args:
+        session: The tracemalloc session
+        frames: Stack frames stored per allocation (more frames cost more memory)
+
+    Returns:
+        Tracing status
+    """
+    session.start(frames)
+    logger.info(f"tracemalloc started with {frames} frame(s)")
+    return {"tracing": True, "frames": frames, "auto_stop_seconds": session.max_seconds}
+
+
+@router.get(
+    "/tracemalloc/snapshot",
+    summary="Allocation Snapshot",
+    description="Top allocating lines, or the difference since the previous snapshot",
+)
+def tracemalloc_snapshot(
+    session: TracemallocSessionDep,
+    limit: Annotated[int, Query(ge=1, le=500)] = 25,
+    diff: Annotated[bool, Query(description="Compare with the previous snapshot")] = False,
+    group_by: AllocationGrouping = AllocationGrouping.LINENO,
+) -> Dict[str, Any]:
+    """
+    Take an allocation snapshot.
+
+    Args:
+        session: The tracemalloc session
+        limit: Number of entries to return
+        diff: Compare with the previous snapshot
+        group_by: Group by line, file or traceback
+
+    Returns:
+        Top allocation statistics
+
+    Raises:
+        HTTPException: 409 if tracing has not been started
+    """
+    try:
+        stats = session.top(limit=limit, diff=diff, key_type=group_by.value)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return {"diff": diff, "group_by": group_by.value, "statistics": stats}
+
+
+@router.post(
+    "/tracemalloc/stop",
+    summary="Stop Allocation Tracing",
+)
+def stop_tracemalloc(session: TracemallocSessionDep) -> Dict[str, Any]:
+    """
+    Stop allocation tracing.
+
+    Args:
+        session: The tracemalloc session
+
+    Returns:
+        Tracing status
+    """
+    session.stop()
+    logger.info("tracemalloc stopped")
+    return {"tracing": False}
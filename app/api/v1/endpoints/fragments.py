@@ -6,17 +6,19 @@ import os
 import math
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Annotated
+from typing import Optional, List, Annotated, Literal
 
 from fastapi import APIRouter, Depends, Request, Form, HTTPException, status
-from fastapi.responses import HTMLResponse, Response
-from fastapi.templating import Jinja2Templates
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from pydantic import ValidationError
 
-from app.types import DbSessionDep, QRServiceDep
+from app.types import DashboardLoaderDep, DbSessionDep, QRServiceDep
 from app.core.config import settings
 from app.core.exceptions import DatabaseError, QRCodeNotFoundError
+from app.core.fragment_etag import revalidate
 from app.models import QRCode
+from app.utils.templating import TimedJinja2Templates, template_env
 from app.schemas.qr.parameters import ErrorCorrectionLevel, StaticQRCreateParameters, DynamicQRCreateParameters, QRUpdateParameters
 
 # Configure logger
@@ -24,9 +26,7 @@ import logging
 logger = logging.getLogger("app.api.fragments")
 
 # Configure templates
-templates = Jinja2Templates(
-    directory=str(settings.TEMPLATES_DIR),
-)
+templates = TimedJinja2Templates(env=template_env)
 
 router = APIRouter(
     prefix="/fragments",
@@ -69,7 +69,7 @@ async def get_qr_list_fragment(
             sort_desc=sort_order.lower() == "desc"  # Convert sort_order to sort_desc boolean
         )
         
-        return templates.TemplateResponse(
+        response = templates.TemplateResponse(
             "fragments/qr_list.html",
             {
                 "request": request,
@@ -83,6 +83,7 @@ async def get_qr_list_fragment(
                 "total_pages": math.ceil(total / limit)
             }
         )
+        return revalidate(request, response)
     except DatabaseError as e:
         logger.error("Database error in QR list fragment", extra={"error": str(e)})
         return templates.TemplateResponse(
@@ -278,36 +279,46 @@ async def get_scan_logs_fragment(
     page: int = 1,
     limit: int = 10,
     genuine_only: bool = False,
+    cursor: str | None = None,
+    direction: Literal["older", "newer"] = "older",
+    exact_total: bool = False,
 ):
     """
     Get the scan logs fragment for a specific QR code.
     
+    Pages are fetched with keyset pagination: the Older/Newer links carry a
+    cursor for the last/first row shown instead of an offset.
+    
     Args:
         request: The FastAPI request object.
         qr_id: The ID of the QR code to get scan logs for.
         qr_service: The QR code service.
-        page: The page number.
+        page: The page number (display only; the cursor selects the rows).
         limit: The number of logs per page.
         genuine_only: Whether to include only genuine scans.
+        cursor: Keyset cursor of the row to page from.
+        direction: Whether to page to older or newer scans from the cursor.
+        exact_total: Count matching rows instead of using the QR code's scan counters.
         
     Returns:
         HTMLResponse: The rendered scan logs fragment.
     """
     try:
-        # Calculate offset from page number
-        skip = (page - 1) * limit
+        limit = max(1, min(limit, 100))
         
-        # Get scan logs from repository
-        scan_logs, total_logs = qr_service.scan_log_repo.get_scan_logs_for_qr(
+        # Get one page of scan logs from repository
+        result = qr_service.scan_log_repo.get_scan_log_page(
             qr_id=qr_id,
-            skip=skip,
             limit=limit,
-            genuine_only=genuine_only
+            genuine_only=genuine_only,
+            cursor=cursor,
+            direction=direction,
+            count_mode="exact" if exact_total else "approximate",
         )
         
         # Format scan log data for the template
         formatted_logs = []
-        for log in scan_logs:
+        for log in result["logs"]:
             formatted_logs.append({
                 "id": log.id,
                 "scanned_at": log.scanned_at.strftime("%Y-%m-%d %H:%M:%S"),
@@ -323,8 +334,9 @@ async def get_scan_logs_fragment(
                 "is_bot": log.is_bot
             })
         
-        # Calculate total pages for pagination
-        total_pages = math.ceil(total_logs / limit) if total_logs > 0 else 1
+        # Calculate total pages for display
+        total_logs = result["total"]
+        total_pages = math.ceil(total_logs / limit) if total_logs else 1
         
         return templates.TemplateResponse(
             "fragments/scan_log_table.html",
@@ -333,12 +345,25 @@ async def get_scan_logs_fragment(
                 "qr_id": qr_id,
                 "scan_logs": formatted_logs,
                 "total_logs": total_logs,
+                "total_is_approximate": result["total_is_approximate"],
                 "page": page,
                 "limit": limit,
-                "total_pages": total_pages,
-                "genuine_only": genuine_only
+                "total_pages": max(total_pages, page),
+                "older_cursor": result["older_cursor"],
+                "newer_cursor": result["newer_cursor"],
+                "genuine_only": genuine_only,
+                "exact_total": exact_total,
             }
         )
+    except ValueError as e:
+        return templates.TemplateResponse(
+            "fragments/error.html",
+            {
+                "request": request,
+                "error": str(e)
+            },
+            status_code=400,
+        )
     except QRCodeNotFoundError:
         return templates.TemplateResponse(
             "fragments/error.html",
@@ -543,7 +568,7 @@ async def get_pagination_fragment(
 async def get_device_stats_fragment(
     request: Request,
     qr_id: str,
-    qr_service: QRServiceDep,
+    dashboard_loader: DashboardLoaderDep,
     genuine_only: bool = False,
 ):
     """
@@ -552,34 +577,20 @@ async def get_device_stats_fragment(
     Args:
         request: The FastAPI request object.
         qr_id: The ID of the QR code to get statistics for.
-        qr_service: The QR code service.
+        dashboard_loader: Runs the statistics queries concurrently.
         genuine_only: Whether to include only genuine scans in the statistics.
         
     Returns:
         HTMLResponse: The rendered device/browser/OS statistics fragment.
     """
     try:
-        # Get device statistics from repository
-        device_stats = qr_service.scan_log_repo.get_device_statistics(qr_id)
-        
-        # Get browser statistics from repository
-        browser_stats = qr_service.scan_log_repo.get_browser_statistics(qr_id)
-        
-        # Get OS statistics from repository
-        os_stats = qr_service.scan_log_repo.get_os_statistics(qr_id)
-        
-        # Combine all statistics
-        stats = {
-            "device_types": device_stats.get("device_types", {}),
-            "device_families": device_stats.get("device_families", {}),
-            "browser_families": browser_stats.get("browser_families", {}),
-            "os_families": os_stats.get("os_families", {})
-        }
+        # Device, browser and OS statistics are queried concurrently
+        stats = await dashboard_loader.load_scan_statistics(qr_id)
         
         # Calculate totals for percentage calculations
         device_total = sum(stats["device_types"].values())
         
-        return templates.TemplateResponse(
+        response = templates.TemplateResponse(
             "fragments/device_os_browser_stats.html",
             {
                 "request": request,
@@ -589,6 +600,7 @@ async def get_device_stats_fragment(
                 "genuine_only": genuine_only
             }
         )
+        return revalidate(request, response)
     except QRCodeNotFoundError:
         return templates.TemplateResponse(
             "fragments/error.html",
@@ -611,6 +623,7 @@ async def get_device_stats_fragment(
 
 @router.get("/qr/{qr_id}/analytics/scan-timeseries")
 async def get_scan_timeseries(
+    request: Request,
     qr_id: str,
     qr_service: QRServiceDep,
     time_range: str = "last7days",
@@ -619,6 +632,7 @@ async def get_scan_timeseries(
     Get time series data for QR code scans for chart visualization.
     
     Args:
+        request: The FastAPI request object.
         qr_id: The ID of the QR code to get time series data for.
         qr_service: The QR code service.
         time_range: Time range for data ("today", "yesterday", "last7days", 
@@ -634,7 +648,7 @@ async def get_scan_timeseries(
             time_range=time_range
         )
         
-        return time_series_data
+        return revalidate(request, JSONResponse(jsonable_encoder(time_series_data)))
     except QRCodeNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1,18 +1,22 @@
 """
 Health check API endpoints.
+
+/health serves the snapshot maintained by the background HealthMonitor.
+/livez, /startupz and /readyz are cheap probes that never touch the database.
+The container healthcheck uses /startupz: /readyz also fails while the pool
+is saturated, which is load-balancer readiness, not container health.
 """
 
 import logging
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
 
-from app.database import get_db
 from app.schemas.common import HTTPError
-from app.schemas.health import HealthResponse
+from app.schemas.health import HealthResponse, LivenessResponse, ReadinessResponse, StartupResponse
 from app.services.health import HealthService
-from app.types import DbSessionDep
+from app.types import HealthMonitorDep
 from app.core.config import Settings, get_settings
 
 logger = logging.getLogger(__name__)
@@ -36,15 +40,18 @@ router = APIRouter(
         503: {"model": HTTPError, "description": "Service unavailable"},
     },
 )
-def health_check(
-    db: DbSessionDep,
+async def health_check(
+    health_monitor: HealthMonitorDep,
     settings: Annotated[Settings, Depends(get_settings)]
 ) -> HealthResponse:
     """
-    Perform a comprehensive health check of the API service.
+    Return the latest health status of the API service.
+
+    The checks are run by the background refresher; a request only runs them
+    itself when the snapshot is missing or stale.
 
     Args:
-        db: Database session dependency
+        health_monitor: Health snapshot dependency
         settings: Application settings dependency
 
     Returns:
@@ -53,7 +60,7 @@ def health_check(
     Raises:
         HTTPException: If the service is unhealthy or degraded
     """
-    health_status = HealthService.get_health_status(db, settings)
+    health_status = await run_in_threadpool(health_monitor.get_snapshot)
 
     if health_status.status == "unhealthy":
         raise HTTPException(
@@ -61,4 +68,87 @@ def health_check(
             detail="Service is currently unhealthy. Please check the logs for more details.",
         )
 
-    return health_status 
\ No newline at end of file
+    return health_status
+
+
+# Kubernetes-style probes (no prefix)
+probe_router = APIRouter()
+
+
+@probe_router.get(
+    "/livez",
+    response_model=LivenessResponse,
+    summary="Liveness Probe",
+    description="Returns 200 while the process can serve requests; performs no checks",
+)
+async def liveness() -> LivenessResponse:
+    """
+    Report that the process is alive.
+
+    Returns:
+        LivenessResponse: Always 'alive'
+    """
+    return LivenessResponse()
+
+
+@probe_router.get(
+    "/startupz",
+    response_model=StartupResponse,
+    summary="Start-up Probe",
+    description="Returns 200 once warm-up has completed, 503 before; ignores pool usage",
+    responses={503: {"model": StartupResponse, "description": "Service still starting"}},
+)
+async def startup(request: Request, response: Response) -> StartupResponse:
+    """
+    Report whether start-up warm-up has completed.
+
+    Used by the container healthcheck, which must not fail (and take the
+    container out of routing) just because the pool is busy under load.
+
+    Args:
+        request: The current request (for the application's warm-up state)
+        response: The response, whose status is set to 503 while starting
+
+    Returns:
+        StartupResponse: Warm-up state
+    """
+    state = request.app.state
+    warmed_up = getattr(state, "warmed_up", False)
+    warmup = getattr(state, "warmup", None)
+    if not warmed_up:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return StartupResponse(
+        status="started" if warmed_up else "starting",
+        warmed_up=warmed_up,
+        warmup_steps=dict(warmup.results) if warmup is not None else {},
+    )
+
+
+@probe_router.get(
+    "/readyz",
+    response_model=ReadinessResponse,
+    summary="Readiness Probe",
+    description="Returns 200 once warm-up has completed and the connection pool has free capacity, 503 otherwise",
+    responses={503: {"model": ReadinessResponse, "description": "Service not ready"}},
+)
+async def readiness(request: Request, response: Response) -> ReadinessResponse:
+    """
+    Report whether the service can take traffic.
+
+    Args:
+        request: The current request (for the application's warm-up state)
+        response: The response, whose status is set to 503 when not ready
+
+    Returns:
+        ReadinessResponse: Readiness and its inputs
+    """
+    state = request.app.state
+    warmup = getattr(state, "warmup", None)
+    readiness_status = HealthService.check_readiness(
+        getattr(state, "warmed_up", False),
+        warmup.results if warmup is not None else None,
+    )
+    ready = readiness_status.pop("ready")
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return ReadinessResponse(status="ready" if ready else "not_ready", **readiness_status)
@@ -9,14 +9,14 @@ from typing import Optional, Annotated
 
 from fastapi import APIRouter, Depends, Request, status
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
-from app.types import DbSessionDep, QRServiceDep
+from app.types import DashboardLoaderDep, DbSessionDep, QRServiceDep
 from app.core.config import settings
 from app.core.exceptions import DatabaseError
 from app.models import QRCode
+from app.utils.templating import TimedJinja2Templates, template_env
 
 # Configure logger
 import logging
@@ -40,8 +40,8 @@ def get_base_template_context(request: Request) -> dict:
     }
 
 # Configure templates
-templates = Jinja2Templates(
-    directory=str(settings.TEMPLATES_DIR),
+templates = TimedJinja2Templates(
+    env=template_env,
     context_processors=[get_base_template_context],
 )
 
@@ -52,13 +52,13 @@ router = APIRouter(
 
 
 @router.get("/", response_class=HTMLResponse)
-async def home(request: Request, qr_service: QRServiceDep):
+async def home(request: Request, dashboard_loader: DashboardLoaderDep):
     """
     Render the home page template with dynamic data.
     """
     try:
-        # Get dashboard data using the service
-        dashboard_data = qr_service.get_dashboard_data()
+        # Count and recent QR codes are queried concurrently
+        dashboard_data = await dashboard_loader.load_dashboard()
         
         # Use the new HTMX-based dashboard template
         return templates.TemplateResponse(
@@ -84,19 +84,19 @@ async def home(request: Request, qr_service: QRServiceDep):
 
 
 @router.get("/qr-list", response_class=HTMLResponse)
-async def qr_list(request: Request, qr_service: QRServiceDep):
+async def qr_list(request: Request, dashboard_loader: DashboardLoaderDep):
     """
     Render the QR code list page with filtering and sorting options.
     """
     try:
-        # Get dashboard data using the service to get the total count
-        dashboard_data = qr_service.get_dashboard_data()
+        # Only the total count is shown; the list itself is loaded by the fragment
+        total_qr_codes = await dashboard_loader.load_qr_count()
         
         return templates.TemplateResponse(
             name="pages/qr_list.html",
             context={
                 "request": request,
-                "total_qr_codes": dashboard_data["total_qr_codes"],
+                "total_qr_codes": total_qr_codes,
             },
         )
     except DatabaseError as e:
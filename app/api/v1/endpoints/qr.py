@@ -8,16 +8,18 @@ This module consolidates all QR code-related operations including:
 - Updating QR codes
 - Deleting QR codes
 - Generating QR code images
+- Exporting scan logs
 """
 
 import logging
 from typing import Annotated
 
 from fastapi import APIRouter, BackgroundTasks, Depends, status, HTTPException
-from fastapi.responses import Response
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import InvalidQRTypeError
+from app.database import get_db_context
 from app.dependencies import get_qr_service
 from app.schemas import (
     DynamicQRCreateParameters,
@@ -26,10 +28,13 @@ from app.schemas import (
     QRImageParameters,
     QRListParameters,
     QRUpdateParameters,
+    ScanLogExportParameters,
     StaticQRCreateParameters,
 )
+from app.schemas.common import ExportFormat
 from app.services.qr_service import QRCodeService
 from app.types import QRServiceDep
+from app.utils.scan_export import MEDIA_TYPES, PARQUET_AVAILABLE, export_scan_logs
 
 # Configure logger for QR code routes
 logger = logging.getLogger("app.qr")
@@ -183,11 +188,113 @@ async def get_qr_image(
         svg_description=params.svg_description,
         physical_size=params.physical_size,
         physical_unit=params.physical_unit,
-        dpi=params.dpi
+        dpi=params.dpi,
+        encoding_profile=params.encoding_profile.value if params.encoding_profile else None,
     )
 
 
 
+def _scan_log_export_response(params: ScanLogExportParameters, qr_id: str | None = None) -> StreamingResponse:
+    """
+    Build a streaming scan log export response.
+
+    The export opens its own session for the server-side cursor because the
+    request-scoped session is closed before the response body is streamed.
+
+    Args:
+        params: Export parameters
+        qr_id: Only export scans of this QR code (all QR codes if None)
+
+    Returns:
+        StreamingResponse with the CSV or Parquet file
+
+    Raises:
+        HTTPException: If Parquet is requested but pyarrow is not installed
+    """
+    if params.export_format == ExportFormat.PARQUET and not PARQUET_AVAILABLE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Parquet export is not available on this server; use export_format=csv",
+        )
+
+    def stream():
+        with get_db_context() as db:
+            yield from export_scan_logs(
+                db,
+                params.export_format,
+                qr_id=qr_id,
+                start_date=params.start_date,
+                end_date=params.end_date,
+                genuine_only=params.genuine_only,
+                batch_size=params.batch_size,
+            )
+
+    filename = f"scan_logs_{qr_id or 'all'}.{params.export_format.value}"
+    return StreamingResponse(
+        stream(),
+        media_type=MEDIA_TYPES[params.export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# Export Scan Logs for All QR Codes
+@router.get(
+    "/scan-logs/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "Scan logs as CSV or Parquet"},
+        400: {"description": "Export format not available"},
+        422: {"description": "Validation error"},
+    },
+)
+async def export_all_scan_logs(params: ScanLogExportParameters = Depends()):
+    """
+    Stream scan logs of all QR codes, optionally limited to a time range.
+
+    Args:
+        params: Export format, time range and batch size
+
+    Returns:
+        A streaming CSV or Parquet file
+    """
+    return _scan_log_export_response(params)
+
+
+# Export Scan Logs for a QR Code
+@router.get(
+    "/{qr_id}/scan-logs/export",
+    response_class=StreamingResponse,
+    responses={
+        200: {"description": "Scan logs as CSV or Parquet"},
+        400: {"description": "Export format not available"},
+        404: {"description": "QR code not found"},
+        422: {"description": "Validation error"},
+    },
+)
+async def export_qr_scan_logs(
+    qr_id: str,
+    qr_service: QRServiceDep,
+    params: ScanLogExportParameters = Depends(),
+):
+    """
+    Stream scan logs of a single QR code.
+
+    Args:
+        qr_id: The ID of the QR code
+        qr_service: The QR code service (injected)
+        params: Export format, time range and batch size
+
+    Returns:
+        A streaming CSV or Parquet file
+
+    Raises:
+        QRCodeNotFoundError: If the QR code is not found
+    """
+    # Fail with 404 before any bytes are streamed
+    qr_service.get_qr_by_id(qr_id)
+    return _scan_log_export_response(params, qr_id=qr_id)
+
+
 # Create Static QR Code
 @router.post(
     "/static",
@@ -12,7 +12,7 @@ from fastapi.responses import RedirectResponse
 from sqlalchemy import select, or_
 from sqlalchemy.exc import SQLAlchemyError
 
-from app.types import DbSessionDep, QRServiceDep
+from app.types import DbSessionDep, RedirectServiceDep
 from app.models.qr import QRCode
 from app.services.qr_service import QRCodeService
 from app.core.config import settings
@@ -51,7 +51,7 @@ async def redirect_qr(
     short_id: str,
     request: Request,
     background_tasks: BackgroundTasks,
-    qr_service: QRServiceDep,
+    qr_service: RedirectServiceDep,
 ):
     """
     Redirect a QR code scan to the target URL.
@@ -103,10 +103,6 @@ async def redirect_qr(
         scan_ref = request.query_params.get("scan_ref")
         is_genuine_scan = scan_ref == "qr"
         
-        # Log whether this is a genuine scan or direct access
-        scan_type = "genuine QR scan" if is_genuine_scan else "direct URL access"
-        logger.info(f"Processing {scan_type} for QR {qr.id} with short_id {normalized_short_id}")
-
         # Add the background task to update scan statistics with client info and genuine scan signal
         background_tasks.add_task(
             qr_service.update_scan_statistics, 
@@ -117,18 +113,23 @@ async def redirect_qr(
             is_genuine_scan
         )
 
-        # Log the scan event
-        logger.info(
-            f"QR code scan: {qr.id}",
-            extra={
-                "qr_id": qr.id,
-                "client_ip": client_ip,
-                "user_agent": user_agent,
-                "timestamp": timestamp.isoformat(),
-                "is_genuine_scan": is_genuine_scan,
-                "scan_ref": scan_ref,
-            },
-        )
+        # Log the scan event in one record, following the middleware's sampling decision.
+        # Sampled-out scans skip building the record entirely.
+        if getattr(request.state, "log_sampled", True) and logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "QR code scan (%s): %s with short_id %s",
+                "genuine QR scan" if is_genuine_scan else "direct URL access",
+                qr.id,
+                normalized_short_id,
+                extra={
+                    "qr_id": qr.id,
+                    "client_ip": client_ip,
+                    "user_agent": user_agent,
+                    "timestamp": timestamp.isoformat(),
+                    "is_genuine_scan": is_genuine_scan,
+                    "scan_ref": scan_ref,
+                },
+            )
 
         # Log successful redirect processing
         MetricsLogger.log_redirect_processed('success')
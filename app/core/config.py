@@ -4,7 +4,7 @@ Core configuration module for the FastAPI application.
 
 import os
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -33,9 +33,7 @@ STATIC_DIR = APP_ROOT / "static"
 TEMPLATES_DIR = APP_ROOT / "templates"
 QR_CODES_DIR = STATIC_DIR / "assets" / "images" / "qr_codes"
 DEFAULT_LOGO_PATH = STATIC_DIR / "assets" / "images" / "hccc_logo_official.png"
-
-# Create directories if they don't exist
-QR_CODES_DIR.mkdir(parents=True, exist_ok=True)
+# QR_CODES_DIR is created in the application lifespan, not at import
 
 
 class Settings(BaseSettings):
@@ -81,9 +79,92 @@ class Settings(BaseSettings):
 
     # Metrics
     METRICS_ENDPOINT: str = "/metrics"
+    # Kill switch for MetricsLogger.time_service_call instrumentation
+    SERVICE_CALL_METRICS_ENABLED: bool = True
+    # Upper bound on distinct (method, endpoint, status) series recorded by MetricsMiddleware
+    METRICS_MAX_SERIES: int = Field(default=2000, ge=1)
+
+    # Database connection pool
+    DB_POOL_SIZE: int = Field(default=10, ge=1)
+    DB_MAX_OVERFLOW: int = Field(default=20, ge=0)
+    DB_POOL_TIMEOUT: float = Field(default=30.0, gt=0)  # Seconds to wait for a connection
+    DB_POOL_RECYCLE: int = 300  # Seconds before a connection is replaced (-1 disables)
+
+    # Database connection staleness: pooled connections idle for longer than this
+    # are pinged before reuse (replaces pinging on every checkout)
+    DB_POOL_STALE_AFTER_SECONDS: float = Field(default=30.0, ge=0)
+
+    # Per-query metrics and slow-query log
+    DB_QUERY_METRICS_ENABLED: bool = True
+    DB_SLOW_QUERY_MS: float = Field(default=250.0, ge=0)
+    # Also capture EXPLAIN (ANALYZE, BUFFERS) for slow SELECTs; re-executes the statement
+    DB_SLOW_QUERY_EXPLAIN: bool = False
+
+    # Event-loop lag monitor
+    EVENT_LOOP_MONITOR_ENABLED: bool = True
+    EVENT_LOOP_MONITOR_INTERVAL_MS: float = Field(default=100.0, gt=0)
+    # Missed heartbeat after which the loop thread's stack is captured
+    EVENT_LOOP_BLOCKED_THRESHOLD_MS: float = Field(default=250.0, gt=0)
+
+    # Health checks run in the background; /health serves the latest snapshot
+    HEALTH_REFRESH_INTERVAL_SECONDS: float = Field(default=15.0, gt=0)
+    # A snapshot older than this is refreshed on demand (e.g. if the refresher stopped)
+    HEALTH_SNAPSHOT_MAX_AGE_SECONDS: float = Field(default=60.0, gt=0)
+
+    # Start-up warm-up: /readyz reports not ready until it finishes or times out
+    WARMUP_ENABLED: bool = True
+    WARMUP_TIMEOUT_SECONDS: float = Field(default=30.0, gt=0)
+    # Connections opened ahead of traffic (capped at DB_POOL_SIZE)
+    WARMUP_POOL_CONNECTIONS: int = Field(default=5, ge=0)
+    # Most-scanned QR codes whose redirect lookup and image are exercised
+    WARMUP_TOP_QR_CODES: int = Field(default=20, ge=0)
+
+    # Compiled Jinja templates are stored here and shared by workers and restarts
+    JINJA_BYTECODE_CACHE_ENABLED: bool = True
+    JINJA_BYTECODE_CACHE_DIR: Path = Path("/tmp/jinja_bytecode_cache")
+
+    # Server-Timing response header with a db/render/template/cache/middleware breakdown
+    # (reveals internal timings, so keep it off on public deployments)
+    SERVER_TIMING_ENABLED: bool = False
+
+    # In-process tracing: sampled requests are recorded as spans and written as
+    # OTLP/JSON lines to TRACING_EXPORT_DIR (one file per worker)
+    TRACING_ENABLED: bool = False
+    TRACING_SAMPLE_RATIO: float = Field(default=1.0, ge=0.0, le=1.0)
+    # Only export traces at least this slow (errors are always exported)
+    TRACING_MIN_DURATION_MS: float = Field(default=0.0, ge=0.0)
+    TRACING_EXPORT_DIR: Path = Path("/logs/traces")
+    TRACING_BATCH_SIZE: int = Field(default=512, ge=1)
+    TRACING_FLUSH_INTERVAL_SECONDS: float = Field(default=5.0, gt=0)
+    TRACING_MAX_QUEUE: int = Field(default=10000, ge=1)
+
+    # Admin profiling endpoints (/api/v1/admin/profiling)
+    ADMIN_PROFILING_ENABLED: bool = True
+    PROFILING_MAX_SECONDS: float = Field(default=60.0, gt=0)
+    TRACEMALLOC_MAX_SECONDS: float = Field(default=600.0, gt=0)
 
     # Logging
     LOG_LEVEL: str = "INFO"
+    # Per-route sampling of successful request logs: "path_prefix=N" pairs, comma-separated.
+    # 1 in N successful requests under the prefix is logged; errors are always logged.
+    LOG_SAMPLE_RULES: str | Dict[str, int] = ""
+
+    @field_validator("LOG_SAMPLE_RULES", mode="before")
+    @classmethod
+    def parse_log_sample_rules(cls, v):
+        """Parse comma-separated "prefix=N" log sampling rules from environment variable."""
+        if isinstance(v, dict):
+            return v
+        rules = {}
+        for rule in (v or "").split(","):
+            if not rule.strip():
+                continue
+            prefix, _, rate = rule.partition("=")
+            try:
+                rules[prefix.strip()] = max(1, int(rate))
+            except ValueError:
+                raise ValueError(f"Invalid log sampling rule '{rule}', expected 'path_prefix=N'")
+        return rules
     
     # Cookie settings - used only for non-auth related functionality like CSRF
     COOKIE_DOMAIN: str = "10.1.6.12"
@@ -107,6 +188,10 @@ class Settings(BaseSettings):
     QR_GENERATION_CB_FAIL_MAX: int = Field(default=5, env="QR_GENERATION_CB_FAIL_MAX")
     QR_GENERATION_CB_RESET_TIMEOUT: int = Field(default=60, env="QR_GENERATION_CB_RESET_TIMEOUT")
 
+    # Raster Encoding Profiles (fast, balanced, archival)
+    IMAGE_ENCODING_PROFILE: str = Field(default="balanced", pattern=r"^(fast|balanced|archival)$", env="IMAGE_ENCODING_PROFILE")
+    PRINT_ENCODING_PROFILE: str = Field(default="archival", pattern=r"^(fast|balanced|archival)$", env="PRINT_ENCODING_PROFILE")
+
     # Path settings
     APP_ROOT: Path = APP_ROOT
     STATIC_DIR: Path = STATIC_DIR
@@ -0,0 +1,139 @@
+"""
+Event-loop lag monitor.
+
+A heartbeat task sleeps for a fixed interval and records how late it wakes up;
+the delay is the time the loop spent running other (possibly blocking) code.
+A watchdog thread checks the heartbeat independently: when the loop has not
+run it for longer than the threshold, the loop thread is blocked right now,
+so its stack is captured and written to the structured performance log. The
+innermost application frame in that stack identifies the blocking handler.
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.metrics_logger import MetricsLogger
+
+logger = logging.getLogger(__name__)
+# Written through the api.performance JSON log; JSONFormatter merges record.extra
+performance_logger = logging.getLogger("api.performance")
+
+APP_DIR = str(Path(__file__).resolve().parent.parent)
+MAX_STACK_FRAMES = 50
+
+
+def _innermost_app_frame(stack: List[traceback.FrameSummary]) -> Optional[str]:
+    """Find the innermost application frame, e.g. 'app/services/qr_service.py:512 in generate_qr'."""
+    for frame in reversed(stack):
+        if frame.filename.startswith(APP_DIR) and frame.filename != __file__:
+            return f"{Path(frame.filename).relative_to(Path(APP_DIR).parent)}:{frame.lineno} in {frame.name}"
+    return None
+
+
+class EventLoopMonitor:
+    """
+    Measure event-loop scheduling delay and capture stacks of blocking calls.
+
+    Args:
+        interval: Seconds between heartbeats
+        threshold: Seconds of missed heartbeat after which the loop counts as blocked
+    """
+
+    def __init__(self, interval: float, threshold: float):
+        self.interval = interval
+        self.threshold = threshold
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._last_beat = time.monotonic()
+
+    def start(self) -> None:
+        """Start the heartbeat task on the running loop and the watchdog thread."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stopped.clear()
+        self._task = self._loop.create_task(self._heartbeat(), name="event-loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info(
+            f"Event loop monitor started (interval {self.interval * 1000:.0f}ms, "
+            f"threshold {self.threshold * 1000:.0f}ms)"
+        )
+
+    async def stop(self) -> None:
+        """Stop the heartbeat task and the watchdog thread."""
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.threshold + 1)
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self._last_beat = time.monotonic()
+            MetricsLogger.log_event_loop_lag(lag)
+
+    def _watch(self) -> None:
+        reported_beat = None
+        while not self._stopped.wait(self.threshold / 2):
+            last_beat = self._last_beat
+            blocked_for = time.monotonic() - last_beat - self.interval
+            # Report each stall once, while it is still in progress
+            if blocked_for > self.threshold and last_beat != reported_beat:
+                reported_beat = last_beat
+                self._report_blocked(blocked_for)
+
+    def _report_blocked(self, blocked_for: float) -> None:
+        """Capture and log the loop thread's current stack."""
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = traceback.extract_stack(frame)[-MAX_STACK_FRAMES:]
+        location = _innermost_app_frame(stack)
+        MetricsLogger.log_event_loop_blocked()
+        performance_logger.warning(
+            "Event loop blocked for at least %.0fms%s",
+            blocked_for * 1000,
+            f" in {location}" if location else "",
+            extra={
+                "extra": {
+                    "event": "event_loop_blocked",
+                    "blocked_ms": round(blocked_for * 1000, 1),
+                    "location": location,
+                    "stack": traceback.format_list(stack),
+                }
+            },
+        )
+
+
+def create_event_loop_monitor() -> Optional[EventLoopMonitor]:
+    """
+    Create the monitor configured in settings.
+
+    Returns:
+        An EventLoopMonitor, or None if the monitor is disabled
+    """
+    if not settings.EVENT_LOOP_MONITOR_ENABLED:
+        return None
+    return EventLoopMonitor(
+        interval=settings.EVENT_LOOP_MONITOR_INTERVAL_MS / 1000,
+        threshold=settings.EVENT_LOOP_BLOCKED_THRESHOLD_MS / 1000,
+    )
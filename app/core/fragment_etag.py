@@ -0,0 +1,87 @@
+"""
+ETag revalidation for rendered HTMX fragments.
+
+Every fragment response carries a weak ETag computed from its body and
+``Cache-Control: private, no-cache``, so browsers revalidate with
+If-None-Match and get a 304 with no body when the fragment is unchanged.
+
+The ETag is computed after the fragment's queries have run and it has been
+rendered, so it always reflects the committed data, whichever worker serves
+the request. Rendered bodies are deliberately not cached on the server: the
+app runs several workers, and a per-process cache cannot see changes
+committed through the other workers.
+"""
+
+import hashlib
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from app.core.metrics_logger import MetricsLogger
+
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(body: bytes) -> str:
+    """
+    Build a weak ETag for a response body.
+
+    Weak, because GZipMiddleware may re-encode the body with the same ETag.
+
+    Args:
+        body: Response body
+
+    Returns:
+        ETag header value
+    """
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check whether the request's If-None-Match header matches an ETag.
+
+    Args:
+        request: The current request
+        etag: ETag of the current representation
+
+    Returns:
+        True if the client already has this representation
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def _fragment_name(request: Request) -> str:
+    route = request.scope.get("route")
+    return getattr(route, "name", None) or "unknown"
+
+
+def revalidate(request: Request, response: Response) -> Response:
+    """
+    Add validators to a rendered fragment and answer 304 if the client's copy is current.
+
+    Only complete 200 responses get validators; others are returned unchanged.
+
+    Args:
+        request: The current request
+        response: The rendered response
+
+    Returns:
+        The response to send
+    """
+    if response.status_code != 200 or response.background is not None:
+        return response
+    etag = make_etag(bytes(response.body))
+    if etag_matches(request, etag):
+        MetricsLogger.log_fragment_response(_fragment_name(request), "not_modified")
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    MetricsLogger.log_fragment_response(_fragment_name(request), "full")
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
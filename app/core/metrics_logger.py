@@ -6,12 +6,24 @@ from MetricsMiddleware. These metrics track QR code operations, service performa
 and feature flag status.
 """
 
+import inspect
+import itertools
 import time
 from functools import wraps
 from typing import Callable, Optional
 
 from prometheus_client import Counter, Gauge, Histogram
 
+from app.core import tracing
+from app.core.config import settings
+from app.core.metrics_multiprocess import check_multiprocess_dir
+
+# The multiprocess metrics directory must exist before the first metric is created
+check_multiprocess_dir()
+
+# Global kill switch for time_service_call; see MetricsLogger.set_service_call_timing
+_service_call_timing_enabled = settings.SERVICE_CALL_METRICS_ENABLED
+
 # ============================================================================
 # Custom Prometheus Metrics for QR Application
 # ============================================================================
@@ -37,19 +49,125 @@ qr_image_generations_total = Counter(
     ['format', 'status']  
 )
 
+# QR Image Encoding Metrics
+qr_image_encode_duration_seconds = Histogram(
+    'qr_image_encode_duration_seconds',
+    'Duration of raster image encoding by format and encoding profile',
+    ['format', 'profile'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+
+qr_image_encode_budget_exceeded_total = Counter(
+    'qr_image_encode_budget_exceeded_total',
+    'Total raster encodes that exceeded the latency budget of their profile',
+    ['format', 'profile']
+)
+
+# Logging Pipeline Metrics
+log_records_dropped_total = Counter(
+    'log_records_dropped_total',
+    'Total log records dropped because the logging queue was full',
+    ['logger']
+)
+
+# Database Session Metrics
+db_request_sessions_total = Counter(
+    'db_request_sessions_total',
+    'Request-scoped database sessions by how far they were used '
+    '(not_created, no_connection, connection)',
+    ['outcome']
+)
+
+db_pool_stale_checks_total = Counter(
+    'db_pool_stale_checks_total',
+    'Liveness checks of pooled connections that were idle past the staleness threshold',
+    ['result']
+)
+
+# Database Connection Pool Metrics
+db_pool_checkout_wait_seconds = Histogram(
+    'db_pool_checkout_wait_seconds',
+    'Time spent waiting to check out a pooled database connection',
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+db_pool_checkout_timeouts_total = Counter(
+    'db_pool_checkout_timeouts_total',
+    'Total connection checkouts that timed out waiting for the pool'
+)
+
+db_pool_connections_in_use = Gauge(
+    'db_pool_connections_in_use',
+    'Pooled database connections currently checked out',
+    multiprocess_mode='livesum',
+)
+
+db_pool_overflow_connections = Gauge(
+    'db_pool_overflow_connections',
+    'Connections open beyond the configured pool size (0 while the pool is not full)',
+    multiprocess_mode='livesum',
+)
+
+db_pool_connection_events_total = Counter(
+    'db_pool_connection_events_total',
+    'Database connection churn (connect, close, invalidate)',
+    ['event']
+)
+
+# Event Loop Metrics
+event_loop_lag_seconds = Histogram(
+    'event_loop_lag_seconds',
+    'Delay between when the event-loop heartbeat was due and when it ran',
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+event_loop_blocked_total = Counter(
+    'event_loop_blocked_total',
+    'Total event-loop stalls longer than the blocked threshold'
+)
+
+# Fragment Revalidation Metrics
+fragment_responses_total = Counter(
+    'fragment_responses_total',
+    'HTMX fragment responses by result (full, not_modified)',
+    ['fragment', 'result']
+)
+
+# Start-up Warm-up Metrics
+app_warmup_step_duration_seconds = Histogram(
+    'app_warmup_step_duration_seconds',
+    'Duration of each start-up warm-up step by outcome (ok, failed, timeout)',
+    ['step', 'status'],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+
+app_warmup_duration_seconds = Histogram(
+    'app_warmup_duration_seconds',
+    'Duration of the whole start-up warm-up by outcome (completed, timeout)',
+    ['outcome'],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+)
+
 # Service Call Duration Metrics
 service_call_duration_seconds = Histogram(
     'service_call_duration_seconds',
-    'Duration of internal service calls',
+    'Duration of internal service calls (hot operations time only a sample of calls; see service_calls_total)',
     ['service_name', 'operation_name'],
     buckets=(0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
 )
 
+service_calls_total = Counter(
+    'service_calls_total',
+    'Internal service calls, counted on every call',
+    ['service_name', 'operation_name']
+)
+
 # Feature Flag Status Metrics
 feature_flag_active = Gauge(
     'feature_flag_active', 
     'Feature flag status (1=active, 0=inactive)',
-    ['flag_name']
+    ['flag_name'],
+    multiprocess_mode='livemax',
 )
 
 # ============================================================================
@@ -78,7 +196,9 @@ qr_generation_path_duration_seconds = Histogram(
 app_circuit_breaker_state_enum = Gauge(
     'app_circuit_breaker_state_enum',
     'Circuit breaker state (0=closed, 1=open, 2=half_open)',
-    ['service', 'operation']
+    ['service', 'operation'],
+    # Worst state across live workers
+    multiprocess_mode='livemax',
 )
 
 # Circuit Breaker Fallback Metrics
@@ -137,6 +257,136 @@ class MetricsLogger:
         status = 'success' if success else 'failure'
         qr_image_generations_total.labels(format=format, status=status).inc()
     
+    @staticmethod
+    def log_image_encoded(format: str, profile: str, duration: float, over_budget: bool) -> None:
+        """
+        Log raster image encoding performance.
+        
+        Args:
+            format: Image format ('png', 'jpeg', 'webp')
+            profile: Encoding profile ('fast', 'balanced', 'archival')
+            duration: Encode duration in seconds
+            over_budget: Whether the encode exceeded the profile's latency budget
+        """
+        qr_image_encode_duration_seconds.labels(format=format, profile=profile).observe(duration)
+        if over_budget:
+            qr_image_encode_budget_exceeded_total.labels(format=format, profile=profile).inc()
+    
+    @staticmethod
+    def log_record_dropped(logger_name: str) -> None:
+        """
+        Log a record dropped by the logging queue.
+        
+        Args:
+            logger_name: Name of the logger that emitted the dropped record
+        """
+        log_records_dropped_total.labels(logger=logger_name).inc()
+    
+    @staticmethod
+    def log_db_session(outcome: str) -> None:
+        """
+        Log how a request-scoped database session was used.
+        
+        Args:
+            outcome: 'not_created' (session never used), 'no_connection' (session
+                used without checking out a pooled connection) or 'connection'
+        """
+        db_request_sessions_total.labels(outcome=outcome).inc()
+    
+    @staticmethod
+    def log_db_pool_checkout(wait: float, timed_out: bool = False) -> None:
+        """
+        Log a pooled connection checkout attempt.
+        
+        Args:
+            wait: Seconds spent waiting for the connection
+            timed_out: Whether the checkout gave up after the pool timeout
+        """
+        db_pool_checkout_wait_seconds.observe(wait)
+        if timed_out:
+            db_pool_checkout_timeouts_total.inc()
+    
+    @staticmethod
+    def set_db_pool_usage(in_use: int, overflow: int) -> None:
+        """
+        Set the current connection pool usage.
+        
+        Args:
+            in_use: Connections currently checked out
+            overflow: Connections open beyond the pool size
+        """
+        db_pool_connections_in_use.set(in_use)
+        db_pool_overflow_connections.set(overflow)
+    
+    @staticmethod
+    def log_db_connection_event(event: str) -> None:
+        """
+        Log database connection churn.
+        
+        Args:
+            event: 'connect', 'close' or 'invalidate'
+        """
+        db_pool_connection_events_total.labels(event=event).inc()
+    
+    @staticmethod
+    def log_db_stale_check(result: str) -> None:
+        """
+        Log a liveness check of an idle pooled connection.
+        
+        Args:
+            result: 'ok' if the connection was alive, 'stale' if it was replaced
+        """
+        db_pool_stale_checks_total.labels(result=result).inc()
+    
+    @staticmethod
+    def log_event_loop_lag(lag: float) -> None:
+        """
+        Log event-loop scheduling delay.
+        
+        Args:
+            lag: Seconds the heartbeat ran later than scheduled
+        """
+        event_loop_lag_seconds.observe(lag)
+    
+    @staticmethod
+    def log_event_loop_blocked() -> None:
+        """Log an event-loop stall that exceeded the blocked threshold."""
+        event_loop_blocked_total.inc()
+    
+    @staticmethod
+    def log_fragment_response(fragment: str, result: str) -> None:
+        """
+        Log an HTMX fragment response.
+        
+        Args:
+            fragment: Route name of the fragment
+            result: 'full' (body sent) or 'not_modified' (304)
+        """
+        fragment_responses_total.labels(fragment=fragment, result=result).inc()
+    
+    @staticmethod
+    def log_warmup_step(step: str, status: str, duration: float) -> None:
+        """
+        Log a start-up warm-up step.
+        
+        Args:
+            step: Step name ('pool', 'statements', etc.)
+            status: 'ok', 'failed' or 'timeout'
+            duration: Duration in seconds
+        """
+        app_warmup_step_duration_seconds.labels(step=step, status=status).observe(duration)
+    
+    @staticmethod
+    def log_warmup_completed(outcome: str, duration: float) -> None:
+        """
+        Log the end of the start-up warm-up.
+        
+        Args:
+            outcome: 'completed' or 'timeout'
+            duration: Duration in seconds
+        """
+        app_warmup_duration_seconds.labels(outcome=outcome).observe(duration)
+    
     @staticmethod
     def log_service_call(service_name: str, operation: str, duration: float) -> None:
         """
@@ -165,13 +415,33 @@ class MetricsLogger:
         feature_flag_active.labels(flag_name=flag_name).set(value)
     
     @staticmethod
-    def time_service_call(service_name: str, operation: str) -> Callable:
+    def set_service_call_timing(enabled: bool) -> None:
+        """
+        Enable or disable all time_service_call instrumentation at runtime.
+        
+        Args:
+            enabled: Whether decorated calls record their duration
+        """
+        global _service_call_timing_enabled
+        _service_call_timing_enabled = enabled
+    
+    @staticmethod
+    def time_service_call(service_name: str, operation: str, sample_every: int = 1) -> Callable:
         """
         Decorator to automatically time and log service calls.
         
+        The metric children for the labels are resolved once, at decoration
+        time. Coroutine functions are timed until the coroutine completes. Every
+        call is counted in service_calls_total; when sample_every is greater
+        than 1, only one in that many calls is timed, so the histogram count for
+        the operation is a sample and call rates should be read from the
+        counter. Nothing is recorded while the SERVICE_CALL_METRICS_ENABLED kill
+        switch is off.
+        
         Args:
             service_name: Name of the service
             operation: Operation name
+            sample_every: Time one in every N calls (1 times every call)
             
         Returns:
             Decorator function
@@ -182,19 +452,46 @@ class MetricsLogger:
                 # Implementation here
                 pass
         """
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        observe = service_call_duration_seconds.labels(
+            service_name=service_name,
+            operation_name=operation,
+        ).observe
+        count_call = service_calls_total.labels(
+            service_name=service_name,
+            operation_name=operation,
+        ).inc
+        counter = itertools.count()
+
+        def should_time() -> bool:
+            if not _service_call_timing_enabled:
+                return False
+            count_call()
+            return sample_every == 1 or next(counter) % sample_every == 0
+
         def decorator(func: Callable) -> Callable:
+            if inspect.iscoroutinefunction(func):
+                @wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    if not should_time():
+                        return await func(*args, **kwargs)
+                    start_time = time.perf_counter()
+                    try:
+                        return await func(*args, **kwargs)
+                    finally:
+                        observe(time.perf_counter() - start_time)
+                return async_wrapper
+
             @wraps(func)
             def wrapper(*args, **kwargs):
+                if not should_time():
+                    return func(*args, **kwargs)
                 start_time = time.perf_counter()
                 try:
-                    result = func(*args, **kwargs)
-                    duration = time.perf_counter() - start_time
-                    MetricsLogger.log_service_call(service_name, operation, duration)
-                    return result
-                except Exception as e:
-                    duration = time.perf_counter() - start_time
-                    MetricsLogger.log_service_call(service_name, operation, duration)
-                    raise
+                    return func(*args, **kwargs)
+                finally:
+                    observe(time.perf_counter() - start_time)
             return wrapper
         return decorator
 
@@ -216,6 +513,8 @@ class MetricsLogger:
         status = 'success' if success else 'failure'
         qr_generation_path_total.labels(path=path, operation=operation, status=status).inc()
         qr_generation_path_duration_seconds.labels(path=path, operation=operation).observe(duration)
+        # Record the path decision on the traced service call, if any
+        tracing.add_event("qr.generation_path", {"path": path, "success": success, "duration_ms": duration * 1000})
     
     # ============================================================================
     # Circuit Breaker Metrics Methods
@@ -259,6 +558,7 @@ class MetricsLogger:
             operation=operation, 
             reason=reason
         ).inc()
+        tracing.add_event("circuit_breaker.fallback", {"service": service, "reason": reason})
     
     @staticmethod
     def log_circuit_breaker_failure(service: str, operation: str, error_type: str) -> None:
@@ -0,0 +1,135 @@
+"""
+Prometheus multiprocess support for multi-worker deployments.
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set, prometheus_client stores every
+metric value in per-process files in that directory and each worker's
+/metrics response must aggregate all of them. The variable is read straight
+from the environment (not from Settings) because prometheus_client reads it
+at import time, before the application is configured.
+
+The directory has to be emptied before the workers are forked;
+app/scripts/init.sh does this. It also has to exist before the first metric
+is created, which happens at import time in every process that imports the
+metric modules (including alembic and the manage_db.py commands), so those
+modules call check_multiprocess_dir before defining their metrics. Each
+worker then only cleans up after dead workers at startup and marks itself
+dead at shutdown.
+"""
+
+import logging
+import os
+from pathlib import Path
+from typing import List, Optional
+
+from prometheus_client import CollectorRegistry, generate_latest
+from prometheus_client import multiprocess
+
+logger = logging.getLogger(__name__)
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+
+def get_multiprocess_dir() -> Optional[Path]:
+    """
+    Get the configured multiprocess metrics directory.
+
+    Returns:
+        The directory, or None if multiprocess mode is disabled
+    """
+    path = os.environ.get(MULTIPROC_DIR_ENV)
+    return Path(path) if path else None
+
+
+def is_multiprocess_enabled() -> bool:
+    """Whether metrics are collected in multiprocess mode."""
+    return get_multiprocess_dir() is not None
+
+
+def generate_metrics() -> bytes:
+    """
+    Render metrics in the Prometheus text format.
+
+    In multiprocess mode, the values of all workers (live and dead) are
+    aggregated from the metrics directory; otherwise the default registry
+    of this process is rendered.
+
+    Returns:
+        The encoded metrics
+    """
+    if not is_multiprocess_enabled():
+        return generate_latest()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return generate_latest(registry)
+
+
+def _pid_is_alive(pid: int) -> bool:
+    """Check whether a process with this PID exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists but belongs to another user
+        return True
+    return True
+
+
+def cleanup_dead_worker_files() -> List[int]:
+    """
+    Remove live-gauge files left behind by workers that are no longer running.
+
+    Counter and histogram files of dead workers are kept so that totals stay
+    monotonic; only the gauges whose mode counts live processes are removed.
+
+    Returns:
+        The PIDs that were cleaned up
+    """
+    directory = get_multiprocess_dir()
+    if directory is None or not directory.is_dir():
+        return []
+
+    pids = set()
+    for path in directory.glob("gauge_live*_*.db"):
+        try:
+            pids.add(int(path.stem.rsplit("_", 1)[1]))
+        except ValueError:
+            continue
+
+    dead = sorted(pid for pid in pids if pid != os.getpid() and not _pid_is_alive(pid))
+    for pid in dead:
+        multiprocess.mark_process_dead(pid, str(directory))
+    if dead:
+        logger.info(f"Removed multiprocess metric files of dead workers: {dead}")
+    return dead
+
+
+def check_multiprocess_dir() -> None:
+    """
+    Make sure the multiprocess metrics directory can hold metric files.
+
+    Called at import time, before any metric is created: prometheus_client
+    opens a file in the directory as soon as a metric value exists, and fails
+    with FileNotFoundError if the directory is missing. A missing directory is
+    created (it is empty, so no stale values can be picked up).
+
+    Raises:
+        RuntimeError: If multiprocess mode is enabled but the directory
+            cannot be created or is not writable
+    """
+    directory = get_multiprocess_dir()
+    if directory is None:
+        return
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        raise RuntimeError(f"{MULTIPROC_DIR_ENV}={directory} cannot be created: {e}") from e
+    if not os.access(directory, os.W_OK):
+        raise RuntimeError(f"{MULTIPROC_DIR_ENV}={directory} must be a writable directory")
+
+
+def mark_current_process_dead() -> None:
+    """Remove this worker's live-gauge files at shutdown."""
+    directory = get_multiprocess_dir()
+    if directory is not None and directory.is_dir():
+        multiprocess.mark_process_dead(os.getpid(), str(directory))
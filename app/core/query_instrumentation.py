@@ -0,0 +1,253 @@
+"""
+Per-query instrumentation for SQLAlchemy engines.
+
+Every statement is tagged with a stable query name taken from the innermost
+application frame that issued it, which for repository queries is the
+repository method (e.g. ``ScanLogRepository.get_scan_log_page``). Latency and
+row counts are exported per query name. Statement time is added to the
+request's Server-Timing ``db`` entry and, for traced requests, recorded as a
+``db <query name>`` span. Statements slower than DB_SLOW_QUERY_MS are written
+to the slow-query log with the shapes (not the values) of their bound
+parameters and, optionally, an ``EXPLAIN (ANALYZE, BUFFERS)`` plan.
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.metrics_multiprocess import check_multiprocess_dir
+from app.core.server_timing import DB, record_timing
+from app.core.tracing import SPAN_KIND_CLIENT, start_span
+
+# The multiprocess metrics directory must exist before the first metric is created
+check_multiprocess_dir()
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+APP_DIR = str(Path(__file__).resolve().parent.parent)
+# Frames in these files belong to the instrumentation itself, not the caller
+_IGNORED_FILES = {__file__, str(Path(APP_DIR) / "database.py")}
+
+UNKNOWN_QUERY = "unknown"
+MAX_LOGGED_STATEMENT_LENGTH = 2000
+MAX_FRAME_DEPTH = 60
+EXPLAIN_SAVEPOINT = "slow_query_explain"
+
+db_query_duration_seconds = Histogram(
+    'db_query_duration_seconds',
+    'Database statement execution time by query name',
+    ['query'],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
+db_query_rows = Histogram(
+    'db_query_rows',
+    'Rows returned or affected per database statement by query name',
+    ['query'],
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000, 10000)
+)
+
+db_slow_queries_total = Counter(
+    'db_slow_queries_total',
+    'Database statements slower than DB_SLOW_QUERY_MS by query name',
+    ['query']
+)
+
+# code object -> query name, or None for frames outside the application
+_frame_names: Dict[Any, Optional[str]] = {}
+# query name -> (duration child, rows child)
+_metric_children: Dict[str, tuple] = {}
+
+
+def _frame_query_name(code) -> Optional[str]:
+    """Map a code object to a query name if it belongs to application code."""
+    try:
+        return _frame_names[code]
+    except KeyError:
+        filename = code.co_filename
+        name = None
+        if filename.startswith(APP_DIR) and filename not in _IGNORED_FILES:
+            name = getattr(code, "co_qualname", code.co_name)
+        _frame_names[code] = name
+        return name
+
+
+def get_query_name() -> str:
+    """
+    Derive the query name from the call stack.
+
+    Returns:
+        The qualified name of the innermost application function on the stack
+        (the repository method for repository queries), or UNKNOWN_QUERY
+    """
+    frame = sys._getframe(1)
+    depth = 0
+    while frame is not None and depth < MAX_FRAME_DEPTH:
+        name = _frame_query_name(frame.f_code)
+        if name is not None:
+            return name
+        frame = frame.f_back
+        depth += 1
+    return UNKNOWN_QUERY
+
+
+def describe_parameters(parameters: Any, executemany: bool = False) -> Any:
+    """
+    Describe the shape of bound parameters without their values.
+
+    Args:
+        parameters: DBAPI parameters (mapping, sequence, or a list of either)
+        executemany: Whether parameters is a list of parameter sets
+
+    Returns:
+        Parameter names/positions mapped to type names
+    """
+    if executemany and isinstance(parameters, (list, tuple)):
+        first = describe_parameters(parameters[0]) if parameters else None
+        return {"rows": len(parameters), "first": first}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _metric_children_for(query: str) -> tuple:
+    """Get (and cache) the labelled histogram children for a query name."""
+    children = _metric_children.get(query)
+    if children is None:
+        children = (db_query_duration_seconds.labels(query=query), db_query_rows.labels(query=query))
+        _metric_children[query] = children
+    return children
+
+
+def _explain(cursor, statement: str, parameters: Any) -> Optional[str]:
+    """
+    Capture the EXPLAIN (ANALYZE, BUFFERS) plan of a read-only statement.
+
+    ANALYZE executes the statement again, so only SELECT statements are explained.
+    The EXPLAIN runs on the request's connection inside a savepoint: if it fails
+    (statement timeout, cancellation, parameters it cannot handle), rolling back
+    to the savepoint keeps the request's transaction usable.
+    """
+    if not statement.lstrip().upper().startswith("SELECT"):
+        return None
+    # Outside a transaction block a failed EXPLAIN cannot abort anything
+    savepoint = not getattr(cursor.connection, "autocommit", False)
+    explain_cursor = cursor.connection.cursor()
+    try:
+        if savepoint:
+            explain_cursor.execute(f"SAVEPOINT {EXPLAIN_SAVEPOINT}")
+        try:
+            explain_cursor.execute(f"EXPLAIN (ANALYZE, BUFFERS) {statement}", parameters)
+            plan = "\n".join(row[0] for row in explain_cursor.fetchall())
+        except Exception:
+            if savepoint:
+                explain_cursor.execute(f"ROLLBACK TO SAVEPOINT {EXPLAIN_SAVEPOINT}")
+            raise
+        if savepoint:
+            explain_cursor.execute(f"RELEASE SAVEPOINT {EXPLAIN_SAVEPOINT}")
+        return plan
+    except Exception as e:
+        logger.warning(f"EXPLAIN failed for slow query: {e}")
+        return None
+    finally:
+        explain_cursor.close()
+
+
+def _end_query_span(conn, query: str, statement: str, rowcount: int) -> None:
+    """End the statement's span (if the request is traced), named after the query."""
+    spans = conn.info.get("query_span")
+    span = spans.pop() if spans else None
+    if span is None:
+        return
+    span.name = f"db {query}"
+    span.set_attribute("db.query.name", query)
+    span.set_attribute("db.statement", statement[:MAX_LOGGED_STATEMENT_LENGTH])
+    if rowcount is not None and rowcount >= 0:
+        span.set_attribute("db.rows", rowcount)
+    span.end()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+    conn.info.setdefault("query_span", []).append(
+        start_span("db.query", SPAN_KIND_CLIENT, {"db.system": conn.dialect.name})
+    )
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start_times = conn.info.get("query_start_time")
+    if not start_times:
+        return
+    duration = time.perf_counter() - start_times.pop()
+    record_timing(DB, duration)
+
+    query = get_query_name()
+    _end_query_span(conn, query, statement, cursor.rowcount)
+    duration_child, rows_child = _metric_children_for(query)
+    duration_child.observe(duration)
+    # Server-side (streaming) cursors report -1 until rows are fetched
+    if cursor.rowcount is not None and cursor.rowcount >= 0:
+        rows_child.observe(cursor.rowcount)
+
+    if duration * 1000 < settings.DB_SLOW_QUERY_MS:
+        return
+
+    db_slow_queries_total.labels(query=query).inc()
+    plan = None
+    if (
+        settings.DB_SLOW_QUERY_EXPLAIN
+        and not executemany
+        and conn.dialect.name == "postgresql"
+        and not (context is not None and context.execution_options.get("stream_results"))
+    ):
+        plan = _explain(cursor, statement, parameters)
+
+    slow_query_logger.warning(
+        "Slow query %s took %.1fms (rows: %s, parameters: %s): %s%s",
+        query,
+        duration * 1000,
+        cursor.rowcount,
+        describe_parameters(parameters, executemany),
+        statement[:MAX_LOGGED_STATEMENT_LENGTH],
+        f"\n{plan}" if plan else "",
+    )
+
+
+def _handle_error(exception_context):
+    # Drop the start time of the failed statement so the stack stays balanced
+    connection = exception_context.connection
+    if connection is not None:
+        start_times = connection.info.get("query_start_time")
+        if start_times:
+            start_times.pop()
+        spans = connection.info.get("query_span")
+        if spans:
+            span = spans.pop()
+            if span is not None:
+                span.name = f"db {get_query_name()}"
+                span.record_exception(exception_context.original_exception)
+                span.end()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Attach per-query metrics and slow-query capture to an engine.
+
+    Args:
+        engine: The SQLAlchemy engine to instrument
+    """
+    if not settings.DB_QUERY_METRICS_ENABLED:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,163 @@
+"""
+Per-request timing breakdown for the Server-Timing response header.
+
+ServerTimingMiddleware stores a ServerTimings accumulator in a context variable
+for the duration of a request. Code that does measurable work (SQL statements,
+QR rendering, template rendering, cache lookups) adds its elapsed time under a
+metric name with ``record_timing``, the ``track`` context manager or the
+``timed`` decorator. Outside a request, or with SERVER_TIMING_ENABLED off, no
+accumulator is set and recording is a single context-variable lookup.
+
+The accumulator is a mutable object shared by reference, so time recorded in
+sync handlers and dependencies running in the threadpool (which receive a copy
+of the request context) is still added to the request's totals.
+"""
+
+import asyncio
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Dict, Iterator, Optional
+
+# Metric names used in the Server-Timing header
+DB = "db"
+RENDER = "render"
+TEMPLATE = "template"
+CACHE = "cache"
+APP = "app"
+MIDDLEWARE = "mw"
+TOTAL = "total"
+
+# Descriptions shown in browser devtools
+DESCRIPTIONS = {
+    DB: "Database",
+    RENDER: "QR image rendering",
+    TEMPLATE: "Template rendering",
+    CACHE: "Cache lookups",
+    APP: "Routing and handler",
+    MIDDLEWARE: "Middleware",
+    TOTAL: "Total",
+}
+
+
+class ServerTimings:
+    """Accumulated durations (seconds) and call counts per metric name."""
+
+    __slots__ = ("durations", "counts")
+
+    def __init__(self):
+        self.durations: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add a duration to a metric."""
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def to_header(self) -> str:
+        """
+        Render the Server-Timing header value.
+
+        Returns:
+            Comma-separated ``name;dur=<ms>;desc="..."`` entries
+        """
+        entries = []
+        for name, seconds in self.durations.items():
+            desc = DESCRIPTIONS.get(name, name)
+            count = self.counts.get(name, 1)
+            if count > 1 and name not in (APP, MIDDLEWARE, TOTAL):
+                desc = f"{desc} ({count})"
+            entries.append(f'{name};dur={seconds * 1000:.2f};desc="{desc}"')
+        return ", ".join(entries)
+
+
+_current_timings: ContextVar[Optional[ServerTimings]] = ContextVar("server_timings", default=None)
+
+
+def start_request_timings() -> Token:
+    """
+    Install a fresh accumulator for the current request.
+
+    Returns:
+        Token to pass to end_request_timings
+    """
+    return _current_timings.set(ServerTimings())
+
+
+def end_request_timings(token: Token) -> None:
+    """Remove the current request's accumulator."""
+    _current_timings.reset(token)
+
+
+def get_request_timings() -> Optional[ServerTimings]:
+    """Get the current request's accumulator, or None outside a timed request."""
+    return _current_timings.get()
+
+
+def record_timing(name: str, seconds: float) -> None:
+    """
+    Add a duration to the current request's Server-Timing metric.
+
+    Args:
+        name: Metric name (e.g. DB, RENDER)
+        seconds: Elapsed time in seconds
+    """
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+
+@contextmanager
+def track(name: str) -> Iterator[None]:
+    """Time the enclosed block under a Server-Timing metric."""
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, time.perf_counter() - start)
+
+
+def timed(name: str):
+    """
+    Decorator that times a sync or async function under a Server-Timing metric.
+
+    Args:
+        name: Metric name (e.g. RENDER)
+
+    Returns:
+        Decorator function
+    """
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                timings = _current_timings.get()
+                if timings is None:
+                    return await func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    timings.add(name, time.perf_counter() - start)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            timings = _current_timings.get()
+            if timings is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings.add(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,456 @@
+"""
+Lightweight in-process tracing.
+
+TracingMiddleware starts a server span for each sampled request and makes it
+the current span (a context variable, so it follows the request into the
+threadpool). Nested spans are created with the ``span`` context manager or the
+``traced`` decorator; outside a sampled request both are no-ops costing one
+context-variable lookup.
+
+Spans of a trace are buffered until its root span ends. Traces at least
+TRACING_MIN_DURATION_MS long, or that ended in an error, are handed to a
+JsonLinesSpanExporter, which writes them from a background thread in batches
+as OTLP/JSON ``ExportTraceServiceRequest`` lines (the format of the
+OpenTelemetry Collector file exporter), one file per worker process.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+import queue
+import random
+import re
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+SERVICE_NAME = "qr-generator"
+INSTRUMENTATION_SCOPE = "app"
+MAX_EXPORT_FILE_BYTES = 50 * 1024 * 1024
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_TRACE_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+def _new_trace_id() -> str:
+    return f"{random.getrandbits(128):032x}"
+
+
+def _new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+class _Trace:
+    """Spans of one trace, buffered until the root span ends."""
+
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List["Span"] = []
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = (
+        "trace", "span_id", "parent_span_id", "name", "kind", "start_ns", "end_ns",
+        "attributes", "events", "status_code", "status_message",
+    )
+
+    def __init__(
+        self,
+        trace: _Trace,
+        name: str,
+        parent_span_id: Optional[str] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.trace = trace
+        self.span_id = _new_span_id()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.events: List[Tuple[int, str, Optional[Dict[str, Any]]]] = []
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1_000_000
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        self.events.append((time.time_ns(), name, attributes))
+
+    def set_error(self, message: str) -> None:
+        self.status_code = STATUS_ERROR
+        self.status_message = message
+
+    def record_exception(self, exc: BaseException) -> None:
+        """Mark the span as failed and attach the exception as an event."""
+        self.set_error(f"{type(exc).__name__}: {exc}")
+        self.add_event("exception", {"exception.type": type(exc).__name__, "exception.message": str(exc)})
+
+    def end(self) -> None:
+        """End the span; ending the root span completes the trace."""
+        if self.end_ns is not None:
+            return
+        self.end_ns = time.time_ns()
+        self.trace.spans.append(self)
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Encode the span in OTLP/JSON form."""
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": self.status_code},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.status_message:
+            span["status"]["message"] = self.status_message
+        if self.events:
+            span["events"] = [
+                {"timeUnixNano": str(ts), "name": name, "attributes": _otlp_attributes(attrs or {})}
+                for ts, name, attrs in self.events
+            ]
+        return span
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items() if value is not None]
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def get_current_span() -> Optional[Span]:
+    """Get the current span, or None outside a sampled request."""
+    return _current_span.get()
+
+
+def current_trace_id() -> Optional[str]:
+    """Get the trace ID of the current span, if any."""
+    span = _current_span.get()
+    return span.trace.trace_id if span is not None else None
+
+
+def set_attribute(key: str, value: Any) -> None:
+    """Set an attribute on the current span, if any."""
+    span = _current_span.get()
+    if span is not None:
+        span.attributes[key] = value
+
+
+def add_event(name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+    """Add an event to the current span, if any."""
+    span = _current_span.get()
+    if span is not None:
+        span.add_event(name, attributes)
+
+
+def parse_trace_context(traceparent: Optional[str], trace_id_header: Optional[str]) -> Tuple[Optional[str], Optional[str], bool]:
+    """
+    Extract the incoming trace context.
+
+    Args:
+        traceparent: W3C ``traceparent`` header value
+        trace_id_header: ``X-Trace-ID`` header value (32 hex characters)
+
+    Returns:
+        (trace_id, parent_span_id, sampled_upstream); IDs are None when absent
+    """
+    if traceparent:
+        match = _TRACEPARENT_RE.match(traceparent.strip().lower())
+        if match:
+            return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1)
+    if trace_id_header:
+        trace_id = trace_id_header.strip().lower().replace("-", "")
+        if _TRACE_ID_RE.match(trace_id):
+            return trace_id, None, False
+    return None, None, False
+
+
+def should_sample(sampled_upstream: bool = False) -> bool:
+    """Decide whether to trace a request (upstream-sampled requests always are)."""
+    return sampled_upstream or random.random() < settings.TRACING_SAMPLE_RATIO
+
+
+def start_trace(
+    name: str,
+    trace_id: Optional[str] = None,
+    parent_span_id: Optional[str] = None,
+    attributes: Optional[Dict[str, Any]] = None,
+) -> Span:
+    """
+    Start the root (server) span of a request.
+
+    Args:
+        name: Span name
+        trace_id: Incoming trace ID to continue, or None for a new trace
+        parent_span_id: Remote parent span ID
+        attributes: Initial span attributes
+
+    Returns:
+        The root span (not yet current; see activate)
+    """
+    trace = _Trace(trace_id or _new_trace_id())
+    return Span(trace, name, parent_span_id, SPAN_KIND_SERVER, attributes)
+
+
+def activate(span: Span) -> Token:
+    """Make a span the current span; returns the token for deactivate."""
+    return _current_span.set(span)
+
+
+def deactivate(token: Token) -> None:
+    _current_span.reset(token)
+
+
+def finish_trace(root: Span) -> None:
+    """
+    End the root span and export the trace if it is slow enough or failed.
+
+    Args:
+        root: The root span started with start_trace
+    """
+    root.end()
+    if root.status_code == STATUS_ERROR or root.duration_ms >= settings.TRACING_MIN_DURATION_MS:
+        if _exporter is not None:
+            _exporter.export(root.trace.spans)
+
+
+def start_span(name: str, kind: int = SPAN_KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None) -> Optional[Span]:
+    """
+    Start a child of the current span without making it current.
+
+    Use for leaf operations whose start and end happen in different callbacks
+    (e.g. SQL statement events).
+
+    Returns:
+        The span, or None outside a sampled request
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return None
+    return Span(parent.trace, name, parent.span_id, kind, attributes)
+
+
+@contextmanager
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None) -> Iterator[Optional[Span]]:
+    """
+    Run the enclosed block in a child span of the current span.
+
+    Yields:
+        The span, or None outside a sampled request
+    """
+    child = start_span(name, kind, attributes)
+    if child is None:
+        yield None
+        return
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+def traced(name: str):
+    """
+    Decorator that runs a sync or async function in a child span.
+
+    Args:
+        name: Span name, e.g. ``QRCodeService.generate_qr``
+
+    Returns:
+        Decorator function
+    """
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _current_span.get() is None:
+                    return await func(*args, **kwargs)
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class JsonLinesSpanExporter:
+    """
+    Batched exporter writing OTLP/JSON lines to a per-process file.
+
+    Traces are queued without blocking the request; a background thread
+    writes one ``ExportTraceServiceRequest`` line per batch. Traces arriving
+    while the queue is full are dropped.
+
+    Args:
+        directory: Directory for span files (``spans-<pid>.jsonl``)
+        batch_size: Spans per exported line
+        flush_interval: Maximum seconds a span waits before being written
+        max_queue: Maximum traces waiting to be written
+    """
+
+    def __init__(self, directory: Path, batch_size: int, flush_interval: float, max_queue: int):
+        self.path = Path(directory) / f"spans-{os.getpid()}.jsonl"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._resource = {
+            "attributes": _otlp_attributes({
+                "service.name": SERVICE_NAME,
+                "service.version": "1.0.0",
+                "deployment.environment": settings.ENVIRONMENT,
+                "host.name": socket.gethostname(),
+                "process.pid": os.getpid(),
+            })
+        }
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+        logger.info(f"Span exporter writing to {self.path}")
+
+    def export(self, spans: List[Span]) -> None:
+        """Queue the spans of a finished trace."""
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Write queued spans and stop the writer thread."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+        if self.dropped:
+            logger.warning(f"Span exporter dropped {self.dropped} traces (queue full)")
+
+    def _run(self) -> None:
+        batch: List[Span] = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = []
+            if item is None:
+                self._write(batch)
+                return
+            batch.extend(item)
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._write(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _write(self, spans: List[Span]) -> None:
+        if not spans:
+            return
+        line = json.dumps({
+            "resourceSpans": [{
+                "resource": self._resource,
+                "scopeSpans": [{
+                    "scope": {"name": INSTRUMENTATION_SCOPE},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }]
+        }, separators=(",", ":"))
+        try:
+            if self.path.exists() and self.path.stat().st_size > MAX_EXPORT_FILE_BYTES:
+                os.replace(self.path, self.path.with_suffix(".jsonl.1"))
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to write {len(spans)} spans: {e}")
+
+
+_exporter: Optional[JsonLinesSpanExporter] = None
+
+
+def configure_exporter(exporter: Optional[JsonLinesSpanExporter]) -> None:
+    """Set the exporter finished traces are handed to."""
+    global _exporter
+    _exporter = exporter
+
+
+def create_span_exporter() -> Optional[JsonLinesSpanExporter]:
+    """
+    Create the exporter configured in settings.
+
+    Returns:
+        A JsonLinesSpanExporter, or None if tracing is disabled
+    """
+    if not settings.TRACING_ENABLED:
+        return None
+    return JsonLinesSpanExporter(
+        directory=settings.TRACING_EXPORT_DIR,
+        batch_size=settings.TRACING_BATCH_SIZE,
+        flush_interval=settings.TRACING_FLUSH_INTERVAL_SECONDS,
+        max_queue=settings.TRACING_MAX_QUEUE,
+    )
@@ -4,16 +4,22 @@ Database configuration and session management for the QR code generator applicat
 
 import logging
 import os
+import threading
 import time
 from contextlib import contextmanager
 from datetime import UTC, datetime
 from pathlib import Path
 
-from sqlalchemy import create_engine
-from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.exc import DisconnectionError, OperationalError, SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
+from app.core.metrics_logger import MetricsLogger
+from app.core.query_instrumentation import instrument_engine
 
 logger = logging.getLogger(__name__)
 
@@ -21,10 +27,6 @@ logger = logging.getLogger(__name__)
 PG_DATABASE_URL = os.getenv("PG_DATABASE_URL")
 ENVIRONMENT = os.getenv("ENVIRONMENT", "development")
 
-# Check for required database URL
-if not PG_DATABASE_URL:
-    raise ValueError("PG_DATABASE_URL environment variable must be set")
-
 # Check if the application is in testing mode
 def is_testing_mode() -> bool:
     """
@@ -42,29 +44,246 @@ def get_database_url() -> str:
     
     Returns:
         str: The database URL to use
+
+    Raises:
+        ValueError: If PG_DATABASE_URL is not set
     """
     if is_testing_mode() and settings.TEST_DATABASE_URL:
         logger.info("Using test database URL for testing mode")
         return settings.TEST_DATABASE_URL
-    
-    logger.info(f"Using PostgreSQL database URL: {PG_DATABASE_URL}")
+
+    # Check for required database URL
+    if not PG_DATABASE_URL:
+        raise ValueError("PG_DATABASE_URL environment variable must be set")
+
+    logger.info(f"Using PostgreSQL database URL: {make_url(PG_DATABASE_URL).render_as_string(hide_password=True)}")
     return PG_DATABASE_URL
 
-# Get the current database URL
-CURRENT_DB_URL = get_database_url()
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait and how often they time out."""
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            MetricsLogger.log_db_pool_checkout(time.perf_counter() - start_time, timed_out=True)
+            raise
+        MetricsLogger.log_db_pool_checkout(time.perf_counter() - start_time)
+        return connection
+
+
+class _LazySessionMaker(sessionmaker):
+    """sessionmaker that creates the engine before the first session."""
+
+    def __call__(self, **local_kw):
+        if _engine is None:
+            get_engine()
+        return super().__call__(**local_kw)
+
+
+# The engine is created on first use (normally in the application lifespan),
+# not at import: creating it loads the dialect and DBAPI and reads the URL.
+_engine: Engine | None = None
+_engine_lock = threading.Lock()
+
+# Create sessionmaker with timezone-aware settings; bound when the engine is created
+SessionLocal = _LazySessionMaker(autocommit=False, autoflush=False, class_=Session)
+
+
+def get_engine() -> Engine:
+    """
+    Get the database engine, creating and instrumenting it on first use.
+
+    Returns:
+        The process-wide SQLAlchemy engine
+    """
+    global _engine
+    if _engine is not None:
+        return _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = _create_engine()
+            SessionLocal.configure(bind=_engine)
+    return _engine
+
+
+def __getattr__(name: str):
+    # Keep ``from app.database import engine`` working with the lazy engine
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _create_engine() -> Engine:
+    """Create the engine with PostgreSQL settings and attach pool instrumentation."""
+    engine = create_engine(
+        get_database_url(),
+        poolclass=InstrumentedQueuePool,
+        # No pool_pre_ping: only connections idle past DB_POOL_STALE_AFTER_SECONDS are checked (see below)
+        pool_recycle=settings.DB_POOL_RECYCLE,  # Recycle connections after this many seconds
+        pool_size=settings.DB_POOL_SIZE,  # Connections kept open in the pool
+        max_overflow=settings.DB_MAX_OVERFLOW,  # Extra connections allowed when needed
+        pool_timeout=settings.DB_POOL_TIMEOUT,  # Seconds to wait for a connection before failing
+        echo=os.getenv("SQL_ECHO", "false").lower() == "true",  # Log SQL queries if enabled
+    )
+
+    # Per-query latency/row metrics and slow-query log
+    instrument_engine(engine)
+
+    event.listen(engine, "checkin", _record_checkin_time)
+    event.listen(engine, "checkout", _record_checkout)
+    event.listen(engine, "checkout", _check_stale_connection)
+    event.listen(engine, "connect", _record_connect)
+    event.listen(engine, "close", _record_close)
+    event.listen(engine, "invalidate", _record_invalidate)
+    return engine
+
+
+def _update_pool_usage(returning: bool = False) -> None:
+    """
+    Export the current pool usage to the in-use and overflow gauges.
+
+    Args:
+        returning: Called from the checkin event, which fires before the pool
+            takes the connection back: the connection is still counted as
+            checked out, and as overflow if the full pool is about to close it
+    """
+    pool = get_engine().pool
+    in_use = pool.checkedout()
+    # Negative while fewer than pool_size connections are open
+    overflow = pool.overflow()
+    if returning:
+        in_use -= 1
+        if pool.checkedin() >= pool.size():
+            overflow -= 1
+    MetricsLogger.set_db_pool_usage(in_use, max(overflow, 0))
+
+
+def _record_checkin_time(dbapi_connection, connection_record):
+    """Remember when a connection was returned to the pool."""
+    connection_record.info["checked_in_at"] = time.monotonic()
+    _update_pool_usage(returning=True)
+
+
+def _record_checkout(dbapi_connection, connection_record, connection_proxy):
+    """Update pool usage gauges when a connection is handed out."""
+    _update_pool_usage()
+
+
+def _record_connect(dbapi_connection, connection_record):
+    MetricsLogger.log_db_connection_event("connect")
+
 
-# Create engine with PostgreSQL settings
-engine = create_engine(
-    CURRENT_DB_URL,
-    pool_pre_ping=True,  # Verify connections before using them
-    pool_recycle=300,  # Recycle connections every 5 minutes
-    pool_size=10,  # Maintain up to 10 connections in the pool
-    max_overflow=20,  # Allow up to 20 extra connections when needed
-    echo=os.getenv("SQL_ECHO", "false").lower() == "true",  # Log SQL queries if enabled
-)
+def _record_close(dbapi_connection, connection_record):
+    MetricsLogger.log_db_connection_event("close")
 
-# Create sessionmaker with timezone-aware settings
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, class_=Session)
+
+def _record_invalidate(dbapi_connection, connection_record, exception):
+    MetricsLogger.log_db_connection_event("invalidate")
+
+
+def get_pool_status() -> dict:
+    """
+    Summarize the current state of the connection pool.
+
+    Returns:
+        Dictionary with the pool configuration and current usage
+    """
+    pool = get_engine().pool
+    return {
+        "pool_class": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeout_seconds": pool.timeout(),
+        "recycle_seconds": settings.DB_POOL_RECYCLE,
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": pool.overflow(),
+        "stale_after_seconds": settings.DB_POOL_STALE_AFTER_SECONDS,
+    }
+
+
+def _check_stale_connection(dbapi_connection, connection_record, connection_proxy):
+    """
+    Ping a pooled connection before reuse if it has been idle for too long.
+
+    Connections in steady use are handed out without a round trip; a stale
+    connection raises DisconnectionError, which makes the pool discard it and
+    retry with a fresh one.
+    """
+    checked_in_at = connection_record.info.get("checked_in_at")
+    if checked_in_at is None or time.monotonic() - checked_in_at <= settings.DB_POOL_STALE_AFTER_SECONDS:
+        return
+    try:
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        finally:
+            cursor.close()
+        dbapi_connection.rollback()
+    except Exception as e:
+        MetricsLogger.log_db_stale_check("stale")
+        logger.warning(f"Discarding stale pooled database connection: {e}")
+        raise DisconnectionError("Stale pooled connection") from e
+    MetricsLogger.log_db_stale_check("ok")
+
+
+@event.listens_for(SessionLocal, "after_begin")
+def _mark_connection_used(session, transaction, connection):
+    """Flag sessions that checked out a pooled connection."""
+    session.info["connection_used"] = True
+
+
+class LazySession:
+    """
+    Proxy for a request-scoped Session that is only created on first use.
+
+    Attribute access is forwarded to the real Session, which is created when
+    the first attribute is looked up. Requests rejected before they touch the
+    database never construct a Session, and close() and rollback() are no-ops
+    for them. The Session itself only checks out a pooled connection when it
+    first executes a statement.
+    """
+
+    __slots__ = ("_session",)
+
+    def __init__(self):
+        self._session: Session | None = None
+
+    @property
+    def session_created(self) -> bool:
+        """Whether the underlying Session has been created."""
+        return self._session is not None
+
+    def _get_session(self) -> Session:
+        if self._session is None:
+            self._session = SessionLocal()
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self._get_session(), name)
+
+    def rollback(self) -> None:
+        if self._session is not None:
+            self._session.rollback()
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+
+    def usage(self) -> str:
+        """
+        Describe how far the session was used.
+
+        Returns:
+            'not_created', 'no_connection' or 'connection'
+        """
+        if self._session is None:
+            return "not_created"
+        if self._session.info.get("connection_used"):
+            return "connection"
+        return "no_connection"
 
 
 # Define Base class using new SQLAlchemy 2.0 style
@@ -130,19 +349,23 @@ def get_db_context():
 
 
 def get_db_with_logging():
-    """Get database session with proper error handling and logging."""
-    db = None
+    """
+    Get database session with proper error handling and logging.
+
+    Yields a LazySession, so requests that never use the database do not
+    create a Session or check out a pooled connection. How far each session
+    was used is recorded in db_request_sessions_total.
+    """
+    db = LazySession()
     try:
-        db = SessionLocal()
         yield db
     except Exception as e:
         logger.exception("Database session error", extra={"error": str(e)})
-        if db:
-            db.rollback()
+        db.rollback()
         raise
     finally:
-        if db:
-            db.close()
+        db.close()
+        MetricsLogger.log_db_session(db.usage())
 
 
 def init_db():
@@ -152,7 +375,7 @@ def init_db():
     """
     try:
         # Create all tables
-        Base.metadata.create_all(bind=engine)
+        Base.metadata.create_all(bind=get_engine())
         logger.info("Database tables initialized successfully")
     except Exception as e:
         logger.error(f"Error initializing database: {str(e)}")
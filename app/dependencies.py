@@ -4,12 +4,15 @@ Dependency injection functions for the QR code generator application.
 
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, FastAPI, Request
 from sqlalchemy.orm import Session
 
 from .database import get_db_with_logging
 from .repositories import QRCodeRepository, ScanLogRepository
 from .services.qr_service import QRCodeService
+from .services.dashboard_loader import DashboardDataLoader
+from .services.health import HealthMonitor
+from .core.config import settings
 
 # New imports for Observatory-First refactoring
 from .adapters.segno_qr_adapter import SegnoQRCodeGenerator, PillowQRImageFormatter
@@ -21,7 +24,7 @@ from .services.new_analytics_service import NewAnalyticsService
 from .services.new_validation_service import NewValidationService
 
 # Circuit breaker imports
-import pybreaker
+import aiobreaker
 from .core.circuit_breaker import get_new_qr_generation_breaker
 
 
@@ -100,11 +103,106 @@ def get_new_qr_generation_service(
     return NewQRGenerationService(generator=generator, formatter=formatter)
 
 
+def create_app_singletons(app: FastAPI) -> None:
+    """
+    Build the stateless adapters, services, circuit breaker, health monitor
+    and dashboard loader once per process.
+    
+    Called from the application lifespan; the instances are stored on app.state
+    and shared by all requests instead of being rebuilt per request.
+    
+    Args:
+        app: The FastAPI application
+    """
+    generator = get_segno_qr_generator()
+    formatter = get_pillow_qr_formatter()
+    app.state.qr_generator = generator
+    app.state.qr_formatter = formatter
+    app.state.new_qr_generation_service = get_new_qr_generation_service(generator, formatter)
+    app.state.new_qr_generation_breaker = get_new_qr_generation_breaker()
+    app.state.health_monitor = HealthMonitor(
+        interval=settings.HEALTH_REFRESH_INTERVAL_SECONDS,
+        max_age=settings.HEALTH_SNAPSHOT_MAX_AGE_SECONDS,
+    )
+    app.state.dashboard_loader = DashboardDataLoader()
+
+
+def _get_app_singleton(request: Request, name: str):
+    """
+    Get an app-scoped instance, creating the singletons if lifespan did not run.
+    
+    Args:
+        request: The current request
+        name: Attribute name on app.state
+        
+    Returns:
+        The shared instance
+    """
+    state = request.app.state
+    if not hasattr(state, name):
+        create_app_singletons(request.app)
+    return getattr(state, name)
+
+
+async def get_app_new_qr_generation_service(request: Request) -> NewQRGenerationService:
+    """
+    Dependency for the app-scoped NewQRGenerationService.
+    
+    Args:
+        request: The current request
+        
+    Returns:
+        The shared NewQRGenerationService instance
+    """
+    return _get_app_singleton(request, "new_qr_generation_service")
+
+
+async def get_health_monitor(request: Request) -> HealthMonitor:
+    """
+    Dependency for the app-scoped HealthMonitor.
+    
+    Args:
+        request: The current request
+        
+    Returns:
+        The shared HealthMonitor instance
+    """
+    return _get_app_singleton(request, "health_monitor")
+
+
+async def get_dashboard_loader(request: Request) -> DashboardDataLoader:
+    """
+    Dependency for the app-scoped DashboardDataLoader.
+    
+    Args:
+        request: The current request
+        
+    Returns:
+        The shared DashboardDataLoader instance
+    """
+    return _get_app_singleton(request, "dashboard_loader")
+
+
+async def get_app_new_qr_generation_breaker(request: Request) -> aiobreaker.CircuitBreaker:
+    """
+    Dependency for the app-scoped NewQRGenerationService circuit breaker.
+    
+    The breaker must be shared so that failures accumulate across requests.
+    
+    Args:
+        request: The current request
+        
+    Returns:
+        The shared circuit breaker instance
+    """
+    return _get_app_singleton(request, "new_qr_generation_breaker")
+
+
 def get_qr_service(
     qr_code_repo: Annotated[QRCodeRepository, Depends(get_qr_code_repository)],
     scan_log_repo: Annotated[ScanLogRepository, Depends(get_scan_log_repository)],
-    new_qr_generation_service: Annotated[NewQRGenerationService, Depends(get_new_qr_generation_service)],
-    new_qr_generation_breaker: Annotated[pybreaker.CircuitBreaker, Depends(get_new_qr_generation_breaker)]
+    new_qr_generation_service: Annotated[NewQRGenerationService, Depends(get_app_new_qr_generation_service)],
+    new_qr_generation_breaker: Annotated[aiobreaker.CircuitBreaker, Depends(get_app_new_qr_generation_breaker)]
 ) -> QRCodeService:
     """
     Dependency for getting a QRCodeService instance.
@@ -126,6 +224,25 @@ def get_qr_service(
     )
 
 
+async def get_redirect_qr_service(
+    db: Annotated[Session, Depends(get_db_with_logging)],
+) -> QRCodeService:
+    """
+    Dependency for the QRCodeService used by the redirect endpoint.
+    
+    A redirect only looks up the QR code by short ID, checks the redirect URL
+    and records the scan, so this builds the service from the two repositories
+    in a single dependency, without the QR generation service or circuit breaker.
+    
+    Args:
+        db: The database session (injected via FastAPI's dependency system)
+        
+    Returns:
+        An instance of QRCodeService without QR generation support
+    """
+    return QRCodeService(qr_code_repo=QRCodeRepository(db), scan_log_repo=ScanLogRepository(db))
+
+
 def get_new_analytics_service(
     # Note: For now, we don't have concrete implementations of AnalyticsProvider and ScanEventLogger
     # These will be added in future phases when we create concrete adapters
@@ -2,6 +2,7 @@
 Main FastAPI application module for the QR code generator.
 """
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
@@ -20,7 +21,7 @@ from fastapi.staticfiles import StaticFiles
 from sqlalchemy.exc import SQLAlchemyError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
-from .api import api_router, redirect_router_no_prefix, web_router_no_prefix, health_router_no_prefix
+from .api import include_routers
 from .core.config import settings
 from .core.exceptions import (
     DatabaseError,
@@ -30,20 +31,30 @@ from .core.exceptions import (
     RedirectURLError,
     ResourceConflictError,
 )
-from .middleware import LoggingMiddleware, MetricsMiddleware, RequestIDMiddleware
-from .database import get_db_with_logging
-from .repositories.qr_code_repository import QRCodeRepository
-from .repositories.scan_log_repository import ScanLogRepository
-from .services.qr_service import QRCodeService
+from .middleware import (
+    LoggingMiddleware,
+    MetricsMiddleware,
+    RequestIDMiddleware,
+    ServerTimingHandlerMiddleware,
+    ServerTimingMiddleware,
+    TracingHandlerMiddleware,
+    TracingMiddleware,
+)
+from .database import get_engine
+from .dependencies import create_app_singletons
+from .core.event_loop_monitor import create_event_loop_monitor
+from .core.tracing import configure_exporter, create_span_exporter
 from .core.metrics_logger import initialize_feature_flags
-
-# Configure logging
-logging.basicConfig(
-    level=settings.LOG_LEVEL,
-    format="%(asctime)s - %(levelname)s - [%(name)s] - %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
+from .warmup import create_warmup
+from .core.metrics_multiprocess import (
+    cleanup_dead_worker_files,
+    get_multiprocess_dir,
+    mark_current_process_dead,
 )
 
+# Logging (root and api.* loggers) is configured by app.middleware.logging.setup_logging,
+# which routes all records through a background queue listener
+
 logger = logging.getLogger("app.main")
 
 
@@ -60,179 +71,69 @@ async def lifespan(app: FastAPI):
     """
     start_time = datetime.now(UTC)
     logger.info("Application starting up...")
+    # /readyz reports not ready until warm-up has completed
+    app.state.warmed_up = False
+
+    # Step 0: Drop multiprocess metric files of dead workers (the directory itself
+    # is checked when the metric modules are imported)
+    multiproc_dir = get_multiprocess_dir()
+    if multiproc_dir is not None:
+        logger.info(f"Prometheus multiprocess mode enabled (directory: {multiproc_dir})")
+    cleanup_dead_worker_files()
+
+    # Step 0b: Watch the event loop for blocking calls
+    loop_monitor = create_event_loop_monitor()
+    if loop_monitor is not None:
+        loop_monitor.start()
+
+    # Step 0c: Start the span exporter for sampled request traces
+    span_exporter = create_span_exporter()
+    if span_exporter is not None:
+        span_exporter.start()
+        configure_exporter(span_exporter)
 
     # Step 1: Initialize feature flags for metrics
     logger.info("Initializing feature flags...")
     initialize_feature_flags()
 
+    # Step 1b: Build app-scoped adapters, services, circuit breaker, health monitor and dashboard loader once
+    create_app_singletons(app)
+    # Health checks run in the background from here on; /health serves the snapshot
+    app.state.health_monitor.start()
+
     # Step 2: Ensure required directories exist
     logger.info("Ensuring required directories exist...")
     settings.QR_CODES_DIR.mkdir(parents=True, exist_ok=True)
+    if settings.JINJA_BYTECODE_CACHE_ENABLED:
+        try:
+            settings.JINJA_BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.warning(f"Template bytecode cache disabled, cannot create {settings.JINJA_BYTECODE_CACHE_DIR}: {e}")
+
+    # Step 2b: Create the database engine (deferred from import time)
+    get_engine()
     
-    # Step 3: Pre-initialize key dependencies and routes
-    logger.info("Pre-initializing key dependencies and routes...")
-    db = None
-    try:
-        # Create DB session
-        db = next(get_db_with_logging())
-        logger.info("Database session created")
-        
-        # Initialize repositories and services
-        qr_code_repo = QRCodeRepository(db)
-        scan_log_repo = ScanLogRepository(db)
-        qr_service = QRCodeService(qr_code_repo=qr_code_repo, scan_log_repo=scan_log_repo)
-        logger.info("Repository and service layers initialized")
-        
-        # Explicitly import routing modules to load them
-        logger.info("Pre-loading route modules...")
-        from .api.v1.endpoints import redirect as redirect_module
-        from .api.v1.endpoints import qr as qr_module
-        logger.info(f"Loaded redirect module: {redirect_module.__name__}")
-        
-        # Pre-load the redirect endpoint function
-        from .api.v1.endpoints.redirect import redirect_qr
-        logger.info("Pre-loaded redirect endpoint function")
-        
-        # Try to warm up the most common code paths
+    # Step 3: Warm up the pool, hot statements, popular redirects and images and the
+    # templates in the background; /readyz reports not ready until it finishes
+    async def run_warmup() -> None:
         try:
-            # Initialize database query paths
-            total = qr_code_repo.count()
-            logger.info(f"Database contains {total} QR codes")
-            
-            # Initialize API endpoints and template rendering
-            recent_qrs, _ = qr_code_repo.list_qr_codes(skip=0, limit=5)
-            
-            if recent_qrs:
-                # Warm ORM model conversion paths
-                logger.info(f"Warming up ORM paths for {len(recent_qrs)} QR codes...")
-                _ = [qr.id for qr in recent_qrs]
-                _ = [qr.to_dict() for qr in recent_qrs]
-                
-                # Warm up QR generation paths
-                if len(recent_qrs) > 0:
-                    first_qr = recent_qrs[0]
-                    logger.info("Warming up QR image generation...")
-                    # Generate a test QR image to warm up the image generation path
-                    _ = qr_service.generate_qr(
-                        data=first_qr.content,
-                        size=10,
-                        border=4,
-                        fill_color=first_qr.fill_color,
-                        back_color=first_qr.back_color,
-                        image_format="png",
-                        image_quality=90,
-                        include_logo=False,
-                        error_level="M"
-                    )
-                
-                # Exercise the critical redirect path
-                logger.info("Warming up redirect code paths...")
-                dynamic_qrs = [qr for qr in recent_qrs if qr.qr_type == "dynamic"]
-                if dynamic_qrs:
-                    dynamic_qr = dynamic_qrs[0]
-                    # Extract the short_id from the content
-                    content = dynamic_qr.content
-                    if content and "/r/" in content:
-                        # Extract short_id from the URL path
-                        short_id = content.split("/r/")[-1]
-                        
-                        # CRITICAL: Warm up the exact service method used by redirect endpoint
-                        logger.info(f"Warming up get_qr_by_short_id with {short_id}...")
-                        try:
-                            # This uses direct lookup by short_id
-                            found_qr = qr_service.get_qr_by_short_id(short_id)
-                            logger.info(f"Successfully retrieved QR via short_id: {found_qr.id}")
-                            
-                            # Warm up redirect URL access
-                            if found_qr.qr_type == "dynamic" and found_qr.redirect_url:
-                                logger.info(f"Verifying redirect URL: {found_qr.redirect_url}")
-                            
-                            # Warm up the update_scan_statistics method (used in background task)
-                            try:
-                                # Call with minimal parameters since we're just warming up
-                                qr_service.update_scan_statistics(
-                                    qr_id=found_qr.id,
-                                    timestamp=datetime.now(UTC)
-                                )
-                                logger.info("Warmed up scan statistics update path")
-                            except Exception as e:
-                                logger.warning(f"Scan statistics update warm-up failed: {e}")
-                                
-                        except Exception as e:
-                            logger.warning(f"Service method warm-up failed: {e}")
-                            
-                            # Log the error but continue initialization
-                            logger.warning(f"Unable to warm up QR redirect path: {e}")
-                            logger.info("Application will continue to initialize")
-            else:
-                # If no QRs exist, create test ones to warm up paths
-                logger.info("No QR codes found, creating test QRs for initialization...")
-                
-                # Create a static test QR
-                test_static_qr = qr_service.create_static_qr({
-                    "content": "warmup-test",
-                    "size": 5,
-                    "border": 1,
-                    "fill_color": "#000000",
-                    "back_color": "#FFFFFF"
-                })
-                
-                # Create a dynamic test QR
-                test_dynamic_qr = qr_service.create_dynamic_qr({
-                    "redirect_url": "https://example.com",
-                    "size": 5,
-                    "border": 1,
-                    "fill_color": "#000000",
-                    "back_color": "#FFFFFF"
-                })
-                
-                # CRITICAL: Exercise the exact service method used by redirect endpoint
-                content = test_dynamic_qr.content
-                if content and "/r/" in content:
-                    short_id = content.split("/r/")[-1]
-                    logger.info(f"Warming up get_qr_by_short_id with test QR {short_id}...")
-                    try:
-                        found_qr = qr_service.get_qr_by_short_id(short_id)
-                        logger.info(f"Successfully retrieved test QR via short_id service method")
-                        
-                        # Warm up scan statistics with the test QR
-                        qr_service.update_scan_statistics(qr_id=found_qr.id)
-                        logger.info("Warmed up scan statistics with test QR")
-                    except Exception as e:
-                        logger.warning(f"Service method warm-up failed: {e}")
-                        logger.info("Application will continue to initialize")
-                
-                # Generate test image
-                _ = qr_service.generate_qr(
-                    data=test_static_qr.content,
-                    size=5,
-                    border=1,
-                    fill_color="#000000",
-                    back_color="#FFFFFF",
-                    image_format="png"
-                )
-                
-                # Clean up test QRs - using correct delete method
-                qr_code_repo.delete(test_static_qr.id)
-                qr_code_repo.delete(test_dynamic_qr.id)
-                logger.info("Cleaned up test QRs after initialization")
-                
-            # Warm up error handling code paths
-            logger.info("Warming up error handling code paths...")
-            
-        except Exception as e:
-            logger.warning(f"Pre-initialization operation failed: {e}")
-    except Exception as e:
-        logger.warning(f"Pre-initialization failed: {e}")
-    finally:
-        # Don't forget to close the DB session if it was created
-        if db is not None:
-            db.close()
-            logger.info("Pre-initialization DB session closed")
-
-    # Log successful initialization
+            await warmup.run()
+        finally:
+            app.state.warmed_up = True
+            warmup_duration = (datetime.now(UTC) - start_time).total_seconds()
+            logger.info(f"Warm-up finished {warmup_duration:.2f}s after start-up began, ready to handle requests")
+
+    warmup = None
+    warmup_task = None
+    if settings.WARMUP_ENABLED:
+        warmup = create_warmup(app)
+        warmup_task = asyncio.create_task(run_warmup())
+    else:
+        app.state.warmed_up = True
+    app.state.warmup = warmup
+
     init_duration = (datetime.now(UTC) - start_time).total_seconds()
-    logger.info(f"Application startup complete in {init_duration:.2f}s, ready to handle requests")
+    logger.info(f"Application startup complete in {init_duration:.2f}s")
 
     yield  # Application runs here
 
@@ -243,6 +144,21 @@ async def lifespan(app: FastAPI):
     try:
         logger.info("Cleaning up temp files...")
         # Add specific cleanup tasks here
+
+        if warmup_task is not None and not warmup_task.done():
+            warmup_task.cancel()
+
+        await app.state.health_monitor.stop()
+
+        if loop_monitor is not None:
+            await loop_monitor.stop()
+
+        if span_exporter is not None:
+            configure_exporter(None)
+            span_exporter.shutdown()
+
+        # Live gauges of this worker must not outlive it in multiprocess mode
+        mark_current_process_dead()
     except Exception as e:
         logger.exception(f"Error during cleanup: {e}")
 
@@ -257,6 +173,14 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Server-Timing handler measurement (innermost, so it times routing and the handler only)
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingHandlerMiddleware)
+
+# Endpoint span (innermost, so it covers routing and the handler)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingHandlerMiddleware)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -284,6 +208,14 @@ app.mount("/static", StaticFiles(directory=str(settings.STATIC_DIR)), name="stat
 # Add RequestIDMiddleware
 app.add_middleware(RequestIDMiddleware)
 
+# Request server span (outside every other custom middleware)
+if settings.TRACING_ENABLED:
+    app.add_middleware(TracingMiddleware)
+
+# Server-Timing header (outermost, so its total covers every middleware)
+if settings.SERVER_TIMING_ENABLED:
+    app.add_middleware(ServerTimingMiddleware)
+
 
 # Exception Handlers
 @app.exception_handler(StarletteHTTPException)
@@ -586,11 +518,8 @@ async def general_exception_handler(
     )
 
 
-# Include routers
-app.include_router(api_router)  # /api prefix
-app.include_router(redirect_router_no_prefix)  # /r prefix
-app.include_router(web_router_no_prefix)  # No prefix (for web pages)
-app.include_router(health_router_no_prefix)  # No prefix (for health check)
+# Include routers (/api/v1/..., /r, web pages, health checks)
+include_routers(app)
 
 # Root endpoint
 @app.get("/")
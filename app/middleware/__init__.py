@@ -5,7 +5,10 @@ Middleware package for FastAPI application.
 from .logging import LoggingMiddleware
 from .metrics import MetricsMiddleware
 from .request_id import RequestIDMiddleware
+from .server_timing import ServerTimingHandlerMiddleware, ServerTimingMiddleware
+from .tracing import TracingHandlerMiddleware, TracingMiddleware
 from .security import (
+    SecurityHeadersMiddleware,
     create_cors_middleware,
     create_security_headers_middleware,
     create_trusted_hosts_middleware,
@@ -15,6 +18,11 @@ __all__ = [
     "LoggingMiddleware",
     "MetricsMiddleware",
     "RequestIDMiddleware",
+    "SecurityHeadersMiddleware",
+    "ServerTimingMiddleware",
+    "ServerTimingHandlerMiddleware",
+    "TracingMiddleware",
+    "TracingHandlerMiddleware",
     "create_security_headers_middleware",
     "create_cors_middleware",
     "create_trusted_hosts_middleware",
@@ -3,20 +3,29 @@ Enhanced logging middleware for FastAPI application.
 Implements structured JSON logging with proper rotation and level configuration.
 Note: Complements Traefik's access logs by providing detailed application-level logging.
 While Traefik handles edge-level access logs, this middleware captures internal application state and processing details.
+
+Loggers only enqueue records; formatting, file writes and rotation happen on a
+background QueueListener thread so disk I/O never blocks the event loop.
 """
 
+import atexit
+import itertools
 import json
 import logging
 import logging.handlers
+import queue
+import threading
 import time
-from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from ..core.config import settings
+from ..core.metrics_logger import MetricsLogger
+from ..core.tracing import current_trace_id
 
 # Constants
 LOG_DIR = "/logs/api"
@@ -25,6 +34,8 @@ ERROR_LOG = "errors.log"
 PERFORMANCE_LOG = "performance.log"
 MAX_LOG_SIZE = 10 * 1024 * 1024  # 10MB
 LOG_BACKUP_COUNT = 5
+LOG_QUEUE_SIZE = 10000  # Records buffered before new records are dropped
+LOG_FLUSH_BATCH_SIZE = 256  # Records written between flushes while the queue is busy
 
 
 # Configure JSON formatter for structured logging
@@ -50,8 +61,123 @@ class JSONFormatter(logging.Formatter):
         return json.dumps(log_data)
 
 
+class _BatchFlushMixin:
+    """Defer stream flushes to the queue listener, which flushes once per batch."""
+
+    def flush(self) -> None:
+        pass
+
+    def flush_batch(self) -> None:
+        try:
+            super().flush()
+        except ValueError:
+            # The stream was closed underneath us (e.g. stdout at interpreter exit)
+            pass
+
+
+class BatchRotatingFileHandler(_BatchFlushMixin, logging.handlers.RotatingFileHandler):
+    """RotatingFileHandler flushed by the queue listener instead of per record."""
+
+
+class BatchStreamHandler(_BatchFlushMixin, logging.StreamHandler):
+    """StreamHandler flushed by the queue listener instead of per record."""
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for a bounded queue that drops records instead of blocking.
+
+    Dropped records are counted per logger so that log loss under load is
+    visible in the metrics rather than silent.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args into the message now (the objects may change later), but
+        # leave JSON formatting and exc_info rendering to the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+            MetricsLogger.log_record_dropped(record.name)
+
+
+class RoutingQueueListener(logging.handlers.QueueListener):
+    """
+    QueueListener that routes records to handlers by logger name.
+
+    Handlers are flushed when the queue runs empty or every
+    LOG_FLUSH_BATCH_SIZE records, so bursts are written in batches. A summary
+    of dropped records is written once per flush.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        routes: dict[str, list[logging.Handler]],
+        default_handlers: list[logging.Handler],
+        queue_handler: DroppingQueueHandler,
+    ):
+        all_handlers = list(dict.fromkeys(
+            [h for handlers in routes.values() for h in handlers] + default_handlers
+        ))
+        super().__init__(log_queue, *all_handlers, respect_handler_level=True)
+        self.routes = routes
+        self.default_handlers = default_handlers
+        self.queue_handler = queue_handler
+        self._pending = 0
+        self._reported_drops = 0
+
+    def handle(self, record: logging.LogRecord) -> None:
+        for handler in self.routes.get(record.name, self.default_handlers):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        self._pending += 1
+        if self._pending >= LOG_FLUSH_BATCH_SIZE or self.queue.empty():
+            self.flush()
+
+    def flush(self) -> None:
+        """Flush all handlers and report records dropped since the last flush."""
+        dropped = self.queue_handler.dropped
+        if dropped > self._reported_drops:
+            record = logging.LogRecord(
+                "api.logging", logging.WARNING, __file__, 0,
+                f"Logging queue full: dropped {dropped - self._reported_drops} records "
+                f"({dropped} total)", None, None,
+            )
+            self._reported_drops = dropped
+            for handler in self.default_handlers:
+                handler.handle(record)
+        for handler in self.handlers:
+            if isinstance(handler, _BatchFlushMixin):
+                handler.flush_batch()
+            else:
+                handler.flush()
+        self._pending = 0
+
+    def stop(self) -> None:
+        super().stop()
+        self.flush()
+
+
 def setup_logging():
-    """Configure logging with multiple handlers for different log types."""
+    """
+    Configure logging with multiple handlers for different log types.
+
+    All loggers (including the root logger) share one DroppingQueueHandler;
+    a RoutingQueueListener thread writes the records to the file and console
+    handlers.
+    """
     # Create logs directory
     log_dir = Path(LOG_DIR)
     log_dir.mkdir(parents=True, exist_ok=True)
@@ -63,20 +189,20 @@ def setup_logging():
         datefmt="%Y-%m-%d %H:%M:%S",
     )
 
-    # Create and configure handlers
+    # Create and configure handlers (used only by the listener thread)
     handlers = {
-        "access": logging.handlers.RotatingFileHandler(
+        "access": BatchRotatingFileHandler(
             log_dir / ACCESS_LOG, maxBytes=MAX_LOG_SIZE, backupCount=LOG_BACKUP_COUNT
         ),
-        "error": logging.handlers.RotatingFileHandler(
+        "error": BatchRotatingFileHandler(
             log_dir / ERROR_LOG, maxBytes=MAX_LOG_SIZE, backupCount=LOG_BACKUP_COUNT
         ),
-        "performance": logging.handlers.RotatingFileHandler(
+        "performance": BatchRotatingFileHandler(
             log_dir / PERFORMANCE_LOG,
             maxBytes=MAX_LOG_SIZE,
             backupCount=LOG_BACKUP_COUNT,
         ),
-        "console": logging.StreamHandler(),
+        "console": BatchStreamHandler(),
     }
 
     # Set formatters and levels
@@ -91,13 +217,32 @@ def setup_logging():
         "performance": logging.getLogger("api.performance"),
     }
 
+    log_queue: queue.Queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    queue_handler = DroppingQueueHandler(log_queue)
+    level = getattr(logging, settings.LOG_LEVEL.upper())
+
     # Configure specialized loggers
     for name, logger in loggers.items():
-        logger.setLevel(getattr(logging, settings.LOG_LEVEL.upper()))
-        logger.addHandler(handlers[name])
-        logger.addHandler(handlers["console"])
+        logger.setLevel(level)
+        logger.addHandler(queue_handler)
         logger.propagate = False
 
+    # Application loggers propagate to the root logger, which goes through the same queue
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.addHandler(queue_handler)
+
+    listener = RoutingQueueListener(
+        log_queue,
+        routes={
+            logger.name: [handlers[name], handlers["console"]] for name, logger in loggers.items()
+        },
+        default_handlers=[handlers["console"]],
+        queue_handler=queue_handler,
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
     return loggers
 
 
@@ -105,73 +250,82 @@ def setup_logging():
 loggers = setup_logging()
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Start timer for request duration using perf_counter for more precision
-        start_time = time.perf_counter()
+class LogSampler:
+    """
+    Per-route sampling of successful request logs.
 
-        # Extract correlation IDs and request metadata
-        request_id = request.headers.get("X-Request-ID", "")
-        trace_id = request.headers.get("X-Trace-ID", "")  # For distributed tracing
-        client_ip = (
-            request.headers.get("X-Real-IP")
-            or request.headers.get("X-Forwarded-For", "").split(",")[0].strip()
-            or request.client.host
-            if request.client
-            else "unknown"
-        )
+    Rules map a path prefix to N: one in every N requests under that prefix is
+    logged. The longest matching prefix wins; unmatched paths are always logged.
+    The decision is a counter check, so it is made before any log data is built.
+    """
 
-        # Prepare common log data
-        log_data = {
-            "request_id": request_id,
-            "trace_id": trace_id,
-            "method": request.method,
-            "path": request.url.path,
-            "query_params": str(request.query_params),
-            "client_ip": client_ip,
-            "user_agent": request.headers.get("user-agent"),
-            "referer": request.headers.get("referer"),
-            "host": request.headers.get("host"),
-            "protocol": request.headers.get("x-forwarded-proto", "http"),
-        }
+    def __init__(self, rules: dict[str, int]):
+        # Longest prefix first so the most specific rule wins
+        self._rules = [
+            (prefix, rate, itertools.count())
+            for prefix, rate in sorted(rules.items(), key=lambda item: len(item[0]), reverse=True)
+        ]
 
-        # Log request start
-        loggers["access"].info("Request started", extra={**log_data, "event": "request_start"})
+    def should_log(self, path: str) -> bool:
+        """
+        Decide whether a successful request on this path is logged.
 
-        # Process request and capture response
-        try:
-            response = await call_next(request)
-            duration = time.perf_counter() - start_time
+        Args:
+            path: Request path
 
-            # Add response data to log
-            response_data = {
-                **log_data,
-                "status_code": response.status_code,
-                "duration": f"{duration:.4f}",
-                "content_length": response.headers.get("content-length"),
-                "content_type": response.headers.get("content-type"),
-                "event": "request_complete",
-            }
+        Returns:
+            True if the request was sampled in (or no rule matches the path)
+        """
+        for prefix, rate, counter in self._rules:
+            if path.startswith(prefix):
+                return rate <= 1 or next(counter) % rate == 0
+        return True
 
-            # Log successful response
-            loggers["access"].info("Request completed", extra=response_data)
 
-            # Log performance metrics
-            loggers["performance"].info(
-                "Request performance",
-                extra={
-                    **log_data,
-                    "duration": f"{duration:.4f}",
-                    "status_code": response.status_code,
-                    "event": "request_performance",
-                },
-            )
+log_sampler = LogSampler(settings.LOG_SAMPLE_RULES)
+
+
+class LoggingMiddleware:
+    """
+    Pure ASGI middleware writing access, performance and error logs.
+
+    Request metadata is only collected for records that are actually written;
+    durations are measured until the response starts.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
 
-            return response
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
+        # Start timer for request duration using perf_counter for more precision
+        start_time = time.perf_counter()
+
+        # Decide once per request; endpoints read request.state.log_sampled to
+        # sample their own success logs consistently with the access log
+        sampled = log_sampler.should_log(scope["path"])
+        scope.setdefault("state", {})["log_sampled"] = sampled
+
+        response_start: Message | None = None
+        duration = 0.0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_start, duration
+            if message["type"] == "http.response.start":
+                response_start = message
+                duration = time.perf_counter() - start_time
+            await send(message)
+
+        # Process request and capture response
+        try:
+            await self.app(scope, receive, send_wrapper)
         except Exception as e:
             # Calculate duration even for failed requests
             duration = time.perf_counter() - start_time
+            log_data = _request_log_data(Request(scope))
 
             # Prepare error log data
             error_data = {
@@ -201,3 +355,72 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             )
 
             raise
+
+        if response_start is None:
+            return
+        status_code = response_start["status"]
+
+        # Error responses are always logged; sampled-out successes build nothing
+        if not sampled and status_code < 400:
+            return
+        if not loggers["access"].isEnabledFor(logging.INFO):
+            return
+
+        log_data = _request_log_data(Request(scope))
+        response_headers = Headers(raw=response_start.get("headers", []))
+
+        # A single record per request carries both the request and response data
+        loggers["access"].info(
+            "Request completed",
+            extra={
+                **log_data,
+                "status_code": status_code,
+                "duration": f"{duration:.4f}",
+                "content_length": response_headers.get("content-length"),
+                "content_type": response_headers.get("content-type"),
+                "event": "request_complete",
+            },
+        )
+
+        # Log performance metrics
+        loggers["performance"].info(
+            "Request performance",
+            extra={
+                **log_data,
+                "duration": f"{duration:.4f}",
+                "status_code": status_code,
+                "event": "request_performance",
+            },
+        )
+
+
+def _request_log_data(request: Request) -> dict[str, Any]:
+    """
+    Collect correlation IDs and request metadata for a log record.
+
+    Args:
+        request: The incoming request
+
+    Returns:
+        Common log fields for access, performance and error records
+    """
+    client_ip = (
+        request.headers.get("X-Real-IP")
+        or request.headers.get("X-Forwarded-For", "").split(",")[0].strip()
+        or request.client.host
+        if request.client
+        else "unknown"
+    )
+    return {
+        "request_id": request.headers.get("X-Request-ID", ""),
+        # For distributed tracing; the sampled trace's ID when tracing is enabled
+        "trace_id": current_trace_id() or request.headers.get("X-Trace-ID", ""),
+        "method": request.method,
+        "path": request.url.path,
+        "query_params": str(request.query_params),
+        "client_ip": client_ip,
+        "user_agent": request.headers.get("user-agent"),
+        "referer": request.headers.get("referer"),
+        "host": request.headers.get("host"),
+        "protocol": request.headers.get("x-forwarded-proto", "http"),
+    }
@@ -6,15 +6,15 @@ this middleware provides application-level insights.
 """
 
 import time
-from collections.abc import Callable
 
-from fastapi import Request, Response
-from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
-from starlette.middleware.base import BaseHTTPMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from ..core.config import settings
 # Import custom metrics to ensure they're registered with prometheus_client
 from ..core import metrics_logger  # This ensures custom metrics are included in generate_latest()
+from ..core.metrics_multiprocess import generate_metrics
 
 # Define application-level metrics (complementing Traefik's edge metrics)
 REQUEST_COUNT = Counter(
@@ -30,40 +30,100 @@ REQUEST_LATENCY = Histogram(
 )
 
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Handle metrics endpoint
-        if request.url.path == settings.METRICS_ENDPOINT:
-            return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+# Endpoint labels for requests that matched no route, and for new series past the cap
+UNMATCHED_ENDPOINT = "__unmatched__"
+OVERFLOW_ENDPOINT = "__overflow__"
 
-        # Start timer for request duration using perf_counter for more precision
-        start_time = time.perf_counter()
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
 
-        try:
-            # Process request
-            response = await call_next(request)
 
-            # Record metrics
-            duration = time.perf_counter() - start_time
-            REQUEST_LATENCY.labels(method=request.method, endpoint=request.url.path).observe(
-                duration
-            )
+def route_template(scope: Scope, root_path: str) -> str:
+    """
+    Get the route template a request was matched against.
 
-            REQUEST_COUNT.labels(
-                method=request.method,
-                endpoint=request.url.path,
-                status=response.status_code,
-            ).inc()
+    Args:
+        scope: The ASGI scope after routing
+        root_path: The root path before routing, used to detect mounted apps
 
-            return response
+    Returns:
+        The route template (e.g. ``/r/{short_id}``), the mount prefix for
+        mounted apps, or UNMATCHED_ENDPOINT if no route matched
+    """
+    route = scope.get("route")
+    if route is not None:
+        return getattr(route, "path_format", None) or route.path
+    # Mounted apps (e.g. /static) extend root_path instead of setting a route
+    mount_path = scope.get("root_path", "")[len(root_path):]
+    if mount_path:
+        return f"{mount_path}/{{path:path}}"
+    return UNMATCHED_ENDPOINT
 
-        except Exception:
-            # Record error metrics
-            duration = time.perf_counter() - start_time
-            REQUEST_LATENCY.labels(method=request.method, endpoint=request.url.path).observe(
-                duration
-            )
 
-            REQUEST_COUNT.labels(method=request.method, endpoint=request.url.path, status=500).inc()
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request count and latency.
+
+    Latency is measured until the response starts, matching the time at which
+    the response object became available to the previous BaseHTTPMiddleware.
+    Requests are labelled with their route template, and the number of distinct
+    label sets is capped by settings.METRICS_MAX_SERIES so that arbitrary paths
+    cannot grow the registry without bound.
+    """
+
+    def __init__(self, app: ASGIApp, max_series: int | None = None):
+        self.app = app
+        self.max_series = max_series or settings.METRICS_MAX_SERIES
+        self._series: set[tuple[str, str, int]] = set()
+
+    def _labels(self, method: str, endpoint: str, status: int) -> tuple[str, str, int]:
+        """Bound the label values, folding new series past the cap into the overflow bucket."""
+        if method not in KNOWN_METHODS:
+            method = "OTHER"
+        key = (method, endpoint, status)
+        if key in self._series:
+            return key
+        if len(self._series) < self.max_series:
+            self._series.add(key)
+            return key
+        return (method, OVERFLOW_ENDPOINT, status)
+
+    def _record(self, method: str, endpoint: str, status: int, duration: float) -> None:
+        method, endpoint, status = self._labels(method, endpoint, status)
+        REQUEST_LATENCY.labels(method=method, endpoint=endpoint).observe(duration)
+        REQUEST_COUNT.labels(method=method, endpoint=endpoint, status=status).inc()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Handle metrics endpoint
+        if scope["path"] == settings.METRICS_ENDPOINT:
+            response = Response(generate_metrics(), media_type=CONTENT_TYPE_LATEST)
+            await response(scope, receive, send)
+            return
+
+        method = scope["method"]
+        root_path = scope.get("root_path", "")
+
+        # Start timer for request duration using perf_counter for more precision
+        start_time = time.perf_counter()
+        duration = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal duration
+            if message["type"] == "http.response.start":
+                # Record metrics once the status is known; routing has filled in the scope by now
+                duration = time.perf_counter() - start_time
+                self._record(method, route_template(scope, root_path), message["status"], duration)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            # Record error metrics unless the response had already started
+            if duration is None:
+                duration = time.perf_counter() - start_time
+                self._record(method, route_template(scope, root_path), 500, duration)
 
             raise
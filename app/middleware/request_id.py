@@ -5,15 +5,14 @@ Middleware for adding request IDs to all requests.
 import uuid
 from datetime import UTC, datetime
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.middleware.base import RequestResponseEndpoint
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import logging
 
 logger = logging.getLogger("app.middleware.request_id")
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestIDMiddleware:
     """
     Middleware to add a unique request ID to each request.
 
@@ -21,26 +20,34 @@ class RequestIDMiddleware(BaseHTTPMiddleware):
     This helps with tracing requests through logs and metrics.
     """
 
-    async def dispatch(
-        self, request: Request, call_next: RequestResponseEndpoint
-    ):
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process a request and add a request ID to it.
 
         Args:
-            request: The incoming request.
-            call_next: The next middleware or route handler to call.
-
-        Returns:
-            The response from the next middleware or route handler.
+            scope: The ASGI connection scope.
+            receive: The ASGI receive channel.
+            send: The ASGI send channel.
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         request_id = str(uuid.uuid4())
+        state = scope.setdefault("state", {})
         # Add request id to request state
-        request.state.request_id = request_id
+        state["request_id"] = request_id
         # Add timestamp to request state
-        request.state.start_time = datetime.now(UTC)
+        state["start_time"] = datetime.now(UTC)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Add request id to response headers
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
+
         # Process the request
-        response = await call_next(request)
-        # Add request id to response headers
-        response.headers["X-Request-ID"] = request_id
-        return response 
\ No newline at end of file
+        await self.app(scope, receive, send_wrapper)
@@ -9,48 +9,60 @@ This module provides application-level security measures only.
 import logging
 from typing import List
 
-from fastapi import Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from starlette.middleware.base import RequestResponseEndpoint
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 logger = logging.getLogger(__name__)
 
-def create_security_headers_middleware(app):
+
+class SecurityHeadersMiddleware:
     """
-    Create security headers middleware using FastAPI's decorator pattern.
-    
+    Pure ASGI middleware adding application-specific security headers.
+
     As part of Phase III (Security Header Consolidation), standard security headers
     have been moved to Traefik configuration as the single source of truth.
-    
+
     This middleware now only handles application-specific headers that need to be
     dynamically generated or are contextual to specific requests.
     """
-    @app.middleware("http")
-    async def security_headers_middleware(request: Request, call_next: RequestResponseEndpoint) -> Response:
-        response = await call_next(request)
-        
-        # Initialize empty headers dictionary
-        headers = {}
-        
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         # Add CSP for static files - this is a dynamic, path-specific header
         # that makes sense to keep at the application level
-        if request.url.path.startswith("/static/"):
-            headers["Content-Security-Policy"] = "upgrade-insecure-requests"
-        
+        if scope["type"] != "http" or not scope["path"].startswith("/static/"):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["Content-Security-Policy"] = "upgrade-insecure-requests"
+            await send(message)
+
         # Standard security headers removed and now managed by Traefik:
         # - X-Content-Type-Options
         # - X-Frame-Options
         # - X-XSS-Protection
         # - Strict-Transport-Security (HSTS)
-            
-        # Only update headers if we have any to add
-        if headers:
-            response.headers.update(headers)
-        
-        return response
-
-    return security_headers_middleware
+        await self.app(scope, receive, send_wrapper)
+
+
+def create_security_headers_middleware(app):
+    """
+    Register the security headers middleware on an application.
+
+    Args:
+        app: The FastAPI application
+
+    Returns:
+        The middleware class that was added
+    """
+    app.add_middleware(SecurityHeadersMiddleware)
+    return SecurityHeadersMiddleware
 
 def create_cors_middleware(allowed_origins: List[str]) -> CORSMiddleware:
     """
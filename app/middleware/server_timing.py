@@ -0,0 +1,74 @@
+"""
+Server-Timing middleware.
+
+ServerTimingMiddleware is the outermost middleware: it installs the per-request
+timing accumulator and adds the Server-Timing header to the response.
+ServerTimingHandlerMiddleware is the innermost one and measures the time spent
+in routing and the handler; the remainder of the total is middleware overhead.
+"""
+
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core import server_timing
+
+
+class ServerTimingMiddleware:
+    """
+    Pure ASGI middleware that collects per-request timings and reports them
+    in a Server-Timing header.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        token = server_timing.start_request_timings()
+        timings = server_timing.get_request_timings()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                total = time.perf_counter() - start_time
+                app_time = timings.durations.get(server_timing.APP)
+                if app_time is not None:
+                    timings.durations[server_timing.MIDDLEWARE] = max(0.0, total - app_time)
+                timings.durations[server_timing.TOTAL] = total
+                MutableHeaders(scope=message).append("Server-Timing", timings.to_header())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            server_timing.end_request_timings(token)
+
+
+class ServerTimingHandlerMiddleware:
+    """
+    Pure ASGI middleware, added innermost, that measures routing and handler
+    time up to the start of the response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        timings = server_timing.get_request_timings()
+        if scope["type"] != "http" or timings is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                timings.durations[server_timing.APP] = time.perf_counter() - start_time
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
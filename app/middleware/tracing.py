@@ -0,0 +1,86 @@
+"""
+Tracing middleware.
+
+TracingMiddleware wraps the middleware stack in a server span for sampled
+requests, continuing an incoming W3C ``traceparent`` or ``X-Trace-ID`` and
+returning the trace ID in the ``X-Trace-ID`` response header.
+TracingHandlerMiddleware is added innermost and wraps routing and the
+endpoint in an ``endpoint`` span, so middleware time shows up as the gap
+between the two in a waterfall.
+"""
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..core import tracing
+from .metrics import route_template
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware that records a server span per sampled request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        trace_id, parent_span_id, sampled_upstream = tracing.parse_trace_context(
+            headers.get("traceparent"), headers.get("x-trace-id")
+        )
+        if not tracing.should_sample(sampled_upstream):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        root_path = scope.get("root_path", "")
+        root = tracing.start_trace(
+            method,
+            trace_id=trace_id,
+            parent_span_id=parent_span_id,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        )
+        token = tracing.activate(root)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                root.set_attribute("http.response.status_code", status_code)
+                if status_code >= 500:
+                    root.set_error(f"HTTP {status_code}")
+                MutableHeaders(scope=message)["X-Trace-ID"] = root.trace_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            root.record_exception(e)
+            raise
+        finally:
+            route = route_template(scope, root_path)
+            root.name = f"{method} {route}"
+            root.set_attribute("http.route", route)
+            tracing.deactivate(token)
+            tracing.finish_trace(root)
+
+
+class TracingHandlerMiddleware:
+    """Pure ASGI middleware, added innermost, that records an endpoint span."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or tracing.get_current_span() is None:
+            await self.app(scope, receive, send)
+            return
+
+        with tracing.span("endpoint") as endpoint_span:
+            await self.app(scope, receive, send)
+            # The router stores the matched route in the scope
+            route = scope.get("route")
+            if route is not None:
+                endpoint_span.name = f"endpoint {getattr(route, 'name', None) or route.path}"
@@ -5,7 +5,7 @@ Scan log database models for enhanced QR code tracking.
 import uuid
 from datetime import UTC, datetime
 
-from sqlalchemy import Column, String, Integer, Boolean, Text, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, Text, ForeignKey, Index
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -35,6 +35,10 @@ class ScanLog(Base):
     """
 
     __tablename__ = "scan_logs"
+    __table_args__ = (
+        # Keyset pagination of a QR code's scans, newest first
+        Index("ix_scan_logs_qr_code_id_scanned_at_id", "qr_code_id", "scanned_at", "id"),
+    )
 
     id: str = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()), index=True)
     qr_code_id: str = Column(String, ForeignKey("qr_codes.id", ondelete="CASCADE"), nullable=False, index=True)
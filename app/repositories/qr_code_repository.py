@@ -268,6 +268,26 @@ class QRCodeRepository(BaseRepository[QRCode]):
             logger.error(f"Database error listing QR codes: {str(e)}")
             raise DatabaseError(f"Database error while listing QR codes: {str(e)}")
 
+    @MetricsLogger.time_service_call("QRCodeRepository", "list_recent")
+    def list_recent(self, limit: int = 5) -> List[QRCode]:
+        """
+        Get the most recently created QR codes, without counting all rows.
+        
+        Args:
+            limit: Maximum number of QR codes to return
+            
+        Returns:
+            QR codes, newest first
+            
+        Raises:
+            DatabaseError: If a database error occurs
+        """
+        try:
+            return self.db.query(QRCode).order_by(QRCode.created_at.desc()).limit(limit).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error listing recent QR codes: {str(e)}")
+            raise DatabaseError(f"Database error listing recent QR codes: {str(e)}")
+
     @MetricsLogger.time_service_call("QRCodeRepository", "count")
     def count(self) -> int:
         """
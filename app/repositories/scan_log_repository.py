@@ -2,14 +2,18 @@
 Repository for scan log database operations.
 """
 
+import base64
+import binascii
 import logging
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, Iterator, List, Literal, Optional, Sequence, Tuple, Any
 from datetime import datetime, UTC
-from sqlalchemy import func, desc, extract, cast, Date
+from sqlalchemy import func, desc, extract, cast, Date, select, tuple_
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.core.exceptions import DatabaseError
 from app.core.metrics_logger import MetricsLogger
+from app.models.qr import QRCode
 from app.models.scan_log import ScanLog
 from .base_repository import BaseRepository
 
@@ -124,6 +128,217 @@ class ScanLogRepository(BaseRepository[ScanLog]):
             logger.error(f"Database error retrieving scan logs for QR code {qr_id}: {str(e)}")
             raise DatabaseError(f"Database error retrieving scan logs: {str(e)}")
             
+    # Columns rendered by the scan log table (no raw_user_agent or ip_address)
+    DISPLAY_COLUMNS = (
+        ScanLog.id,
+        ScanLog.scanned_at,
+        ScanLog.is_genuine_scan,
+        ScanLog.device_family,
+        ScanLog.os_family,
+        ScanLog.os_version,
+        ScanLog.browser_family,
+        ScanLog.browser_version,
+        ScanLog.is_mobile,
+        ScanLog.is_tablet,
+        ScanLog.is_pc,
+        ScanLog.is_bot,
+    )
+
+    @staticmethod
+    def encode_cursor(scanned_at: datetime, scan_id: str) -> str:
+        """
+        Encode a keyset pagination cursor for a scan log row.
+        
+        Args:
+            scanned_at: Scan timestamp of the row
+            scan_id: ID of the row
+            
+        Returns:
+            URL-safe cursor string
+        """
+        raw = f"{scanned_at.isoformat()}|{scan_id}".encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+        """
+        Decode a keyset pagination cursor.
+        
+        Args:
+            cursor: Cursor produced by encode_cursor
+            
+        Returns:
+            Tuple of (scanned_at, scan_id)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+            timestamp, scan_id = raw.split("|", 1)
+            return datetime.fromisoformat(timestamp), scan_id
+        except (binascii.Error, UnicodeError, ValueError) as e:
+            raise ValueError(f"Invalid scan log cursor: {cursor}") from e
+
+    @MetricsLogger.time_service_call("ScanLogRepository", "get_scan_log_page")
+    def get_scan_log_page(
+        self,
+        qr_id: str,
+        limit: int = 10,
+        genuine_only: bool = False,
+        cursor: Optional[str] = None,
+        direction: Literal["older", "newer"] = "older",
+        count_mode: Literal["exact", "approximate", "none"] = "approximate",
+    ) -> Dict[str, Any]:
+        """
+        Get one page of scan logs using a projection and keyset pagination.
+        
+        Rows are ordered newest first by (scanned_at, id). Instead of OFFSET, the
+        page starts after the row encoded in the cursor, so every page costs the
+        same index range scan no matter how deep it is. Only DISPLAY_COLUMNS are
+        selected and rows are returned as tuples, not ORM objects.
+        
+        Args:
+            qr_id: ID of the QR code to get scan logs for
+            limit: Maximum number of rows on the page
+            genuine_only: If True, return only genuine QR scans
+            cursor: Cursor of the row to page from (first page if None)
+            direction: "older" for rows after the cursor, "newer" for rows before it
+            count_mode: "exact" runs COUNT(*), "approximate" reads the QR code's
+                scan counters, "none" skips the total
+            
+        Returns:
+            Dictionary with the rows ("logs"), "total", "total_is_approximate",
+            and "older_cursor"/"newer_cursor" (None when there is no such page)
+            
+        Raises:
+            ValueError: If the cursor is malformed
+            DatabaseError: If a database error occurs
+        """
+        try:
+            query = select(*self.DISPLAY_COLUMNS).where(ScanLog.qr_code_id == qr_id)
+            if genuine_only:
+                query = query.where(ScanLog.is_genuine_scan == True)
+
+            key = tuple_(ScanLog.scanned_at, ScanLog.id)
+            newer = cursor is not None and direction == "newer"
+            if cursor is not None:
+                # A plain tuple is bound with the column types of the key
+                cursor_key = self.decode_cursor(cursor)
+                query = query.where(key > cursor_key if newer else key < cursor_key)
+
+            # Newer pages are read in ascending order, then flipped back to newest first
+            if newer:
+                query = query.order_by(ScanLog.scanned_at.asc(), ScanLog.id.asc())
+            else:
+                query = query.order_by(ScanLog.scanned_at.desc(), ScanLog.id.desc())
+
+            # Fetch one extra row to know whether another page exists
+            rows = self.db.execute(query.limit(limit + 1)).all()
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            if newer:
+                rows.reverse()
+
+            older_cursor = newer_cursor = None
+            if rows:
+                has_older = has_more if not newer else True
+                has_newer = cursor is not None if not newer else has_more
+                if has_older:
+                    older_cursor = self.encode_cursor(rows[-1].scanned_at, rows[-1].id)
+                if has_newer:
+                    newer_cursor = self.encode_cursor(rows[0].scanned_at, rows[0].id)
+
+            total = None
+            if count_mode == "exact":
+                count_query = select(func.count()).select_from(ScanLog).where(ScanLog.qr_code_id == qr_id)
+                if genuine_only:
+                    count_query = count_query.where(ScanLog.is_genuine_scan == True)
+                total = self.db.execute(count_query).scalar_one()
+            elif count_mode == "approximate":
+                # Denormalized counters maintained on every scan; O(1) instead of COUNT(*)
+                counter = QRCode.genuine_scan_count if genuine_only else QRCode.scan_count
+                total = self.db.execute(select(counter).where(QRCode.id == qr_id)).scalar() or 0
+
+            return {
+                "logs": rows,
+                "total": total,
+                "total_is_approximate": count_mode == "approximate",
+                "older_cursor": older_cursor,
+                "newer_cursor": newer_cursor,
+            }
+        except SQLAlchemyError as e:
+            logger.error(f"Database error retrieving scan log page for QR code {qr_id}: {str(e)}")
+            raise DatabaseError(f"Database error retrieving scan logs: {str(e)}")
+
+    # Columns written by scan log exports, in output order
+    EXPORT_COLUMNS = (
+        ScanLog.id,
+        ScanLog.qr_code_id,
+        ScanLog.scanned_at,
+        ScanLog.ip_address,
+        ScanLog.raw_user_agent,
+        ScanLog.is_genuine_scan,
+        ScanLog.device_family,
+        ScanLog.os_family,
+        ScanLog.os_version,
+        ScanLog.browser_family,
+        ScanLog.browser_version,
+        ScanLog.is_mobile,
+        ScanLog.is_tablet,
+        ScanLog.is_pc,
+        ScanLog.is_bot,
+    )
+
+    def stream_scan_logs(
+        self,
+        qr_id: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        genuine_only: bool = False,
+        batch_size: int = 1000,
+    ) -> Iterator[Sequence[Row]]:
+        """
+        Stream scan logs in batches using a server-side cursor.
+        
+        Rows are plain column tuples (see EXPORT_COLUMNS) rather than ORM objects,
+        so nothing accumulates in the session identity map and memory use stays
+        bounded by batch_size regardless of the number of rows.
+        
+        Args:
+            qr_id: Only include scans of this QR code (all QR codes if None)
+            start_date: Only include scans at or after this time
+            end_date: Only include scans before this time
+            genuine_only: If True, include only genuine QR scans
+            batch_size: Number of rows fetched per round trip
+            
+        Yields:
+            Batches of rows ordered by scan time
+            
+        Raises:
+            DatabaseError: If a database error occurs
+        """
+        query = select(*self.EXPORT_COLUMNS)
+        if qr_id is not None:
+            query = query.where(ScanLog.qr_code_id == qr_id)
+        if start_date is not None:
+            query = query.where(ScanLog.scanned_at >= start_date)
+        if end_date is not None:
+            query = query.where(ScanLog.scanned_at < end_date)
+        if genuine_only:
+            query = query.where(ScanLog.is_genuine_scan == True)
+        query = query.order_by(ScanLog.scanned_at, ScanLog.id)
+
+        try:
+            # yield_per implies stream_results, i.e. a named (server-side) cursor on PostgreSQL
+            result = self.db.execute(query.execution_options(yield_per=batch_size))
+            for batch in result.partitions():
+                yield batch
+        except SQLAlchemyError as e:
+            logger.error(f"Database error streaming scan logs: {str(e)}")
+            raise DatabaseError(f"Database error streaming scan logs: {str(e)}")
+
     @MetricsLogger.time_service_call("ScanLogRepository", "get_device_statistics")
     def get_device_statistics(self, qr_id: str) -> Dict[str, Dict[str, int]]:
         """
@@ -141,38 +356,21 @@ class ScanLogRepository(BaseRepository[ScanLog]):
             DatabaseError: If a database error occurs
         """
         try:
-            # Get device type counts
-            device_types = {}
-            
-            # Count mobile devices
-            mobile_count = self.db.query(func.count(ScanLog.id)).filter(
-                ScanLog.qr_code_id == qr_id,
-                ScanLog.is_mobile == True
-            ).scalar() or 0
-            
-            # Count tablets
-            tablet_count = self.db.query(func.count(ScanLog.id)).filter(
-                ScanLog.qr_code_id == qr_id,
-                ScanLog.is_tablet == True
-            ).scalar() or 0
-            
-            # Count PCs
-            pc_count = self.db.query(func.count(ScanLog.id)).filter(
-                ScanLog.qr_code_id == qr_id,
-                ScanLog.is_pc == True
-            ).scalar() or 0
-            
-            # Count bots
-            bot_count = self.db.query(func.count(ScanLog.id)).filter(
-                ScanLog.qr_code_id == qr_id,
-                ScanLog.is_bot == True
-            ).scalar() or 0
+            # Count all device types in one pass over the QR code's scan logs
+            mobile_count, tablet_count, pc_count, bot_count = self.db.query(
+                func.count(ScanLog.id).filter(ScanLog.is_mobile == True),
+                func.count(ScanLog.id).filter(ScanLog.is_tablet == True),
+                func.count(ScanLog.id).filter(ScanLog.is_pc == True),
+                func.count(ScanLog.id).filter(ScanLog.is_bot == True),
+            ).filter(
+                ScanLog.qr_code_id == qr_id
+            ).one()
             
             device_types = {
-                "mobile": mobile_count,
-                "tablet": tablet_count,
-                "pc": pc_count,
-                "bot": bot_count
+                "mobile": mobile_count or 0,
+                "tablet": tablet_count or 0,
+                "pc": pc_count or 0,
+                "bot": bot_count or 0
             }
             
             # Get top device families
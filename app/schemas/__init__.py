@@ -16,6 +16,7 @@ from .qr import (
     # Parameter models
     QRListParameters,
     QRUpdateParameters,
+    ScanLogExportParameters,
     StaticQRCreateParameters,
 )
 
@@ -43,4 +44,5 @@ __all__ = [
     "StaticQRCreateParameters",
     "DynamicQRCreateParameters",
     "QRUpdateParameters",
+    "ScanLogExportParameters",
 ]
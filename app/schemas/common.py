@@ -25,6 +25,26 @@ class ImageFormat(str, Enum):
     WEBP = "webp"
 
 
+class ExportFormat(str, Enum):
+    """Valid scan log export formats."""
+
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+class EncodingProfile(str, Enum):
+    """
+    Raster encoder presets trading output size against encode latency.
+
+    The interactive dashboard uses FAST, API responses default to BALANCED and
+    print exports default to ARCHIVAL.
+    """
+
+    FAST = "fast"
+    BALANCED = "balanced"
+    ARCHIVAL = "archival"
+
+
 class ErrorCorrectionLevel(str, Enum):
     """
     QR code error correction levels.
@@ -5,15 +5,21 @@ Health check schemas package.
 from .models import (
     HealthResponse,
     HealthStatus,
+    LivenessResponse,
+    ReadinessResponse,
     ServiceCheck,
     ServiceStatus,
+    StartupResponse,
     SystemMetrics,
 )
 
 __all__ = [
     "HealthResponse",
     "HealthStatus",
+    "LivenessResponse",
+    "ReadinessResponse",
     "ServiceCheck",
     "ServiceStatus",
+    "StartupResponse",
     "SystemMetrics",
 ]
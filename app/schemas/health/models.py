@@ -4,7 +4,7 @@ Health check Pydantic models.
 
 from datetime import datetime
 from enum import Enum
-from typing import Any
+from typing import Any, Dict
 
 from pydantic import BaseModel, ConfigDict, Field, field_validator
 
@@ -81,6 +81,9 @@ class HealthResponse(BaseModel):
     environment: str = Field(default="development")
     timestamp: datetime = datetime.now()
     uptime_seconds: float = Field(default=0.0, description="Service uptime in seconds")
+    snapshot_age_seconds: float | None = Field(
+        default=None, description="Seconds since the checks were last run by the background refresher"
+    )
     system_metrics: SystemMetrics | None = None
     services: dict[str, ServiceStatus] | None = None
     checks: dict[str, ServiceCheck] | None = None
@@ -118,3 +121,34 @@ class HealthResponse(BaseModel):
             }
         }
     )
+
+
+class LivenessResponse(BaseModel):
+    """Liveness probe response schema."""
+
+    status: str = "alive"
+
+
+class StartupResponse(BaseModel):
+    """Start-up probe response schema."""
+
+    status: str = Field(description="'started' or 'starting'")
+    warmed_up: bool = Field(description="Whether start-up warm-up has completed")
+    warmup_steps: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Status of each warm-up step (pending, running, ok, failed, timeout, skipped)",
+    )
+
+
+class ReadinessResponse(BaseModel):
+    """Readiness probe response schema."""
+
+    status: str = Field(description="'ready' or 'not_ready'")
+    warmed_up: bool = Field(description="Whether start-up warm-up has completed")
+    pool_capacity: int = Field(description="Pool size plus maximum overflow")
+    pool_checked_out: int = Field(description="Connections currently in use")
+    pool_available: int = Field(description="Connections that can still be checked out")
+    warmup_steps: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Status of each warm-up step (pending, running, ok, failed, timeout, skipped)",
+    )
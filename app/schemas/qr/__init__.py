@@ -15,6 +15,7 @@ from .parameters import (
     QRImageParameters,
     QRListParameters,
     QRUpdateParameters,
+    ScanLogExportParameters,
     StaticQRCreateParameters,
 )
 
@@ -32,4 +33,5 @@ __all__ = [
     "StaticQRCreateParameters",
     "DynamicQRCreateParameters",
     "QRUpdateParameters",
+    "ScanLogExportParameters",
 ]
@@ -5,11 +5,12 @@ This module defines Pydantic models for query parameters used in QR code endpoin
 These models provide consistent validation and documentation for API parameters.
 """
 
+from datetime import UTC, datetime
 from typing import List, Optional, Union
 
 from pydantic import BaseModel, Field, HttpUrl, field_validator, model_validator
 
-from ..common import ImageFormat, QRType, ErrorCorrectionLevel
+from ..common import EncodingProfile, ExportFormat, ImageFormat, QRType, ErrorCorrectionLevel
 
 
 class QRListParameters(BaseModel):
@@ -43,6 +44,10 @@ class QRImageParameters(BaseModel):
         le=100,
         description="The quality of the image (1-100, for lossy formats)",
     )
+    encoding_profile: EncodingProfile | None = Field(
+        default=None,
+        description="Raster encoder preset (fast, balanced, archival); defaults to the print profile when physical dimensions are given, otherwise the configured default",
+    )
     size: int = Field(
         default=10, 
         ge=1, 
@@ -284,3 +289,41 @@ class QRUpdateParameters(BaseModel):
         max_length=500, 
         description="Updated description for the QR code"
     )
+
+
+class ScanLogExportParameters(BaseModel):
+    """Parameters for streaming scan log exports."""
+
+    export_format: ExportFormat = Field(
+        default=ExportFormat.CSV, description="Export format (csv, or parquet when pyarrow is installed)"
+    )
+    start_date: datetime | None = Field(
+        default=None, description="Only include scans at or after this time (ISO 8601, UTC if no offset)"
+    )
+    end_date: datetime | None = Field(
+        default=None, description="Only include scans before this time (ISO 8601, UTC if no offset)"
+    )
+    genuine_only: bool = Field(
+        default=False, description="Only include genuine QR scans (not direct URL access)"
+    )
+    batch_size: int = Field(
+        default=1000,
+        ge=100,
+        le=10000,
+        description="Rows fetched per round trip; also the Parquet row group size",
+    )
+
+    @field_validator("start_date", "end_date")
+    @classmethod
+    def assume_utc(cls, v: datetime | None) -> datetime | None:
+        """Treat timestamps without an offset as UTC rather than the database session's time zone."""
+        if v is not None and v.tzinfo is None:
+            return v.replace(tzinfo=UTC)
+        return v
+
+    @model_validator(mode="after")
+    def validate_date_range(self) -> "ScanLogExportParameters":
+        """Validate that the date range is not inverted."""
+        if self.start_date and self.end_date and self.start_date >= self.end_date:
+            raise ValueError("start_date must be before end_date")
+        return self
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark raster encoding profiles for QR code images.
+
+Renders a representative QR code the way the legacy imaging path does
+(segno PNG, resized with Lanczos) and a crisp two-color image the way the
+Segno adapter does, then reports output size and encode latency for every
+format and encoding profile next to each profile's latency budget.
+
+Usage:
+    python app/scripts/benchmark_encoding_profiles.py [--iterations N] [--size PX]
+"""
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import segno
+from PIL import Image
+
+from app.schemas.common import EncodingProfile
+from app.utils.encoding_profiles import ENCODING_PRESETS, encode_image
+
+CONTENT = "https://example.com/r/0123456789abcdef"
+
+
+def legacy_image(size: int) -> Image.Image:
+    """Anti-aliased RGB image as produced by the legacy imaging path."""
+    qr = segno.make(CONTENT, error="m")
+    buffer = io.BytesIO()
+    qr.save(buffer, kind="png", scale=max(1, size // 40), border=4)
+    buffer.seek(0)
+    return Image.open(buffer).convert("RGB").resize((size, size), Image.LANCZOS)
+
+
+def adapter_image(size: int) -> Image.Image:
+    """Two-color image as produced by the Segno adapter."""
+    qr = segno.make(CONTENT, error="m", boost_error=True)
+    scale = size / qr.symbol_size(border=4)[0]
+    return qr.to_pil(scale=scale, border=4, dark="#000000", light="#FFFFFF")
+
+
+def measure(img: Image.Image, image_format: str, profile: EncodingProfile, iterations: int) -> tuple[int, float]:
+    """Return (output bytes, mean latency in milliseconds)."""
+    size = len(encode_image(img, image_format, profile))
+    start = time.perf_counter()
+    for _ in range(iterations):
+        encode_image(img, image_format, profile)
+    elapsed = time.perf_counter() - start
+    return size, elapsed / iterations * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20, help="Encodes per format and profile")
+    parser.add_argument("--size", type=int, default=500, help="Image size in pixels")
+    args = parser.parse_args()
+
+    sources = {"legacy": legacy_image(args.size), "adapter": adapter_image(args.size)}
+
+    header = f"{'source':<8} {'format':<6} {'profile':<9} {'bytes':>9} {'ms':>9} {'budget ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for source_name, img in sources.items():
+        for image_format in ("png", "webp", "jpeg"):
+            for profile in EncodingProfile:
+                size, latency = measure(img, image_format, profile, args.iterations)
+                budget = ENCODING_PRESETS[profile][image_format]["budget_ms"]
+                flag = " *" if latency > budget else ""
+                print(
+                    f"{source_name:<8} {image_format:<6} {profile.value:<9} "
+                    f"{size:>9} {latency:>9.2f} {budget:>10}{flag}"
+                )
+        print("-" * len(header))
+    print("* mean latency exceeds the profile budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request overhead of the custom middleware stack.
+
+Drives stub `/r/{short_id}` and `/health` endpoints in-process through three
+stacks: no custom middleware, four pass-through BaseHTTPMiddleware layers
+(the task and stream wrapping the previous stack paid before doing any work),
+and the pure ASGI Metrics, Logging, RequestID and SecurityHeaders middleware.
+Overhead is reported relative to the bare application. Log output is raised
+to WARNING so the console handler does not dominate the measurement.
+
+Usage:
+    python app/scripts/benchmark_middleware.py [--iterations N]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import RedirectResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware import (
+    LoggingMiddleware,
+    MetricsMiddleware,
+    RequestIDMiddleware,
+    SecurityHeadersMiddleware,
+)
+
+PATHS = ("/r/0123456789abcdef", "/health")
+
+
+class PassThroughMiddleware(BaseHTTPMiddleware):
+    """BaseHTTPMiddleware layer that does no work of its own."""
+
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+def build_app(stack: str) -> FastAPI:
+    """Build a stub application with the given middleware stack."""
+    app = FastAPI()
+
+    @app.get("/r/{short_id}")
+    async def redirect(short_id: str):
+        return RedirectResponse(url="https://example.com/", status_code=302)
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    if stack == "basehttp":
+        for _ in range(4):
+            app.add_middleware(PassThroughMiddleware)
+    elif stack == "asgi":
+        app.add_middleware(SecurityHeadersMiddleware)
+        app.add_middleware(MetricsMiddleware)
+        app.add_middleware(LoggingMiddleware)
+        app.add_middleware(RequestIDMiddleware)
+    return app
+
+
+async def measure(app: FastAPI, path: str, iterations: int) -> float:
+    """Return mean request latency in microseconds."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for _ in range(min(iterations, 200)):
+            await client.get(path)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await client.get(path)
+        elapsed = time.perf_counter() - start
+    return elapsed / iterations * 1_000_000
+
+
+async def run(iterations: int) -> None:
+    stacks = ("bare", "basehttp", "asgi")
+    apps = {stack: build_app(stack) for stack in stacks}
+
+    header = f"{'path':<22} {'bare us':>9} {'basehttp us':>12} {'asgi us':>9} {'basehttp +us':>13} {'asgi +us':>9}"
+    print(header)
+    print("-" * len(header))
+    for path in PATHS:
+        results = {stack: await measure(apps[stack], path, iterations) for stack in stacks}
+        bare = results["bare"]
+        print(
+            f"{path:<22} {bare:>9.1f} {results['basehttp']:>12.1f} {results['asgi']:>9.1f} "
+            f"{results['basehttp'] - bare:>13.1f} {results['asgi'] - bare:>9.1f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000, help="Requests per path and stack")
+    args = parser.parse_args()
+
+    for name in ("api.access", "api.performance", "api.error", "httpx"):
+        logging.getLogger(name).setLevel(logging.WARNING)
+
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
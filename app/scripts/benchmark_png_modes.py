@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark two-color (1-bit / palette) PNG output against 24-bit RGB PNGs.
+
+Compares the previous legacy pipeline (RGB conversion and Lanczos resize)
+with the two-color pipeline now used by app.utils.qr_imaging when no logo is
+embedded, reporting file size and render+encode latency per image size.
+
+Usage:
+    python app/scripts/benchmark_png_modes.py [--iterations N]
+"""
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import segno
+from PIL import Image
+
+from app.utils.qr_imaging import generate_qr_image
+
+CONTENT = "https://example.com/r/0123456789abcdef"
+SIZES = (100, 250, 500, 1000, 2000)
+
+
+def rgb_png(size: int, fill_color: str, back_color: str) -> bytes:
+    """Previous legacy output: RGB image resized with Lanczos, default PNG options."""
+    qr = segno.make(CONTENT, error="m")
+    buffer = io.BytesIO()
+    qr.save(buffer, kind="png", scale=max(1, size // 40), dark=fill_color, light=back_color, border=4)
+    buffer.seek(0)
+    img = Image.open(buffer).convert("RGB")
+    if img.size != (size, size):
+        img = img.resize((size, size), Image.LANCZOS)
+    output = io.BytesIO()
+    img.save(output, format="PNG")
+    return output.getvalue()
+
+
+def two_color_png(size: int, fill_color: str, back_color: str) -> bytes:
+    """Current legacy output with the balanced encoding profile."""
+    return generate_qr_image(
+        CONTENT, "png", size=size, fill_color=fill_color, back_color=back_color,
+        error_level="m", encoding_profile="balanced",
+    )
+
+
+def measure(func, size: int, fill_color: str, back_color: str, iterations: int) -> tuple[int, float]:
+    """Return (output bytes, mean latency in milliseconds)."""
+    length = len(func(size, fill_color, back_color))
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(size, fill_color, back_color)
+    elapsed = time.perf_counter() - start
+    return length, elapsed / iterations * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=10, help="Renders per size and pipeline")
+    args = parser.parse_args()
+
+    header = f"{'colors':<16} {'px':>5} {'rgb B':>9} {'rgb ms':>8} {'2-color B':>10} {'2-color ms':>11} {'ratio':>7}"
+    print(header)
+    print("-" * len(header))
+    for fill_color, back_color in (("#000000", "#FFFFFF"), ("#1A2B3C", "#F0F0F0")):
+        for size in SIZES:
+            rgb_size, rgb_ms = measure(rgb_png, size, fill_color, back_color, args.iterations)
+            pal_size, pal_ms = measure(two_color_png, size, fill_color, back_color, args.iterations)
+            print(
+                f"{fill_color + '/' + back_color:<16} {size:>5} {rgb_size:>9} {rgb_ms:>8.2f} "
+                f"{pal_size:>10} {pal_ms:>11.2f} {pal_size / rgb_size:>7.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
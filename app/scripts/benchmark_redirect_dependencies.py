@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request dependency resolution for the redirect endpoint.
+
+Serves a stub redirect through three dependency graphs and reports the mean
+request latency:
+
+- legacy: QRCodeService with adapters, NewQRGenerationService and circuit
+  breaker built on every request (the previous get_qr_service),
+- app-scoped: get_qr_service with the adapters, service and breaker taken
+  from app.state,
+- redirect: get_redirect_qr_service, the single dependency now used by
+  /r/{short_id}.
+
+The database session dependency is overridden with a placeholder so that
+only dependency resolution is measured.
+
+Usage:
+    python app/scripts/benchmark_redirect_dependencies.py [--iterations N]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Annotated
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import aiobreaker
+import httpx
+from fastapi import Depends, FastAPI
+from fastapi.responses import RedirectResponse
+
+from app.core.circuit_breaker import get_new_qr_generation_breaker
+from app.database import get_db_with_logging
+from app.dependencies import (
+    create_app_singletons,
+    get_new_qr_generation_service,
+    get_qr_code_repository,
+    get_scan_log_repository,
+)
+from app.repositories import QRCodeRepository, ScanLogRepository
+from app.services.new_qr_generation_service import NewQRGenerationService
+from app.services.qr_service import QRCodeService
+from app.types import QRServiceDep, RedirectServiceDep
+
+
+def legacy_get_qr_service(
+    qr_code_repo: Annotated[QRCodeRepository, Depends(get_qr_code_repository)],
+    scan_log_repo: Annotated[ScanLogRepository, Depends(get_scan_log_repository)],
+    new_qr_generation_service: Annotated[NewQRGenerationService, Depends(get_new_qr_generation_service)],
+    new_qr_generation_breaker: Annotated[aiobreaker.CircuitBreaker, Depends(get_new_qr_generation_breaker)],
+) -> QRCodeService:
+    """The QRCodeService dependency as it was resolved per request before."""
+    return QRCodeService(
+        qr_code_repo=qr_code_repo,
+        scan_log_repo=scan_log_repo,
+        new_qr_generation_service=new_qr_generation_service,
+        new_qr_generation_breaker=new_qr_generation_breaker,
+    )
+
+
+def build_app() -> FastAPI:
+    """Build a stub application with one redirect route per dependency graph."""
+    app = FastAPI()
+
+    @app.get("/legacy/{short_id}")
+    async def legacy(short_id: str, qr_service: Annotated[QRCodeService, Depends(legacy_get_qr_service)]):
+        return RedirectResponse(url="https://example.com/", status_code=302)
+
+    @app.get("/app-scoped/{short_id}")
+    async def app_scoped(short_id: str, qr_service: QRServiceDep):
+        return RedirectResponse(url="https://example.com/", status_code=302)
+
+    @app.get("/redirect/{short_id}")
+    async def redirect(short_id: str, qr_service: RedirectServiceDep):
+        return RedirectResponse(url="https://example.com/", status_code=302)
+
+    app.dependency_overrides[get_db_with_logging] = lambda: object()
+    create_app_singletons(app)
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, iterations: int) -> float:
+    """Return mean request latency in microseconds."""
+    for _ in range(min(iterations, 200)):
+        await client.get(path)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await client.get(path)
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+async def run(iterations: int) -> None:
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        results = {
+            name: await measure(client, f"/{name}/0123456789abcdef", iterations)
+            for name in ("legacy", "app-scoped", "redirect")
+        }
+
+    print(f"{'graph':<12} {'us/request':>11} {'vs legacy':>10}")
+    print("-" * 35)
+    for name, value in results.items():
+        print(f"{name:<12} {value:>11.1f} {value / results['legacy']:>10.1%}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=2000, help="Requests per dependency graph")
+    args = parser.parse_args()
+
+    # Per-request construction logs at INFO; keep it out of the measurement
+    logging.disable(logging.INFO)
+
+    asyncio.run(run(args.iterations))
+
+
+if __name__ == "__main__":
+    main()
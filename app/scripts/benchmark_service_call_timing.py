@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Benchmark the per-call cost of MetricsLogger.time_service_call.
+
+Replays the seven instrumented calls of one redirect (service and repository
+short ID lookups, the redirect URL safety check, and the background scan
+statistics update with user agent parsing, scan count update and scan log
+creation) against no-op functions, and reports the decorator overhead per
+redirect for:
+
+- the previous decorator (label lookup on every call),
+- the current decorator timing every call,
+- the current decorator with the sampling used in QRCodeService,
+- the current decorator with the kill switch off.
+
+Usage:
+    python app/scripts/benchmark_service_call_timing.py [--iterations N]
+"""
+
+import argparse
+import sys
+import time
+from functools import wraps
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from app.core.metrics_logger import MetricsLogger, service_call_duration_seconds
+
+# (service, operation, sample_every as configured in the code base)
+REDIRECT_CALLS = (
+    ("QRCodeService", "get_qr_by_short_id", 10),
+    ("QRCodeRepository", "get_by_short_id", 1),
+    ("QRCodeService", "_is_safe_redirect_url", 10),
+    ("QRCodeService", "update_scan_statistics", 1),
+    ("QRCodeService", "_parse_user_agent_data", 10),
+    ("QRCodeRepository", "update_scan_count", 1),
+    ("ScanLogRepository", "create_scan_log", 1),
+)
+
+
+def legacy_time_service_call(service_name: str, operation: str):
+    """The decorator as it was before label children were pre-bound."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start_time = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+                duration = time.perf_counter() - start_time
+                service_call_duration_seconds.labels(
+                    service_name=service_name, operation_name=operation
+                ).observe(duration)
+                return result
+            except Exception:
+                duration = time.perf_counter() - start_time
+                service_call_duration_seconds.labels(
+                    service_name=service_name, operation_name=operation
+                ).observe(duration)
+                raise
+        return wrapper
+    return decorator
+
+
+def noop():
+    return None
+
+
+def build_chain(variant: str) -> list:
+    """Decorate one no-op per redirect call with the given decorator variant."""
+    chain = []
+    for service, operation, sample_every in REDIRECT_CALLS:
+        operation = f"benchmark_{operation}"
+        if variant == "none":
+            chain.append(noop)
+        elif variant == "legacy":
+            chain.append(legacy_time_service_call(service, operation)(noop))
+        elif variant == "sampled":
+            chain.append(MetricsLogger.time_service_call(service, operation, sample_every=sample_every)(noop))
+        else:
+            chain.append(MetricsLogger.time_service_call(service, operation)(noop))
+    return chain
+
+
+def measure(chain: list, iterations: int) -> float:
+    """Return mean nanoseconds per simulated redirect."""
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        for func in chain:
+            func()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=200_000, help="Simulated redirects per variant")
+    args = parser.parse_args()
+
+    results = {}
+    for variant in ("none", "legacy", "current", "sampled"):
+        chain = build_chain(variant)
+        measure(chain, min(args.iterations, 10_000))
+        results[variant] = measure(chain, args.iterations)
+
+    MetricsLogger.set_service_call_timing(False)
+    chain = build_chain("current")
+    measure(chain, min(args.iterations, 10_000))
+    results["disabled"] = measure(chain, args.iterations)
+    MetricsLogger.set_service_call_timing(True)
+
+    baseline = results["none"]
+    print(f"{'variant':<10} {'ns/redirect':>12} {'overhead ns':>12}")
+    print("-" * 36)
+    for variant, value in results.items():
+        print(f"{variant:<10} {value:>12.0f} {value - baseline:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
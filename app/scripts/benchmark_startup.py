@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark application start-up import time.
+
+Runs ``python -X importtime -c "import app.main"`` in fresh interpreters and
+reports the median cumulative import time of app.main together with the
+modules with the largest self time. With --budget-ms the script exits with
+status 1 when the median exceeds the budget, so it can be used as a CI gate.
+
+Usage:
+    python app/scripts/benchmark_startup.py [--iterations N] [--top N] [--budget-ms MS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+
+TARGET_MODULE = "app.main"
+
+
+def run_importtime(module: str = TARGET_MODULE) -> List[Tuple[str, int, int]]:
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Args:
+        module: Module to import
+
+    Returns:
+        (module, self_us, cumulative_us) for every import, in completion order
+
+    Raises:
+        RuntimeError: If the import fails
+    """
+    env = dict(os.environ)
+    env.setdefault("PYTHONDONTWRITEBYTECODE", "1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def measure(iterations: int, module: str = TARGET_MODULE) -> Tuple[List[float], Dict[str, List[int]]]:
+    """
+    Measure the import time of a module over several fresh interpreters.
+
+    Args:
+        iterations: Number of interpreters to start
+        module: Module to import
+
+    Returns:
+        Cumulative import times of the module in milliseconds, and the self
+        times in microseconds per imported module
+    """
+    totals_ms = []
+    self_times: Dict[str, List[int]] = defaultdict(list)
+    for _ in range(iterations):
+        entries = run_importtime(module)
+        for name, self_us, cumulative_us in entries:
+            self_times[name].append(self_us)
+            if name == module:
+                totals_ms.append(cumulative_us / 1000)
+    return totals_ms, self_times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Number of slowest modules to list")
+    parser.add_argument("--budget-ms", type=float, default=None, help="Fail if the median exceeds this")
+    args = parser.parse_args()
+
+    totals_ms, self_times = measure(args.iterations)
+    median_ms = statistics.median(totals_ms)
+
+    print(f"import {TARGET_MODULE}: {args.iterations} runs")
+    print(f"  median {median_ms:8.1f} ms   min {min(totals_ms):8.1f} ms   max {max(totals_ms):8.1f} ms")
+    print()
+    print(f"Top {args.top} modules by median self time:")
+    ranked = sorted(
+        ((statistics.median(times) / 1000, name) for name, times in self_times.items()),
+        reverse=True,
+    )
+    for self_ms, name in ranked[: args.top]:
+        print(f"  {self_ms:8.1f} ms  {name}")
+
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        print(f"\nFAIL: median {median_ms:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
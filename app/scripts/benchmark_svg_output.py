@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark SVG output size and latency for QR versions 1-40.
+
+Compares the previous legacy SVG settings (scale=10, XML declaration,
+namespace, newlines), Segno with its size optimizations enabled, and the
+compact emitter in app.utils.svg_emitter.
+
+Usage:
+    python app/scripts/benchmark_svg_output.py [--iterations N]
+"""
+
+import argparse
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import segno
+
+from app.utils.svg_emitter import render_svg
+
+
+def legacy_svg(qr: segno.QRCode) -> bytes:
+    """Previous legacy-path output: Segno defaults with scale=10."""
+    output = BytesIO()
+    qr.save(output, kind="svg", scale=10, dark="#000000", light="#ffffff", border=4)
+    return output.getvalue()
+
+
+def segno_optimized_svg(qr: segno.QRCode) -> bytes:
+    """Previous adapter output: Segno with declarations and classes stripped."""
+    output = BytesIO()
+    qr.save(
+        output,
+        kind="svg",
+        xmldecl=False,
+        svgns=False,
+        svgclass=None,
+        lineclass=None,
+        nl=False,
+        scale=10,
+        dark="#000000",
+        light="#ffffff",
+        border=4,
+    )
+    return output.getvalue()
+
+
+def compact_svg(qr: segno.QRCode) -> bytes:
+    """Shared compact emitter output."""
+    modules = qr.symbol_size(border=4)[0]
+    return render_svg(qr, border=4, dark="#000000", light="#ffffff", width=modules * 10)
+
+
+EMITTERS = {
+    "legacy": legacy_svg,
+    "segno_opt": segno_optimized_svg,
+    "compact": compact_svg,
+}
+
+
+def measure(func, qr: segno.QRCode, iterations: int) -> tuple[int, float]:
+    """Return (output bytes, mean latency in microseconds)."""
+    size = len(func(qr))
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(qr)
+    elapsed = time.perf_counter() - start
+    return size, elapsed / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50, help="Renders per version and emitter")
+    args = parser.parse_args()
+
+    header = f"{'ver':>3} " + " ".join(f"{name + ' B':>13} {name + ' us':>13}" for name in EMITTERS)
+    print(header)
+    print("-" * len(header))
+
+    totals = {name: [0, 0.0] for name in EMITTERS}
+    for version in range(1, 41):
+        qr = segno.make("0123abcd", version=version, error="m")
+        row = [f"{version:>3}"]
+        for name, func in EMITTERS.items():
+            size, latency = measure(func, qr, args.iterations)
+            totals[name][0] += size
+            totals[name][1] += latency
+            row.append(f"{size:>13} {latency:>13.1f}")
+        print(" ".join(row))
+
+    print("-" * len(header))
+    baseline_size = totals["legacy"][0]
+    for name, (size, latency) in totals.items():
+        print(
+            f"{name:>10}: {size:>9} bytes total ({size / baseline_size:6.1%} of legacy), "
+            f"{latency / 40:8.1f} us mean"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark first-load latency of the Jinja2 templates with and without the bytecode cache.
+
+The first render of a template in a process parses and compiles its source
+(and that of the templates it extends or includes); later renders reuse the
+compiled template. Each measurement runs in a fresh interpreter and loads
+every template once, in three configurations:
+
+- no-cache: compile from source (the previous behaviour),
+- cold-cache: compile from source and write the bytecode cache,
+- warm-cache: load from the bytecode cache written by the cold run, as a
+  second worker or a restarted process does.
+
+Usage:
+    python app/scripts/benchmark_template_compile.py [--iterations N]
+"""
+
+import argparse
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+TEMPLATES_DIR = PROJECT_ROOT / "app" / "templates"
+
+
+def load_all(cache_dir: Optional[str]) -> Dict[str, float]:
+    """
+    Load every template once in this process.
+
+    Args:
+        cache_dir: Bytecode cache directory, or None for no cache
+
+    Returns:
+        First-load time in milliseconds per template
+    """
+    from app.utils.templating import create_template_environment
+
+    env = create_template_environment(TEMPLATES_DIR, Path(cache_dir) if cache_dir else None)
+    timings = {}
+    for name in env.list_templates(extensions=["html"]):
+        start = time.perf_counter()
+        env.get_template(name)
+        timings[name] = (time.perf_counter() - start) * 1000
+    return timings
+
+
+def run_child(cache_dir: Optional[str]) -> Dict[str, float]:
+    """Run load_all in a fresh interpreter and return its timings."""
+    command = [sys.executable, __file__, "--child"]
+    if cache_dir:
+        command += ["--cache-dir", cache_dir]
+    result = subprocess.run(command, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="Number of slowest templates to list")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--cache-dir", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(load_all(args.cache_dir)))
+        return 0
+
+    results: Dict[str, List[Dict[str, float]]] = {"no-cache": [], "cold-cache": [], "warm-cache": []}
+    for _ in range(args.iterations):
+        cache_dir = tempfile.mkdtemp(prefix="jinja_bytecode_bench_")
+        try:
+            results["no-cache"].append(run_child(None))
+            results["cold-cache"].append(run_child(cache_dir))
+            results["warm-cache"].append(run_child(cache_dir))
+        finally:
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    template_count = len(results["no-cache"][0])
+    print(f"First load of {template_count} templates, median of {args.iterations} fresh processes")
+    print(f"{'configuration':<12} {'total ms':>10}")
+    for name, runs in results.items():
+        print(f"{name:<12} {statistics.median(sum(run.values()) for run in runs):10.1f}")
+
+    print("\nSlowest templates (median ms, no-cache -> warm-cache):")
+    per_template = {
+        template: (
+            statistics.median(run[template] for run in results["no-cache"]),
+            statistics.median(run[template] for run in results["warm-cache"]),
+        )
+        for template in results["no-cache"][0]
+    }
+    ranked = sorted(per_template.items(), key=lambda item: item[1][0], reverse=True)
+    for template, (uncached, cached) in ranked[: args.top]:
+        print(f"  {uncached:7.2f} -> {cached:6.2f}  {template}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -96,6 +96,16 @@ else
     echo "External backups directory doesn't exist"
 fi
 
+# Prometheus multiprocess mode: the metrics directory must exist and be empty
+# before the workers are forked, so it is reset here rather than in the app.
+# This runs before any manage_db.py command: they import the app's metric
+# modules, which write their metric files to this directory.
+if [ -n "${PROMETHEUS_MULTIPROC_DIR}" ]; then
+    echo "Resetting Prometheus multiprocess directory ${PROMETHEUS_MULTIPROC_DIR}..."
+    rm -rf "${PROMETHEUS_MULTIPROC_DIR}"
+    mkdir -p "${PROMETHEUS_MULTIPROC_DIR}"
+fi
+
 # Initialize or validate database before starting the application
 echo "Checking database status..."
 
@@ -948,6 +948,70 @@ class DatabaseManager:
             )
             return False
 
+    def export_scan_logs(
+        self,
+        output_path: str,
+        export_format: str = "csv",
+        qr_id: str | None = None,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        genuine_only: bool = False,
+        batch_size: int = 5000,
+    ) -> bool:
+        """
+        Stream scan logs to a CSV or Parquet file using a server-side cursor.
+        Memory use is bounded by batch_size regardless of the number of rows.
+        Returns True if the export succeeded, False otherwise.
+        """
+        # Imported here so the other commands keep working without the app package
+        from sqlalchemy.orm import Session
+
+        from app.schemas.common import ExportFormat
+        from app.utils.scan_export import export_scan_logs
+
+        output = Path(output_path)
+        scope = f"QR code {qr_id}" if qr_id else "all QR codes"
+        print(f"📤 Exporting scan logs for {scope} to {output} ({export_format})...")
+        try:
+            with Session(self.engine) as session, open(output, "wb") as f:
+                bytes_written = 0
+                for chunk in export_scan_logs(
+                    session,
+                    ExportFormat(export_format),
+                    qr_id=qr_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    genuine_only=genuine_only,
+                    batch_size=batch_size,
+                ):
+                    f.write(chunk)
+                    bytes_written += len(chunk)
+
+            print(f"✅ Export complete: {bytes_written} bytes written")
+            loggers["operations"].info(
+                _(
+                    "Scan log export completed",
+                    output=str(output),
+                    format=export_format,
+                    qr_id=qr_id,
+                    start_date=start_date.isoformat() if start_date else None,
+                    end_date=end_date.isoformat() if end_date else None,
+                    bytes_written=bytes_written,
+                )
+            )
+            return True
+        except Exception as e:
+            print(f"❌ Scan log export failed: {e}")
+            loggers["errors"].error(
+                _(
+                    "Scan log export failed",
+                    output=str(output),
+                    error=str(e),
+                    traceback=traceback.format_exc(),
+                )
+            )
+            return False
+
     def restore_database(self, backup_filename: str, stop_api_service=True):
         """
         Restore database from a backup file.
@@ -1248,6 +1312,15 @@ class DatabaseManager:
                 print("   Host-level script should handle API service restart")
 
 
+def _parse_utc_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 timestamp for argparse, assuming UTC when no offset is given."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid ISO 8601 timestamp: {value}")
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
 def run_cli():
     """Process command line arguments."""
     parser = argparse.ArgumentParser(description="PostgreSQL database management tool")
@@ -1258,10 +1331,18 @@ def run_cli():
     parser.add_argument("--create-backup", action="store_true", help="Create a database backup")
     parser.add_argument("--with-api-stop", action="store_true", help="Stop API service during backup/restore operations")
     parser.add_argument("--restore", type=str, help="Restore database from backup file (provide filename)")
+    parser.add_argument("--export-scans", type=str, metavar="OUTPUT", help="Stream scan logs to OUTPUT file")
+    parser.add_argument("--export-format", choices=["csv", "parquet"], default="csv", help="Scan export format (parquet requires pyarrow)")
+    parser.add_argument("--qr-id", type=str, help="Only export scans of this QR code")
+    parser.add_argument("--since", type=_parse_utc_datetime, help="Only export scans at or after this ISO 8601 time")
+    parser.add_argument("--until", type=_parse_utc_datetime, help="Only export scans before this ISO 8601 time")
+    parser.add_argument("--genuine-only", action="store_true", help="Only export genuine QR scans")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per fetch and Parquet row group")
 
     args = parser.parse_args()
 
-    if not (args.init or args.migrate or args.check or args.validate or args.create_backup or args.restore):
+    if not (args.init or args.migrate or args.check or args.validate or args.create_backup or args.restore
+            or args.export_scans):
         parser.print_help()
         return
 
@@ -1324,6 +1405,19 @@ def run_cli():
     if args.migrate:
         db_manager.run_migrations()
 
+    if args.export_scans:
+        success = db_manager.export_scan_logs(
+            args.export_scans,
+            export_format=args.export_format,
+            qr_id=args.qr_id,
+            start_date=args.since,
+            end_date=args.until,
+            genuine_only=args.genuine_only,
+            batch_size=args.batch_size,
+        )
+        if not success:
+            sys.exit(1)
+
 
 if __name__ == "__main__":
     run_cli()
@@ -0,0 +1,105 @@
+"""
+Concurrent loading of dashboard and analytics data.
+
+Dashboard pages and analytics fragments need several independent queries.
+Run one after another on the request's session, their latencies add up.
+DashboardDataLoader runs each query on its own session, and so its own
+pooled connection, in a worker thread, so a page waits for the slowest query
+rather than the sum of all of them, and the event loop is not blocked while
+they run.
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, List, Union
+
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import QRCode
+from ..repositories import QRCodeRepository, ScanLogRepository
+
+
+class DashboardDataLoader:
+    """
+    Runs independent read queries concurrently on separate sessions.
+
+    Each query uses its own pooled connection for its duration, so a call
+    with N queries briefly holds N connections.
+
+    Args:
+        session_factory: Creates the session each query runs on
+    """
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal):
+        self.session_factory = session_factory
+
+    def _run(self, query: Callable[[Session], Any]) -> Any:
+        with self.session_factory() as db:
+            return query(db)
+
+    async def gather(self, **queries: Callable[[Session], Any]) -> Dict[str, Any]:
+        """
+        Run queries concurrently, each on a new session in a worker thread.
+
+        ORM objects in the results are detached from their (closed) session;
+        their loaded column attributes can still be read.
+
+        Args:
+            **queries: Functions taking a session, by result name
+
+        Returns:
+            Results by name
+
+        Raises:
+            DatabaseError: If a query fails (the first failure is raised)
+        """
+        results = await asyncio.gather(
+            *(asyncio.to_thread(self._run, query) for query in queries.values())
+        )
+        return dict(zip(queries, results))
+
+    async def load_dashboard(self, recent_limit: int = 5) -> Dict[str, Union[int, List[QRCode]]]:
+        """
+        Load the total QR code count and the most recently created QR codes.
+
+        Args:
+            recent_limit: Number of recent QR codes
+
+        Returns:
+            Dictionary containing total_qr_codes and recent_qr_codes
+        """
+        return await self.gather(
+            total_qr_codes=lambda db: QRCodeRepository(db).count(),
+            recent_qr_codes=lambda db: QRCodeRepository(db).list_recent(recent_limit),
+        )
+
+    async def load_qr_count(self) -> int:
+        """
+        Load the total QR code count.
+
+        Returns:
+            Total count of QR codes
+        """
+        return await asyncio.to_thread(self._run, lambda db: QRCodeRepository(db).count())
+
+    async def load_scan_statistics(self, qr_id: str) -> Dict[str, Dict[str, int]]:
+        """
+        Load device, browser and OS statistics for a QR code.
+
+        Args:
+            qr_id: ID of the QR code
+
+        Returns:
+            Dictionary with device_types, device_families, browser_families and os_families
+        """
+        results = await self.gather(
+            device=lambda db: ScanLogRepository(db).get_device_statistics(qr_id),
+            browser=lambda db: ScanLogRepository(db).get_browser_statistics(qr_id),
+            os=lambda db: ScanLogRepository(db).get_os_statistics(qr_id),
+        )
+        return {
+            "device_types": results["device"].get("device_types", {}),
+            "device_families": results["device"].get("device_families", {}),
+            "browser_families": results["browser"].get("browser_families", {}),
+            "os_families": results["os"].get("os_families", {}),
+        }
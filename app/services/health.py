@@ -1,12 +1,19 @@
 """
 Health check service for monitoring system and service health.
+
+The full health status (database diagnostics, system metrics, feature-flagged
+service checks) is computed by HealthMonitor on an interval and served from
+a snapshot, so health probes do not run diagnostic queries themselves.
 """
 
+import asyncio
+import logging
 import os
+import threading
 import time
 from datetime import UTC, datetime
+from typing import Callable, Dict, Optional
 
-import psutil
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
@@ -19,6 +26,9 @@ from app.schemas.health.models import (
     SystemMetrics,
 )
 from app.core.config import settings, Settings
+from app.database import SessionLocal, get_pool_status
+
+logger = logging.getLogger(__name__)
 
 START_TIME = time.time()
 
@@ -34,6 +44,9 @@ class HealthService:
         Returns:
             SystemMetrics: Current system resource usage
         """
+        # Imported here: only the background health refresher needs it
+        import psutil
+
         return SystemMetrics(
             cpu_usage=psutil.cpu_percent(),
             memory_usage=psutil.virtual_memory().percent,
@@ -294,3 +307,120 @@ class HealthService:
             system_metrics=metrics,
             checks=checks,
         )
+
+    @staticmethod
+    def check_readiness(warmed_up: bool, warmup_steps: Optional[Dict[str, str]] = None) -> dict:
+        """
+        Check whether the service can take traffic.
+
+        Only in-process state is consulted: start-up warm-up completion and
+        free capacity in the connection pool. No queries are run.
+
+        Args:
+            warmed_up: Whether start-up warm-up has completed
+            warmup_steps: Status of each warm-up step, if warm-up is enabled
+
+        Returns:
+            Dictionary with the readiness flag and its inputs
+        """
+        pool = get_pool_status()
+        capacity = pool["size"] + pool["max_overflow"]
+        available = max(0, capacity - pool["checked_out"])
+        return {
+            "ready": warmed_up and available > 0,
+            "warmed_up": warmed_up,
+            "pool_capacity": capacity,
+            "pool_checked_out": pool["checked_out"],
+            "pool_available": available,
+            "warmup_steps": dict(warmup_steps or {}),
+        }
+
+
+class HealthMonitor:
+    """
+    Health status served from a periodically refreshed snapshot.
+
+    A background task recomputes the full health status every ``interval``
+    seconds in a worker thread. Requests read the latest snapshot; if it is
+    missing or older than ``max_age`` (e.g. the refresher is not running),
+    it is refreshed on demand, by one caller at a time.
+
+    Args:
+        interval: Seconds between background refreshes
+        max_age: Maximum snapshot age before a request refreshes it
+        session_factory: Creates the database session used by the checks
+        app_settings: Application settings
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        max_age: float,
+        session_factory: Callable = SessionLocal,
+        app_settings: Settings = settings,
+    ):
+        self.interval = interval
+        self.max_age = max_age
+        self.session_factory = session_factory
+        self.app_settings = app_settings
+        self._snapshot: Optional[HealthResponse] = None
+        self._refreshed_at = 0.0
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def refresh(self) -> HealthResponse:
+        """
+        Recompute the health status and store it as the current snapshot.
+
+        Returns:
+            The new snapshot
+        """
+        db = self.session_factory()
+        try:
+            snapshot = HealthService.get_health_status(db, self.app_settings)
+        finally:
+            db.close()
+        self._snapshot = snapshot
+        self._refreshed_at = time.monotonic()
+        return snapshot
+
+    def get_snapshot(self) -> HealthResponse:
+        """
+        Get the current health status.
+
+        Returns:
+            The latest snapshot, with current uptime and the snapshot age
+        """
+        if self._snapshot is None or time.monotonic() - self._refreshed_at > self.max_age:
+            with self._lock:
+                # Another caller may have refreshed it while we waited
+                if self._snapshot is None or time.monotonic() - self._refreshed_at > self.max_age:
+                    self.refresh()
+        return self._snapshot.model_copy(
+            update={
+                "uptime_seconds": time.time() - START_TIME,
+                "snapshot_age_seconds": round(time.monotonic() - self._refreshed_at, 3),
+            }
+        )
+
+    def start(self) -> None:
+        """Start the background refresher on the running loop."""
+        self._task = asyncio.get_running_loop().create_task(self._run(), name="health-refresher")
+
+    async def stop(self) -> None:
+        """Stop the background refresher."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logger.error(f"Health snapshot refresh failed: {e}")
+            await asyncio.sleep(self.interval)
@@ -9,6 +9,7 @@ import logging
 from typing import Any, Dict
 
 from app.core.metrics_logger import MetricsLogger
+from app.core.tracing import traced
 from app.services.interfaces.qr_generation_interfaces import QRCodeGenerator, QRImageFormatter
 
 logger = logging.getLogger(__name__)
@@ -35,6 +36,7 @@ class NewQRGenerationService:
         logger.info("NewQRGenerationService initialized")
 
     @MetricsLogger.time_service_call("NewQRGenerationService", "create_and_format_qr")
+    @traced("NewQRGenerationService.create_and_format_qr")
     async def create_and_format_qr(
         self, 
         content: str, 
@@ -15,7 +15,6 @@ from fastapi import HTTPException
 from fastapi.responses import StreamingResponse
 from pydantic import ValidationError
 from sqlalchemy.exc import SQLAlchemyError
-from user_agents import parse as parse_user_agent
 
 from ..core.exceptions import (
     DatabaseError,
@@ -37,6 +36,7 @@ from ..schemas.qr.parameters import (
 )
 from ..utils.qr_imaging import generate_qr_image as qr_imaging_util, generate_qr_response
 from ..core.metrics_logger import MetricsLogger
+from ..core import tracing
 
 # Circuit breaker and new service imports
 import aiobreaker
@@ -82,7 +82,7 @@ class QRCodeService:
         self.new_qr_generation_service = new_qr_generation_service
         self.new_qr_generation_breaker = new_qr_generation_breaker
 
-    @MetricsLogger.time_service_call("QRCodeService", "_is_safe_redirect_url")
+    @MetricsLogger.time_service_call("QRCodeService", "_is_safe_redirect_url", sample_every=10)
     def _is_safe_redirect_url(self, url: str) -> bool:
         """
         Validate if a redirect URL is safe based on scheme and domain allowlist.
@@ -145,7 +145,8 @@ class QRCodeService:
             raise QRCodeNotFoundError(f"QR code with ID {qr_id} not found")
         return qr
 
-    @MetricsLogger.time_service_call("QRCodeService", "get_qr_by_short_id")
+    @MetricsLogger.time_service_call("QRCodeService", "get_qr_by_short_id", sample_every=10)
+    @tracing.traced("QRCodeService.get_qr_by_short_id")
     def get_qr_by_short_id(self, short_id: str) -> QRCode:
         """
         Get a QR code by its short ID (used for redirects).
@@ -220,6 +221,7 @@ class QRCodeService:
         )
 
     @MetricsLogger.time_service_call("QRCodeService", "create_static_qr")
+    @tracing.traced("QRCodeService.create_static_qr")
     async def create_static_qr(self, data: StaticQRCreateParameters) -> QRCode:
         """
         Create a static QR code with the provided content.
@@ -280,7 +282,11 @@ class QRCodeService:
                             error_correction=data.error_level
                         )
                     
-                    image_bytes = await protected_create_static_qr()
+                    with tracing.span(
+                        "circuit_breaker NewQRGenerationService",
+                        attributes={"circuit_breaker.state": self.new_qr_generation_breaker.current_state.name},
+                    ):
+                        image_bytes = await protected_create_static_qr()
                     
                     # New service succeeded - create QR code record and return
                     qr = self.qr_code_repo.create(qr_data.model_dump())
@@ -343,6 +349,7 @@ class QRCodeService:
             raise QRCodeValidationError(str(e))
 
     @MetricsLogger.time_service_call("QRCodeService", "create_dynamic_qr")
+    @tracing.traced("QRCodeService.create_dynamic_qr")
     async def create_dynamic_qr(self, data: DynamicQRCreateParameters) -> QRCode:
         """
         Create a dynamic QR code with the provided data.
@@ -417,7 +424,11 @@ class QRCodeService:
                             error_correction=data.error_level
                         )
                     
-                    image_bytes = await protected_create_dynamic_qr()
+                    with tracing.span(
+                        "circuit_breaker NewQRGenerationService",
+                        attributes={"circuit_breaker.state": self.new_qr_generation_breaker.current_state.name},
+                    ):
+                        image_bytes = await protected_create_dynamic_qr()
                     
                     # New service succeeded - create QR code record and return
                     model_data = qr_data.model_dump()
@@ -495,7 +506,7 @@ class QRCodeService:
             MetricsLogger.log_qr_created('dynamic', False)
             raise QRCodeValidationError(str(e))
 
-    @MetricsLogger.time_service_call("QRCodeService", "_parse_user_agent_data")
+    @MetricsLogger.time_service_call("QRCodeService", "_parse_user_agent_data", sample_every=10)
     def _parse_user_agent_data(self, ua_string: str | None) -> Dict[str, any]:
         """
         Parse a user agent string into structured data for scan log entries.
@@ -520,6 +531,9 @@ class QRCodeService:
             }
         
         try:
+            # Imported on first use: loading the ua-parser regex tables takes ~250ms
+            from user_agents import parse as parse_user_agent
+
             # Parse the user agent string
             user_agent = parse_user_agent(ua_string)
             
@@ -671,6 +685,7 @@ class QRCodeService:
         self.qr_code_repo.update_scan_count(qr_id, timestamp, is_genuine_scan_signal=False)
 
     @MetricsLogger.time_service_call("QRCodeService", "update_scan_statistics")
+    @tracing.traced("QRCodeService.update_scan_statistics")
     def update_scan_statistics(
         self,
         qr_id: str,
@@ -722,7 +737,7 @@ class QRCodeService:
                 parsed_ua_data=parsed_ua_data,
                 is_genuine_scan_signal=is_genuine_scan_signal
             )
-            logger.info(f"Background task: Scan statistics and log updated for QR ID {qr_id}")
+            logger.debug("Background task: Scan statistics and log updated for QR ID %s", qr_id)
             
         except Exception as e:
             # Log all errors comprehensively but do not re-raise to prevent background task crashes
@@ -815,6 +830,7 @@ class QRCodeService:
             raise QRCodeValidationError(f"Error processing QR code image: {str(e)}")
 
     @MetricsLogger.time_service_call("QRCodeService", "generate_qr_streaming")
+    @tracing.traced("QRCodeService.generate_qr")
     async def generate_qr(
         self,
         data: str,
@@ -831,6 +847,7 @@ class QRCodeService:
         physical_size: float | None = None,
         physical_unit: str | None = None,
         dpi: int | None = None,
+        encoding_profile: str | None = None,
     ) -> StreamingResponse:
         """
         Generate a QR code with the given parameters.
@@ -850,6 +867,7 @@ class QRCodeService:
             physical_size: Physical size of the QR code in the specified unit
             physical_unit: Physical unit for size (in, cm, mm)
             dpi: DPI (dots per inch) for physical output
+            encoding_profile: Raster encoder preset (fast, balanced, archival)
 
         Returns:
             StreamingResponse: FastAPI response containing the QR code image
@@ -909,7 +927,9 @@ class QRCodeService:
                         svg_description=svg_description,
                         physical_size=physical_size,
                         physical_unit=physical_unit,
-                        dpi=dpi
+                        dpi=dpi,
+                        image_quality=image_quality,
+                        encoding_profile=encoding_profile,
                     )
                     
                     # Use the circuit breaker decorator pattern with await on the service method
@@ -922,7 +942,11 @@ class QRCodeService:
                             error_correction=error_correction
                         )
                     
-                    image_bytes = await protected_generate_qr()
+                    with tracing.span(
+                        "circuit_breaker NewQRGenerationService",
+                        attributes={"circuit_breaker.state": self.new_qr_generation_breaker.current_state.name},
+                    ):
+                        image_bytes = await protected_generate_qr()
                     
                     # Calculate duration and log success metrics for new path
                     new_path_duration = time.perf_counter() - new_path_start_time
@@ -975,7 +999,8 @@ class QRCodeService:
                     svg_description=svg_description,
                     physical_size=physical_size,
                     physical_unit=physical_unit,
-                    dpi=dpi
+                    dpi=dpi,
+                    encoding_profile=encoding_profile,
                 )
                 
                 # Calculate duration and log success metrics for old path
@@ -1030,11 +1055,8 @@ class QRCodeService:
         Raises:
             DatabaseError: If a database error occurs
         """
-        # Get count of all QR codes
-        total_qr_codes = self.qr_code_repo.count()
-        
-        # Get recent QR codes
-        recent_qr_codes, _ = self.qr_code_repo.list_qr_codes(
+        # Get recent QR codes; list_qr_codes already counts all QR codes
+        recent_qr_codes, total_qr_codes = self.qr_code_repo.list_qr_codes(
             skip=0,
             limit=5,
             sort_by="created_at",
@@ -1064,8 +1086,9 @@ class QRCodeService:
         # Get the QR code to verify it exists and get basic info
         qr = self.get_qr_by_id(qr_id)
         
-        # Get scan logs for the QR code
-        scan_logs, total_logs = self.scan_log_repo.get_scan_logs_for_qr(qr_id, limit=100)
+        # Get the latest scan logs for the QR code (projection query, counter-based total)
+        scan_log_page = self.scan_log_repo.get_scan_log_page(qr_id, limit=100)
+        scan_logs, total_logs = scan_log_page["logs"], scan_log_page["total"]
         
         # Get device statistics
         device_stats = self.scan_log_repo.get_device_statistics(qr_id)
@@ -9,8 +9,17 @@ from sqlalchemy.orm import Session
 
 from .database import get_db_with_logging
 from .repositories import QRCodeRepository, ScanLogRepository
+from .services.dashboard_loader import DashboardDataLoader
+from .services.health import HealthMonitor
 from .services.qr_service import QRCodeService
-from .dependencies import get_qr_service, get_qr_code_repository, get_scan_log_repository
+from .dependencies import (
+    get_dashboard_loader,
+    get_health_monitor,
+    get_qr_code_repository,
+    get_qr_service,
+    get_redirect_qr_service,
+    get_scan_log_repository,
+)
 
 # Database session type
 DbSessionDep = Annotated[Session, Depends(get_db_with_logging)]
@@ -20,4 +29,13 @@ QRCodeRepositoryDep = Annotated[QRCodeRepository, Depends(get_qr_code_repository
 ScanLogRepositoryDep = Annotated[ScanLogRepository, Depends(get_scan_log_repository)]
 
 # Service types
-QRServiceDep = Annotated[QRCodeService, Depends(get_qr_service)] 
\ No newline at end of file
+QRServiceDep = Annotated[QRCodeService, Depends(get_qr_service)]
+
+# Minimal service for the redirect hot path (repositories only)
+RedirectServiceDep = Annotated[QRCodeService, Depends(get_redirect_qr_service)]
+
+# Health snapshot shared by the health endpoints
+HealthMonitorDep = Annotated[HealthMonitor, Depends(get_health_monitor)]
+
+# Concurrent dashboard and analytics queries on separate sessions
+DashboardLoaderDep = Annotated[DashboardDataLoader, Depends(get_dashboard_loader)]
@@ -0,0 +1,166 @@
+"""
+Raster encoder presets for QR code images.
+
+Each profile maps an output format to Pillow save options and a latency budget.
+The budget is not enforced; encodes that exceed it are counted so that a slow
+preset shows up in the metrics instead of silently adding latency.
+"""
+
+import io
+import logging
+import time
+from typing import Any, Dict, Optional, Union
+
+from PIL import Image
+
+from app.core.config import settings
+from app.core.metrics_logger import MetricsLogger
+from app.schemas.common import EncodingProfile
+
+logger = logging.getLogger(__name__)
+
+# Pillow save options and latency budget (milliseconds, for a ~500px image)
+# per format and profile.
+# "palette" converts two-color PNGs to a 2-entry palette before encoding.
+ENCODING_PRESETS: Dict[EncodingProfile, Dict[str, Dict[str, Any]]] = {
+    EncodingProfile.FAST: {
+        "png": {"options": {"compress_level": 1}, "palette": True, "budget_ms": 10},
+        "webp": {"options": {"quality": 80, "method": 0}, "budget_ms": 15},
+        "jpeg": {"options": {"quality": 85}, "budget_ms": 5},
+    },
+    EncodingProfile.BALANCED: {
+        "png": {"options": {"compress_level": 6}, "palette": True, "budget_ms": 20},
+        "webp": {"options": {"quality": 90, "method": 4}, "budget_ms": 40},
+        "jpeg": {"options": {"quality": 90, "optimize": True}, "budget_ms": 10},
+    },
+    EncodingProfile.ARCHIVAL: {
+        "png": {"options": {"compress_level": 9, "optimize": True}, "palette": True, "budget_ms": 100},
+        # Lossless effort above method 4 / quality 80 costs seconds for ~1% smaller files
+        "webp": {"options": {"lossless": True, "quality": 80, "method": 4}, "budget_ms": 150},
+        "jpeg": {"options": {"quality": 95, "optimize": True, "subsampling": 0}, "budget_ms": 25},
+    },
+}
+
+PILLOW_FORMATS = {"png": "PNG", "jpeg": "JPEG", "jpg": "JPEG", "webp": "WEBP"}
+
+
+def resolve_encoding_profile(
+    profile: Optional[Union[str, EncodingProfile]] = None,
+    is_print: bool = False,
+) -> EncodingProfile:
+    """
+    Resolve the encoding profile for a request.
+
+    Args:
+        profile: Explicitly requested profile, if any
+        is_print: Whether physical dimensions were requested (print export)
+
+    Returns:
+        The requested profile, or the configured print/default profile
+
+    Raises:
+        ValueError: If the profile name is not a known preset
+    """
+    if profile:
+        return EncodingProfile(profile)
+    if is_print:
+        return EncodingProfile(settings.PRINT_ENCODING_PROFILE)
+    return EncodingProfile(settings.IMAGE_ENCODING_PROFILE)
+
+
+def get_save_options(
+    image_format: str,
+    profile: EncodingProfile,
+    image_quality: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Get Pillow save options for a format and profile.
+
+    Args:
+        image_format: Raster format (png, jpeg, jpg, webp)
+        profile: Encoding profile
+        image_quality: Explicit quality for lossy formats; overrides the preset
+
+    Returns:
+        Keyword arguments for ``Image.save``
+    """
+    fmt = "jpeg" if image_format.lower() == "jpg" else image_format.lower()
+    options = dict(ENCODING_PRESETS[profile][fmt]["options"])
+    if image_quality is not None and fmt in ("jpeg", "webp"):
+        options["quality"] = image_quality
+        # An explicit quality asks for lossy output
+        options.pop("lossless", None)
+    return options
+
+
+def _prepare_image(img: Image.Image, fmt: str, use_palette: bool) -> Image.Image:
+    """
+    Convert an image to the mode best suited to the target format.
+
+    Args:
+        img: Image to encode
+        fmt: Normalized raster format (png, jpeg, webp)
+        use_palette: Whether two-color PNGs should be palette encoded
+
+    Returns:
+        The image, converted if necessary
+    """
+    if fmt == "png":
+        # Two-color images (no anti-aliasing) fit in a 2-entry palette
+        if use_palette and img.mode in ("RGB", "L") and img.getcolors(2) is not None:
+            return img.quantize(colors=2)
+        return img
+    if fmt == "jpeg":
+        return img if img.mode in ("RGB", "L") else img.convert("RGB")
+    # WebP supports RGB and RGBA only
+    if img.mode in ("RGB", "RGBA"):
+        return img
+    return img.convert("RGBA" if "transparency" in img.info else "RGB")
+
+
+def encode_image(
+    img: Image.Image,
+    image_format: str,
+    profile: EncodingProfile,
+    image_quality: Optional[int] = None,
+    **extra_options: Any,
+) -> bytes:
+    """
+    Encode a Pillow image using the options of an encoding profile.
+
+    Args:
+        img: Image to encode
+        image_format: Raster format (png, jpeg, jpg, webp)
+        profile: Encoding profile
+        image_quality: Explicit quality for lossy formats; overrides the preset
+        **extra_options: Additional save options (e.g. dpi, pnginfo)
+
+    Returns:
+        The encoded image as bytes
+
+    Raises:
+        ValueError: If the format is not a supported raster format
+    """
+    fmt = image_format.lower()
+    if fmt not in PILLOW_FORMATS:
+        raise ValueError(f"Unsupported raster format: {image_format}")
+    fmt = "jpeg" if fmt == "jpg" else fmt
+    preset = ENCODING_PRESETS[profile][fmt]
+
+    options = get_save_options(fmt, profile, image_quality)
+    options.update(extra_options)
+
+    start_time = time.perf_counter()
+    img = _prepare_image(img, fmt, preset.get("palette", False))
+    output = io.BytesIO()
+    img.save(output, format=PILLOW_FORMATS[fmt], **options)
+    duration = time.perf_counter() - start_time
+
+    over_budget = duration * 1000 > preset["budget_ms"]
+    if over_budget:
+        logger.debug(
+            f"{fmt} encode with profile '{profile.value}' took {duration * 1000:.1f}ms "
+            f"(budget {preset['budget_ms']}ms, {img.width}x{img.height})"
+        )
+    MetricsLogger.log_image_encoded(fmt, profile.value, duration, over_budget)
+    return output.getvalue()
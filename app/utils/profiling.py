@@ -0,0 +1,240 @@
+"""
+On-demand profiling helpers for the admin profiling endpoints.
+
+- StackSampler walks the stacks of all threads at a fixed interval and
+  aggregates them as collapsed stacks (``frame;frame;frame count``), the input
+  format of flamegraph.pl and speedscope. It covers the event loop and the
+  threadpool running sync handlers, at a cost bounded by the sampling rate.
+- profile_event_loop runs cProfile on the event-loop thread for a fixed time.
+- TracemallocSession starts allocation tracing, reports the top allocating
+  lines (optionally as a diff against the previous snapshot) and stops
+  itself after a timeout so it cannot be left running.
+"""
+
+import asyncio
+import cProfile
+import io
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# Leaf frames in these modules mean the thread is idle (waiting for work or I/O)
+_IDLE_MODULES = ("threading.py", "selectors.py", "queue.py")
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+# Only one CPU profile runs at a time
+_profile_lock = threading.Lock()
+
+
+class StackSampler:
+    """
+    Sample the stacks of all threads.
+
+    Args:
+        interval: Seconds between samples
+        include_idle: Whether to keep samples of idle threads
+    """
+
+    def __init__(self, interval: float, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self._labels: Dict[Any, str] = {}
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+            self._labels[code] = label
+        return label
+
+    def sample(self, duration: float) -> Counter:
+        """
+        Sample all other threads for a period of time (blocks the calling thread).
+
+        Args:
+            duration: Seconds to sample for
+
+        Returns:
+            Counter of collapsed stacks (thread name first, leaf last)
+        """
+        own_thread = threading.get_ident()
+        counts: Counter = Counter()
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread:
+                    continue
+                if not self.include_idle and os.path.basename(frame.f_code.co_filename) in _IDLE_MODULES:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(thread_names.get(thread_id, str(thread_id)))
+                counts[";".join(reversed(stack))] += 1
+            time.sleep(self.interval)
+        return counts
+
+
+def format_collapsed(counts: Counter, limit: Optional[int] = None) -> str:
+    """
+    Render sampled stacks in collapsed-stack format.
+
+    Args:
+        counts: Counter of collapsed stacks
+        limit: Keep only the most frequent stacks
+
+    Returns:
+        One ``stack count`` line per stack
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common(limit))
+
+
+async def sample_stacks(duration: float, interval: float, include_idle: bool = False) -> Counter:
+    """
+    Sample all threads from a background thread while the event loop keeps serving requests.
+
+    Raises:
+        ProfilerBusyError: If another profile is running
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+    try:
+        sampler = StackSampler(interval, include_idle=include_idle)
+        return await asyncio.to_thread(sampler.sample, duration)
+    finally:
+        _profile_lock.release()
+
+
+async def profile_event_loop(duration: float) -> cProfile.Profile:
+    """
+    Run cProfile on the event-loop thread while requests are served.
+
+    Only code executed on the loop thread (async handlers, middleware) is
+    profiled; sync handlers running in the threadpool are not.
+
+    Raises:
+        ProfilerBusyError: If another profile is running
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusyError("A profile is already running")
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profiler.disable()
+    finally:
+        _profile_lock.release()
+    return profiler
+
+
+def format_pstats(profiler: cProfile.Profile, sort: str = "cumulative", limit: int = 50) -> str:
+    """Render the top entries of a cProfile run as pstats text."""
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats(sort).print_stats(limit)
+    return output.getvalue()
+
+
+def dump_pstats(profiler: cProfile.Profile) -> bytes:
+    """Serialize a cProfile run in the binary format read by pstats/snakeviz."""
+    profiler.create_stats()
+    return marshal.dumps(profiler.stats)
+
+
+class TracemallocSession:
+    """
+    Allocation tracing with an automatic stop.
+
+    Args:
+        max_seconds: Tracing is stopped automatically after this many seconds
+    """
+
+    def __init__(self, max_seconds: float):
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+        self._previous: Optional[tracemalloc.Snapshot] = None
+        self._timer: Optional[threading.Timer] = None
+        self.started_at: Optional[float] = None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        """Start tracing (restarting it if it is already running)."""
+        with self._lock:
+            self._stop_locked()
+            tracemalloc.start(frames)
+            self.started_at = time.time()
+            self._previous = None
+            self._timer = threading.Timer(self.max_seconds, self.stop)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def stop(self) -> None:
+        """Stop tracing and forget the stored snapshot."""
+        with self._lock:
+            self._stop_locked()
+
+    def _stop_locked(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._previous = None
+        self.started_at = None
+
+    def top(self, limit: int = 20, diff: bool = False, key_type: str = "lineno") -> List[Dict[str, Any]]:
+        """
+        Take a snapshot and report the top allocating lines.
+
+        Args:
+            limit: Number of entries to return
+            diff: Compare with the previous snapshot instead of reporting totals
+            key_type: Group allocations by 'lineno', 'filename' or 'traceback'
+
+        Returns:
+            Allocation statistics, largest first
+
+        Raises:
+            RuntimeError: If tracing is not running
+        """
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                raise RuntimeError("tracemalloc is not running")
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ))
+            previous, self._previous = self._previous, snapshot
+
+        if diff and previous is not None:
+            stats = snapshot.compare_to(previous, key_type)[:limit]
+            return [
+                {
+                    "location": str(stat.traceback),
+                    "size_bytes": stat.size,
+                    "size_diff_bytes": stat.size_diff,
+                    "count": stat.count,
+                    "count_diff": stat.count_diff,
+                }
+                for stat in stats
+            ]
+        return [
+            {"location": str(stat.traceback), "size_bytes": stat.size, "count": stat.count}
+            for stat in snapshot.statistics(key_type)[:limit]
+        ]
@@ -12,8 +12,51 @@ from fastapi.responses import StreamingResponse
 
 from app.core.config import settings
 from app.core.metrics_logger import MetricsLogger
+from app.core.server_timing import RENDER, timed
+from app.core.tracing import traced
+from app.schemas.common import EncodingProfile
+from app.utils.encoding_profiles import encode_image, resolve_encoding_profile
+from app.utils.svg_emitter import render_svg
+
+def _render_two_color_image(
+    qr: segno.QRCode,
+    size: int,
+    fill_color: str,
+    back_color: str,
+    border: int,
+) -> Image.Image:
+    """
+    Render a QR code as a two-color image of exactly size x size pixels.
+
+    Segno emits a 1-bit image for black on white and a two-entry palette image
+    otherwise. The symbol is rendered at the smallest integer scale covering the
+    requested size and reduced with nearest-neighbour resampling, which keeps
+    the image two-color so it can be saved as a 1-bit or palette PNG.
+
+    Args:
+        qr: Segno QRCode object
+        size: Final image size in pixels
+        fill_color: Color of the dark modules
+        back_color: Background color
+        border: Quiet zone size in modules
+
+    Returns:
+        A Pillow image in "1" or "P" mode
+    """
+    modules = qr.symbol_size(border=border)[0]
+    scale = max(1, -(-size // modules))  # ceil division
+    qr_buffer = io.BytesIO()
+    qr.save(qr_buffer, kind="png", scale=scale, dark=fill_color, light=back_color, border=border)
+    qr_buffer.seek(0)
+    img = Image.open(qr_buffer)
+    if img.size != (size, size):
+        img = img.resize((size, size), Image.NEAREST)
+    return img
+
 
 @MetricsLogger.time_service_call("QRImagingUtil", "generate_qr_image")
+@traced("qr_imaging.generate_qr_image")
+@timed(RENDER)
 def generate_qr_image(
     content: str,
     image_format: Literal["png", "svg", "jpeg", "webp"] = "png",
@@ -28,6 +71,8 @@ def generate_qr_image(
     physical_size: Optional[float] = None,
     physical_unit: Optional[str] = None,
     dpi: Optional[int] = None,
+    image_quality: Optional[int] = None,
+    encoding_profile: Optional[Union[str, EncodingProfile]] = None,
 ) -> bytes:
     """
     Generate a QR code image with the specified parameters using a hybrid approach:
@@ -56,6 +101,10 @@ def generate_qr_image(
         physical_size: Physical size of the QR code in the specified unit
         physical_unit: Physical unit for size (in, cm, mm)
         dpi: DPI (dots per inch) for physical output
+        image_quality: Quality for lossy formats (1-100); overrides the profile preset
+        encoding_profile: Raster encoder preset (fast, balanced, archival)
+            - If None, the print profile is used when physical dimensions are given,
+              otherwise the configured default profile
         
     Returns:
         The QR code image as bytes.
@@ -102,49 +151,36 @@ def generate_qr_image(
         
         # For SVG output, handle differently since it's vector-based
         if image_format.lower() == "svg":
-            output = io.BytesIO()
-            # Add SVG accessibility options if provided
-            svg_options = {
-                "scale": 10,
-                "dark": fill_color,
-                "light": back_color,
-                "border": border
-            }
-            
-            # Add SVG title and description if provided (for accessibility)
-            if svg_title:
-                svg_options["title"] = svg_title
-            if svg_description:
-                svg_options["desc"] = svg_description
-                
-            # Generate SVG with accessibility options
-            qr.save(output, kind="svg", **svg_options)
-            
-            # If physical dimensions are specified, update SVG viewBox to support physical dimensions
-            if physical_size is not None and physical_unit is not None:
-                svg_content = output.getvalue().decode('utf-8')
-                # Add width and height with physical units
-                svg_content = svg_content.replace('<svg ', 
-                                                  f'<svg width="{physical_size}{physical_unit}" '
-                                                  f'height="{physical_size}{physical_unit}" ')
-                return svg_content.encode('utf-8')
-                
-            return output.getvalue()
+            # Physical dimensions go straight into width/height; otherwise use the pixel size
+            use_physical = physical_size is not None and physical_unit is not None
+            return render_svg(
+                qr,
+                border=border,
+                dark=fill_color,
+                light=None if back_color.lower() in ("transparent", "none") else back_color,
+                width=physical_size if use_physical else size,
+                unit=physical_unit if use_physical else None,
+                title=svg_title,
+                description=svg_description,
+            )
         
         # For raster formats, we'll use Pillow for final processing
-        # First generate a high-resolution QR code
-        qr_buffer = io.BytesIO()
-        # Use a larger scale for better quality when resizing
-        scale = max(1, size // 40)
-        qr.save(qr_buffer, kind="png", scale=scale, dark=fill_color, light=back_color, border=border)
-        qr_buffer.seek(0)
+        if not actual_logo_path:
+            # Without a logo the image only has two colors: keep Segno's 1-bit / palette
+            # image and resize with nearest-neighbour so no intermediate colors appear
+            img = _render_two_color_image(qr, size, fill_color, back_color, border)
+        else:
+            # With a logo, generate a high-resolution RGB QR code
+            qr_buffer = io.BytesIO()
+            # Use a larger scale for better quality when resizing
+            scale = max(1, size // 40)
+            qr.save(qr_buffer, kind="png", scale=scale, dark=fill_color, light=back_color, border=border)
+            qr_buffer.seek(0)
         
-        # Open with Pillow
-        img = Image.open(qr_buffer)
-        img = img.convert('RGB')  # Ensure color mode
+            # Open with Pillow
+            img = Image.open(qr_buffer)
+            img = img.convert('RGB')  # Ensure color mode
         
-        # If we have a logo, add it now
-        if actual_logo_path:
             # Open and resize logo
             logo_img = Image.open(actual_logo_path)
             # Convert logo to RGB if necessary
@@ -174,21 +210,18 @@ def generate_qr_image(
             
             # Paste the logo
             img.paste(logo_img, box)
+            
+            # Resize to final dimensions
+            if img.size != (size, size):
+                img = img.resize((size, size), Image.LANCZOS if hasattr(Image, "LANCZOS") else Image.ANTIALIAS)
         
-        # Resize to final dimensions
-        if img.size != (size, size):
-            img = img.resize((size, size), Image.LANCZOS if hasattr(Image, "LANCZOS") else Image.ANTIALIAS)
-        
-        # Save to bytes
-        output = io.BytesIO()
+        # Encode with the selected profile
+        profile = resolve_encoding_profile(
+            encoding_profile,
+            is_print=physical_size is not None and physical_unit is not None and dpi is not None,
+        )
         save_kwargs = {}
         
-        if image_format.lower() == "jpeg":
-            save_kwargs["quality"] = 95  # High quality JPEG
-        elif image_format.lower() == "webp":
-            save_kwargs["quality"] = 95
-            save_kwargs["method"] = 6  # Highest quality WebP
-        
         # Add DPI information if provided
         if dpi is not None:
             # PIL uses dots per mm, so convert DPI to DPMM
@@ -206,8 +239,7 @@ def generate_qr_image(
                     # Just use the dpi parameter which is supported in older versions
                     pass
         
-        img.save(output, format=image_format.upper(), **save_kwargs)
-        return output.getvalue()
+        return encode_image(img, image_format, profile, image_quality=image_quality, **save_kwargs)
         
     except Exception as e:
         # Handle unexpected exceptions
@@ -229,6 +261,7 @@ def generate_qr_response(
     physical_size: Optional[float] = None,
     physical_unit: Optional[str] = None,
     dpi: Optional[int] = None,
+    encoding_profile: Optional[Union[str, EncodingProfile]] = None,
 ) -> StreamingResponse:
     """
     Generate a QR code and return it as a StreamingResponse.
@@ -248,6 +281,7 @@ def generate_qr_response(
         physical_size: Physical size of the QR code in the specified unit
         physical_unit: Physical unit for size (in, cm, mm)
         dpi: DPI (dots per inch) for physical output
+        encoding_profile: Raster encoder preset (fast, balanced, archival)
         
     Returns:
         StreamingResponse containing the image
@@ -287,7 +321,9 @@ def generate_qr_response(
             svg_description=svg_description,
             physical_size=physical_size,
             physical_unit=physical_unit,
-            dpi=dpi
+            dpi=dpi,
+            image_quality=image_quality,
+            encoding_profile=encoding_profile,
         )
         
         # Create BytesIO from the generated bytes
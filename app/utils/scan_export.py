@@ -0,0 +1,184 @@
+"""
+Streaming writers for scan log exports.
+
+Both writers consume the row batches produced by
+``ScanLogRepository.stream_scan_logs`` and yield encoded chunks as soon as a
+batch has been written, so an export never holds more than one batch in
+memory. Parquet output requires the optional ``pyarrow`` dependency.
+"""
+
+import csv
+import importlib.util
+import io
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from sqlalchemy.orm import Session
+
+from app.repositories.scan_log_repository import ScanLogRepository
+from app.schemas.common import ExportFormat
+
+# pyarrow is optional and slow to import, so it is only loaded by a Parquet export
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+EXPORT_FIELDS: List[str] = [column.key for column in ScanLogRepository.EXPORT_COLUMNS]
+
+MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+
+def _csv_value(value):
+    """Format datetimes as ISO 8601; leave other values to the csv module."""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def iter_csv(batches: Iterable[Sequence[Sequence]]) -> Iterator[bytes]:
+    """
+    Encode row batches as CSV.
+
+    Args:
+        batches: Iterable of row batches in EXPORT_FIELDS order
+
+    Yields:
+        UTF-8 encoded CSV chunks, starting with the header row
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.getvalue().encode("utf-8")
+
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_csv_value(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _ChunkSink:
+    """
+    Write-only file object that hands written bytes back in chunks.
+
+    The Parquet writer records absolute offsets in the file footer, so the
+    position reported by tell() keeps counting across drained chunks.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+    def drain(self) -> bytes:
+        """Return and forget everything written since the last drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _parquet_schema():
+    """Build the Arrow schema for exported scan logs."""
+    import pyarrow as pa
+
+    types = {
+        "scanned_at": pa.timestamp("us", tz="UTC"),
+        "is_genuine_scan": pa.bool_(),
+        "is_mobile": pa.bool_(),
+        "is_tablet": pa.bool_(),
+        "is_pc": pa.bool_(),
+        "is_bot": pa.bool_(),
+    }
+    return pa.schema([(name, types.get(name, pa.string())) for name in EXPORT_FIELDS])
+
+
+def iter_parquet(batches: Iterable[Sequence[Sequence]]) -> Iterator[bytes]:
+    """
+    Encode row batches as a Parquet file with one row group per batch.
+
+    Args:
+        batches: Iterable of row batches in EXPORT_FIELDS order
+
+    Yields:
+        Chunks of the Parquet file
+
+    Raises:
+        ValueError: If pyarrow is not installed
+    """
+    if not PARQUET_AVAILABLE:
+        raise ValueError("Parquet export requires the optional pyarrow package")
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _parquet_schema()
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        for batch in batches:
+            columns = list(zip(*batch))
+            table = pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)],
+                schema=schema,
+            )
+            writer.write_table(table)
+            chunk = sink.drain()
+            if chunk:
+                yield chunk
+    finally:
+        writer.close()
+    yield sink.drain()
+
+
+def export_scan_logs(
+    db: Session,
+    export_format: ExportFormat,
+    qr_id: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    genuine_only: bool = False,
+    batch_size: int = 1000,
+) -> Iterator[bytes]:
+    """
+    Stream scan logs in the requested format.
+
+    Args:
+        db: Database session used for the server-side cursor
+        export_format: CSV or Parquet
+        qr_id: Only include scans of this QR code (all QR codes if None)
+        start_date: Only include scans at or after this time
+        end_date: Only include scans before this time
+        genuine_only: If True, include only genuine QR scans
+        batch_size: Rows per fetch (and per Parquet row group)
+
+    Yields:
+        Encoded chunks of the export file
+
+    Raises:
+        ValueError: If Parquet is requested but pyarrow is not installed
+        DatabaseError: If a database error occurs
+    """
+    batches = ScanLogRepository(db).stream_scan_logs(
+        qr_id=qr_id,
+        start_date=start_date,
+        end_date=end_date,
+        genuine_only=genuine_only,
+        batch_size=batch_size,
+    )
+    if export_format == ExportFormat.PARQUET:
+        return iter_parquet(batches)
+    return iter_csv(batches)
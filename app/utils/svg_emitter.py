@@ -0,0 +1,157 @@
+"""
+Compact SVG emitter shared by the legacy imaging path and the Segno adapter.
+
+Segno's SVG writer draws the symbol in pixel space and scales it with a
+``transform``, and the legacy path then patched physical units into the
+document with a string replace. This module writes the whole document in one
+pass instead: the viewBox is expressed in modules, width/height carry the final
+size (pixels or physical units) and all dark modules are emitted as a single
+path made of run-length encoded horizontal segments.
+"""
+
+from html import escape
+from typing import Optional, Sequence
+
+import segno
+
+SVG_NAMESPACE = "http://www.w3.org/2000/svg"
+
+
+def _format_number(value: float) -> str:
+    """
+    Format a number with the shortest lossless representation used in SVG attributes.
+
+    Args:
+        value: The number to format
+
+    Returns:
+        The number without trailing zeros or a trailing decimal point
+    """
+    if float(value).is_integer():
+        return str(int(value))
+    return f"{value:.4f}".rstrip("0").rstrip(".")
+
+
+def _shorten_hex(color: str) -> str:
+    """
+    Shorten a #RRGGBB color to #RGB when every channel repeats its digit.
+
+    Args:
+        color: The color value
+
+    Returns:
+        The shortest equivalent color notation
+    """
+    if len(color) == 7 and color.startswith("#") and all(
+        color[i] == color[i + 1] for i in (1, 3, 5)
+    ):
+        return f"#{color[1]}{color[3]}{color[5]}".lower()
+    return color
+
+
+def _color_attributes(attribute: str, color: str) -> str:
+    """
+    Build color attributes, splitting #RRGGBBAA colors into color and opacity.
+
+    Args:
+        attribute: The SVG paint attribute name ("fill" or "stroke")
+        color: The color value (hex or CSS color name)
+
+    Returns:
+        Attribute string ready to be embedded in an element
+    """
+    if color.startswith("#") and len(color) == 9:
+        opacity = int(color[7:9], 16) / 255
+        return (
+            f'{attribute}="{_shorten_hex(color[:7])}" '
+            f'{attribute}-opacity="{_format_number(round(opacity, 3))}"'
+        )
+    return f'{attribute}="{escape(_shorten_hex(color))}"'
+
+
+def build_module_path(matrix: Sequence[Sequence[int]], border: int) -> str:
+    """
+    Build path data for the dark modules of a QR code matrix.
+
+    Each row is encoded as horizontal runs drawn with a 1-module stroke; moves
+    between runs are relative so most commands need one or two digits.
+
+    Args:
+        matrix: QR code matrix without border (truthy values are dark modules)
+        border: Quiet zone size in modules
+
+    Returns:
+        SVG path data string (empty if the matrix has no dark modules)
+    """
+    commands = []
+    # Current pen position; None until the first absolute move
+    pen_x: Optional[int] = None
+    pen_y = 0
+    for row_index, row in enumerate(matrix):
+        y = row_index + border
+        x = 0
+        width = len(row)
+        while x < width:
+            if not row[x]:
+                x += 1
+                continue
+            run_start = x
+            while x < width and row[x]:
+                x += 1
+            start = run_start + border
+            if pen_x is None:
+                commands.append(f"M{start} {y}.5h{x - run_start}")
+            else:
+                commands.append(f"m{start - pen_x} {y - pen_y}h{x - run_start}")
+            pen_x = x + border
+            pen_y = y
+    return "".join(commands)
+
+
+def render_svg(
+    qr: segno.QRCode,
+    border: int = 4,
+    dark: str = "#000000",
+    light: Optional[str] = "#FFFFFF",
+    width: Optional[float] = None,
+    unit: Optional[str] = None,
+    title: Optional[str] = None,
+    description: Optional[str] = None,
+) -> bytes:
+    """
+    Render a QR code as a compact standalone SVG document.
+
+    Args:
+        qr: Segno QRCode object
+        border: Quiet zone size in modules
+        dark: Color of the dark modules
+        light: Background color, or None for a transparent background
+        width: Rendered width and height; defaults to one unit per module
+        unit: Optional physical unit (in, cm, mm) appended to width/height
+        title: Optional <title> for accessibility
+        description: Optional <desc> for accessibility
+
+    Returns:
+        The SVG document as UTF-8 bytes
+    """
+    modules = qr.symbol_size(border=border)[0]
+    size = _format_number(width if width is not None else modules)
+    if unit:
+        size = f"{size}{unit}"
+
+    parts = [
+        f'<svg xmlns="{SVG_NAMESPACE}" width="{size}" height="{size}" '
+        f'viewBox="0 0 {modules} {modules}">'
+    ]
+    if title:
+        parts.append(f"<title>{escape(title)}</title>")
+    if description:
+        parts.append(f"<desc>{escape(description)}</desc>")
+    if light is not None:
+        parts.append(f'<path {_color_attributes("fill", light)} d="M0 0h{modules}v{modules}H0z"/>')
+
+    path_data = build_module_path(qr.matrix, border)
+    if path_data:
+        parts.append(f'<path {_color_attributes("stroke", dark)} d="{path_data}"/>')
+    parts.append("</svg>")
+    return "".join(parts).encode("utf-8")
@@ -0,0 +1,104 @@
+"""
+Jinja2 template helpers shared by the page and fragment routers.
+
+Both routers render from one Jinja2 environment, so each template is compiled
+once per process. With JINJA_BYTECODE_CACHE_ENABLED the compiled templates are
+also written to JINJA_BYTECODE_CACHE_DIR, so other workers and restarted
+processes load the bytecode instead of parsing and compiling the source again.
+Cache entries are keyed by template name and checked against the source, so
+an edited template is recompiled.
+"""
+
+import logging
+import time
+from pathlib import Path
+from typing import Optional
+
+import jinja2
+from jinja2.bccache import Bucket
+from fastapi.templating import Jinja2Templates
+from starlette.templating import _TemplateResponse
+
+from app.core.config import settings
+from app.core.server_timing import TEMPLATE, track
+
+logger = logging.getLogger(__name__)
+
+
+class TimedJinja2Templates(Jinja2Templates):
+    """
+    Jinja2Templates that adds template rendering time to the request's
+    Server-Timing ``template`` entry.
+
+    Rendering happens when the response is constructed, so timing
+    TemplateResponse covers context processors and the render itself.
+    """
+
+    def TemplateResponse(self, *args, **kwargs) -> _TemplateResponse:
+        with track(TEMPLATE):
+            return super().TemplateResponse(*args, **kwargs)
+
+
+class TolerantBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """
+    Filesystem bytecode cache that never fails a render.
+
+    A missing or read-only cache directory only means the compiled template
+    is not stored; the template itself is still rendered.
+    """
+
+    def dump_bytecode(self, bucket: Bucket) -> None:
+        try:
+            super().dump_bytecode(bucket)
+        except OSError as e:
+            logger.debug(f"Could not write template bytecode to {self.directory}: {e}")
+
+
+def create_template_environment(
+    directory: Path = settings.TEMPLATES_DIR,
+    bytecode_cache_dir: Optional[Path] = None,
+) -> jinja2.Environment:
+    """
+    Create a Jinja2 environment with the options Jinja2Templates uses by default.
+
+    Args:
+        directory: Template directory
+        bytecode_cache_dir: Directory for compiled templates, or None for no bytecode cache
+
+    Returns:
+        The configured environment
+    """
+    bytecode_cache = TolerantBytecodeCache(str(bytecode_cache_dir)) if bytecode_cache_dir else None
+    return jinja2.Environment(
+        loader=jinja2.FileSystemLoader(str(directory)),
+        autoescape=True,
+        bytecode_cache=bytecode_cache,
+    )
+
+
+def precompile_templates(env: Optional[jinja2.Environment] = None) -> int:
+    """
+    Load every HTML template so that it is compiled before the first request.
+
+    Templates already in the bytecode cache are loaded from it; the others are
+    compiled and written to it.
+
+    Args:
+        env: Environment to fill (defaults to the shared template_env)
+
+    Returns:
+        Number of templates loaded
+    """
+    env = env or template_env
+    start = time.perf_counter()
+    names = env.list_templates(extensions=["html"])
+    for name in names:
+        env.get_template(name)
+    logger.info(f"Precompiled {len(names)} templates in {(time.perf_counter() - start) * 1000:.0f}ms")
+    return len(names)
+
+
+# Shared by the page and fragment routers
+template_env = create_template_environment(
+    bytecode_cache_dir=settings.JINJA_BYTECODE_CACHE_DIR if settings.JINJA_BYTECODE_CACHE_ENABLED else None,
+)
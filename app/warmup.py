@@ -0,0 +1,266 @@
+"""
+Start-up warm-up for the QR code generator.
+
+WarmupRunner runs named steps in order after start-up and records each step's
+duration and outcome as metrics. The application keeps reporting not ready on
+/readyz until the runner finishes or its timeout elapses, so traffic is only
+routed to a worker once the connection pool, hot statements, popular redirects
+and images and the templates have been exercised.
+
+Steps are plain callables: sync steps run in a worker thread, async steps on
+the event loop. Additional steps can be registered with ``add_step`` or the
+``step`` decorator.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple, Union
+
+from fastapi import FastAPI
+from sqlalchemy import text
+
+from .core.config import settings
+from .core.metrics_logger import MetricsLogger
+from .database import SessionLocal, get_engine
+from .repositories import QRCodeRepository, ScanLogRepository
+from .schemas.qr.parameters import QRImageParameters
+from .services.qr_service import QRCodeService
+from .utils.templating import precompile_templates
+
+logger = logging.getLogger("app.warmup")
+
+WarmupStep = Callable[[], Union[Any, Awaitable[Any]]]
+
+# A browser user agent, used to load the user agent parser's regex tables
+_WARMUP_USER_AGENT = (
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_0 like Mac OS X) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.0 Mobile/15E148 Safari/604.1"
+)
+
+
+class WarmupRunner:
+    """
+    Runs warm-up steps in order within an overall timeout.
+
+    A failing step is logged and the remaining steps still run. When the
+    timeout elapses the current step is abandoned (a sync step keeps running
+    in its thread until it returns) and the remaining steps are skipped.
+
+    Args:
+        timeout: Seconds allowed for all steps together
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._steps: List[Tuple[str, WarmupStep]] = []
+        self.results: Dict[str, str] = {}
+        self.durations: Dict[str, float] = {}
+
+    def add_step(self, name: str, func: WarmupStep) -> None:
+        """
+        Register a step to run after the ones already registered.
+
+        Args:
+            name: Step name, used in logs, metrics and /readyz
+            func: Sync or async callable taking no arguments
+        """
+        self._steps.append((name, func))
+        self.results[name] = "pending"
+
+    def step(self, name: str) -> Callable[[WarmupStep], WarmupStep]:
+        """
+        Decorator form of add_step.
+
+        Args:
+            name: Step name
+
+        Returns:
+            Decorator that registers the function and returns it unchanged
+        """
+        def decorator(func: WarmupStep) -> WarmupStep:
+            self.add_step(name, func)
+            return func
+
+        return decorator
+
+    async def _run_step(self, name: str, func: WarmupStep) -> None:
+        """Run one step and record its outcome."""
+        self.results[name] = "running"
+        start = time.perf_counter()
+        status = "failed"
+        try:
+            if asyncio.iscoroutinefunction(func):
+                await func()
+            else:
+                await asyncio.to_thread(func)
+            status = "ok"
+        except asyncio.CancelledError:
+            status = "timeout"
+            raise
+        except Exception as e:
+            logger.warning(f"Warm-up step '{name}' failed: {e}")
+        finally:
+            duration = time.perf_counter() - start
+            self.results[name] = status
+            self.durations[name] = duration
+            MetricsLogger.log_warmup_step(name, status, duration)
+            logger.info(f"Warm-up step '{name}': {status} in {duration * 1000:.0f}ms")
+
+    async def _run_steps(self) -> None:
+        for name, func in self._steps:
+            await self._run_step(name, func)
+
+    async def run(self) -> bool:
+        """
+        Run all registered steps.
+
+        Returns:
+            True if every step ran before the timeout, False otherwise
+        """
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._run_steps(), timeout=self.timeout)
+            completed = True
+        except asyncio.TimeoutError:
+            completed = False
+            for name, result in self.results.items():
+                if result == "pending":
+                    self.results[name] = "skipped"
+            logger.warning(f"Warm-up timed out after {self.timeout:.0f}s: {self.results}")
+        duration = time.perf_counter() - start
+        MetricsLogger.log_warmup_completed("completed" if completed else "timeout", duration)
+        return completed
+
+
+def prefill_pool(connections: int) -> None:
+    """
+    Open pooled database connections ahead of traffic.
+
+    The connections are checked out together, so the pool has to open new
+    ones, and returned to the pool for the first requests to reuse.
+
+    Args:
+        connections: Number of connections to open (capped at DB_POOL_SIZE)
+    """
+    engine = get_engine()
+    opened = []
+    try:
+        for _ in range(min(connections, settings.DB_POOL_SIZE)):
+            conn = engine.connect()
+            opened.append(conn)
+            conn.execute(text("SELECT 1"))
+    finally:
+        for conn in opened:
+            conn.close()
+
+
+def prepare_statements() -> None:
+    """
+    Execute the hot read statements once.
+
+    psycopg2 does not use server-side prepared statements; running each query
+    shape fills SQLAlchemy's compiled statement cache and loads the table and
+    index pages into the database's buffer cache.
+    """
+    with SessionLocal() as db:
+        repo = QRCodeRepository(db)
+        repo.get_by_short_id("00000000")
+        repo.get_by_id("00000000-0000-0000-0000-000000000000")
+        repo.list_qr_codes(skip=0, limit=1)
+        repo.count()
+
+
+def warm_redirects(limit: int) -> None:
+    """
+    Exercise the redirect path for the most-scanned dynamic QR codes.
+
+    Runs the redirect endpoint's lookup and URL check for each short ID and
+    loads the user agent parser used when recording scans.
+
+    Args:
+        limit: Number of QR codes to look up
+    """
+    with SessionLocal() as db:
+        qr_service = QRCodeService(qr_code_repo=QRCodeRepository(db), scan_log_repo=ScanLogRepository(db))
+        qr_service._parse_user_agent_data(_WARMUP_USER_AGENT)
+        if limit <= 0:
+            return
+        popular, _ = qr_service.qr_code_repo.list_qr_codes(
+            limit=limit, qr_type="dynamic", sort_by="scan_count", sort_desc=True
+        )
+        for qr in popular:
+            if qr.short_id:
+                found = qr_service.get_qr_by_short_id(qr.short_id)
+                if found.redirect_url:
+                    qr_service._is_safe_redirect_url(found.redirect_url)
+
+
+def _load_popular_qr_codes(limit: int) -> List[Tuple[str, str, str]]:
+    """Get (content, fill_color, back_color) of the most-scanned QR codes."""
+    with SessionLocal() as db:
+        popular, _ = QRCodeRepository(db).list_qr_codes(limit=limit, sort_by="scan_count", sort_desc=True)
+        return [(qr.content, qr.fill_color, qr.back_color) for qr in popular]
+
+
+async def render_popular_images(app: FastAPI, limit: int) -> None:
+    """
+    Render the images of the most-scanned QR codes with the image endpoint's defaults.
+
+    Uses the app-scoped generation service and circuit breaker, so the same
+    code path as GET /api/v1/qr/{qr_id}/image is exercised. Without any QR
+    codes a placeholder is rendered instead. The event loop is yielded
+    between images.
+
+    Args:
+        app: The FastAPI application (for the app-scoped services)
+        limit: Number of QR codes to render
+    """
+    popular = await asyncio.to_thread(_load_popular_qr_codes, limit) if limit > 0 else []
+    if not popular:
+        popular = [("warmup", "#000000", "#FFFFFF")]
+
+    qr_service = QRCodeService(
+        qr_code_repo=None,
+        scan_log_repo=None,
+        new_qr_generation_service=app.state.new_qr_generation_service,
+        new_qr_generation_breaker=app.state.new_qr_generation_breaker,
+    )
+    params = QRImageParameters()
+    for content, fill_color, back_color in popular:
+        await qr_service.generate_qr(
+            data=content,
+            size=params.size,
+            border=params.border,
+            fill_color=params.fill_color or fill_color,
+            back_color=params.back_color or back_color,
+            image_format=params.image_format.value,
+            image_quality=params.image_quality,
+            include_logo=params.include_logo,
+            error_level=params.error_level.value,
+        )
+        await asyncio.sleep(0)
+
+
+def create_warmup(app: FastAPI) -> WarmupRunner:
+    """
+    Build the warm-up runner with the default steps.
+
+    Args:
+        app: The FastAPI application
+
+    Returns:
+        WarmupRunner with the pool, statements, redirects, images and templates steps
+    """
+    runner = WarmupRunner(timeout=settings.WARMUP_TIMEOUT_SECONDS)
+    top = settings.WARMUP_TOP_QR_CODES
+    runner.add_step("pool", lambda: prefill_pool(settings.WARMUP_POOL_CONNECTIONS))
+    runner.add_step("statements", prepare_statements)
+    runner.add_step("redirects", lambda: warm_redirects(top))
+
+    @runner.step("images")
+    async def images():
+        await render_popular_images(app, top)
+
+    runner.add_step("templates", precompile_templates)
+    return runner
@@ -0,0 +1,44 @@
+"""
+Unit tests for the connection pool usage gauges updated by the pool events.
+"""
+import pytest
+from prometheus_client import REGISTRY
+
+from app import database
+
+
+@pytest.fixture
+def pooled_engine(monkeypatch):
+    """Create the application engine against in-memory SQLite with a small pool."""
+    monkeypatch.setattr(database, "get_database_url", lambda: "sqlite://")
+    monkeypatch.setattr(database.settings, "DB_POOL_SIZE", 2)
+    monkeypatch.setattr(database.settings, "DB_MAX_OVERFLOW", 1)
+    monkeypatch.setattr(database, "_engine", None)
+    engine = database.get_engine()
+    yield engine
+    engine.dispose()
+    database.SessionLocal.configure(bind=None)
+
+
+def pool_gauges() -> tuple:
+    """Read the in-use and overflow gauges."""
+    return (
+        REGISTRY.get_sample_value("db_pool_connections_in_use"),
+        REGISTRY.get_sample_value("db_pool_overflow_connections"),
+    )
+
+
+def test_idle_pool_reports_no_connections_in_use(pooled_engine):
+    conn = pooled_engine.connect()
+    assert pool_gauges() == (1, 0)
+    conn.close()
+    assert pool_gauges() == (0, 0)
+
+
+def test_overflow_connection_is_released_on_checkin(pooled_engine):
+    connections = [pooled_engine.connect() for _ in range(3)]
+    assert pool_gauges() == (3, 1)
+    for conn in connections:
+        conn.close()
+    assert pool_gauges() == (0, 0)
+    assert pooled_engine.pool.checkedout() == 0
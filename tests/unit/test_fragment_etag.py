@@ -0,0 +1,57 @@
+"""
+Unit tests for ETag revalidation of HTMX fragments.
+"""
+from fastapi import Request
+from fastapi.responses import HTMLResponse
+
+from app.core.fragment_etag import CACHE_CONTROL, etag_matches, make_etag, revalidate
+
+
+def build_request(if_none_match: str | None = None) -> Request:
+    """Build a GET request for a fragment, optionally with If-None-Match."""
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({"type": "http", "method": "GET", "path": "/api/v1/fragments/qr-list", "headers": headers})
+
+
+def test_full_response_carries_validators():
+    response = revalidate(build_request(), HTMLResponse("<ul><li>one</li></ul>"))
+
+    assert response.status_code == 200
+    assert response.body == b"<ul><li>one</li></ul>"
+    assert response.headers["etag"] == make_etag(b"<ul><li>one</li></ul>")
+    assert response.headers["cache-control"] == CACHE_CONTROL
+
+
+def test_matching_etag_returns_304_without_body():
+    etag = make_etag(b"<ul><li>one</li></ul>")
+
+    response = revalidate(build_request(etag), HTMLResponse("<ul><li>one</li></ul>"))
+
+    assert response.status_code == 304
+    assert response.body == b""
+    assert response.headers["etag"] == etag
+
+
+def test_changed_body_is_sent_again():
+    """A stale ETag never yields a 304, whichever worker rendered the client's copy."""
+    stale = make_etag(b"<ul><li>one</li></ul>")
+
+    response = revalidate(build_request(stale), HTMLResponse("<ul><li>one</li><li>two</li></ul>"))
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != stale
+
+
+def test_error_responses_are_left_alone():
+    response = revalidate(build_request("*"), HTMLResponse("error", status_code=500))
+
+    assert response.status_code == 500
+    assert "etag" not in response.headers
+
+
+def test_etag_matching_ignores_weakness_and_lists():
+    etag = make_etag(b"body")
+
+    assert etag_matches(build_request(f'"other", {etag.removeprefix("W/")}'), etag)
+    assert etag_matches(build_request("*"), etag)
+    assert not etag_matches(build_request('W/"other"'), etag)
@@ -0,0 +1,43 @@
+"""
+Unit tests for application start-up import cost.
+
+The import budget is deliberately generous (the measured median is ~1.3s) so
+that it only catches regressions such as a heavy module moving back to
+import time, not machine-to-machine noise.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from app.scripts.benchmark_startup import measure
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+IMPORT_BUDGET_MS = 2500
+
+# Imported on first use only; none of these should be loaded by import app.main
+LAZY_MODULES = ["user_agents", "ua_parser", "pyarrow", "psutil", "psycopg2"]
+
+
+def test_import_time_within_budget():
+    """The median cumulative import time of app.main stays within the budget."""
+    totals_ms, _ = measure(iterations=3)
+    assert statistics.median(totals_ms) <= IMPORT_BUDGET_MS
+
+
+def test_heavy_modules_not_imported_at_startup():
+    """Importing app.main does not import optional or first-use dependencies."""
+    env = {key: value for key, value in os.environ.items() if key != "PG_DATABASE_URL"}
+    code = (
+        "import json, sys\n"
+        "import app.main\n"
+        f"print(json.dumps([m for m in {LAZY_MODULES!r} if m in sys.modules]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
@@ -0,0 +1,187 @@
+"""
+Unit tests for route-template labels and series bounds in MetricsMiddleware.
+"""
+import asyncio
+import gc
+import tracemalloc
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.responses import RedirectResponse
+from prometheus_client import REGISTRY
+
+from app.middleware.metrics import OVERFLOW_ENDPOINT, UNMATCHED_ENDPOINT, MetricsMiddleware
+
+
+def build_app() -> FastAPI:
+    """Build an application with the parameterized routes that caused unbounded labels."""
+    app = FastAPI()
+
+    @app.get("/r/{short_id}")
+    async def redirect(short_id: str):
+        return RedirectResponse(url="https://example.com/", status_code=302)
+
+    @app.get("/api/v1/qr/{qr_id}/image")
+    async def image(qr_id: str):
+        return {"qr_id": qr_id}
+
+    return app
+
+
+async def call(app, path: str, method: str = "GET") -> int:
+    """Send one HTTP request through an ASGI app and return the status code."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver")],
+        "client": ("127.0.0.1", 12345),
+        "server": ("testserver", 80),
+    }
+    status = None
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, receive, send)
+    return status
+
+
+def endpoint_labels() -> set:
+    """Endpoint label values currently exported by app_http_requests_total."""
+    return {
+        sample.labels["endpoint"]
+        for metric in REGISTRY.collect()
+        if metric.name == "app_http_requests"
+        for sample in metric.samples
+        if sample.name == "app_http_requests_total"
+    }
+
+
+def request_count(method: str, endpoint: str, status: int) -> float:
+    """Current value of app_http_requests_total for one label set."""
+    value = REGISTRY.get_sample_value(
+        "app_http_requests_total", {"method": method, "endpoint": endpoint, "status": str(status)}
+    )
+    return value or 0.0
+
+
+def test_labels_use_route_template():
+    """Requests are labelled with the matched route template, not the raw path."""
+    middleware = MetricsMiddleware(build_app())
+    before = request_count("GET", "/r/{short_id}", 302)
+
+    async def run():
+        assert await call(middleware, "/r/abc123") == 302
+        assert await call(middleware, "/r/def456") == 302
+        assert await call(middleware, "/api/v1/qr/0b0e1c2d/image") == 200
+
+    asyncio.run(run())
+
+    labels = endpoint_labels()
+    assert request_count("GET", "/r/{short_id}", 302) == before + 2
+    assert "/api/v1/qr/{qr_id}/image" in labels
+    assert "/r/abc123" not in labels
+    assert "/api/v1/qr/0b0e1c2d/image" not in labels
+
+
+def test_unmatched_paths_share_one_label():
+    """Paths that match no route are recorded under the unmatched bucket."""
+    middleware = MetricsMiddleware(build_app())
+    before = request_count("GET", UNMATCHED_ENDPOINT, 404)
+
+    async def run():
+        for i in range(10):
+            assert await call(middleware, f"/does-not-exist/{i}") == 404
+
+    asyncio.run(run())
+
+    assert request_count("GET", UNMATCHED_ENDPOINT, 404) == before + 10
+    assert "/does-not-exist/0" not in endpoint_labels()
+
+
+def test_unknown_methods_are_folded():
+    """Arbitrary request methods do not create new method label values."""
+    middleware = MetricsMiddleware(build_app())
+    before = request_count("OTHER", UNMATCHED_ENDPOINT, 404)
+
+    asyncio.run(call(middleware, "/missing", method="PROPFIND"))
+
+    assert request_count("OTHER", UNMATCHED_ENDPOINT, 404) >= before + 1
+
+
+def test_series_cap_routes_new_series_to_overflow():
+    """Once the cap is reached, new label sets are recorded in the overflow bucket."""
+
+    async def templated_app(scope, receive, send):
+        # Every request matches a distinct "template", as a misbehaving router might
+        scope["route"] = SimpleNamespace(path=f"/cap-test{scope['path']}")
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = MetricsMiddleware(templated_app, max_series=3)
+    before = request_count("GET", OVERFLOW_ENDPOINT, 200)
+
+    async def run():
+        for i in range(10):
+            await call(middleware, f"/{i}")
+
+    asyncio.run(run())
+
+    labels = {label for label in endpoint_labels() if label.startswith("/cap-test")}
+    assert labels == {"/cap-test/0", "/cap-test/1", "/cap-test/2"}
+    assert request_count("GET", OVERFLOW_ENDPOINT, 200) == before + 7
+
+
+def test_memory_stays_flat_for_100k_unique_paths():
+    """100k unique short IDs and unmatched paths do not grow the registry or memory."""
+    redirect_route = SimpleNamespace(path_format="/r/{short_id}", path="/r/{short_id}")
+
+    async def routed_app(scope, receive, send):
+        # Minimal stand-in for the router so the test measures the middleware alone
+        if scope["path"].startswith("/r/"):
+            scope["route"] = redirect_route
+            status = 302
+        else:
+            status = 404
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = MetricsMiddleware(routed_app)
+    total = 100_000
+    warmup = 5_000
+
+    async def run(start: int, stop: int):
+        for i in range(start, stop):
+            path = f"/r/{i:08x}" if i % 2 else f"/unknown/{i:08x}"
+            await call(middleware, path)
+
+    # Warm up so that lazily created objects exist before measuring
+    asyncio.run(run(0, warmup))
+    series_after_warmup = len(endpoint_labels())
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        asyncio.run(run(warmup, total))
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert len(endpoint_labels()) == series_after_warmup
+    assert len(middleware._series) <= 2
+    # Raw-path labels cost well over 1 KB per series; 95k of them would be ~100 MB
+    assert current - baseline < 1_000_000
@@ -0,0 +1,97 @@
+"""
+Unit tests for two-color raster output in app.utils.qr_imaging.
+"""
+import io
+
+import pytest
+import segno
+from PIL import Image
+
+from app.utils.qr_imaging import generate_qr_image
+
+CONTENT = "https://example.com/r/0123456789abcdef"
+
+
+def hex_to_rgb(color: str) -> tuple:
+    """Convert #RRGGBB to an RGB tuple."""
+    return tuple(int(color[i:i + 2], 16) for i in (1, 3, 5))
+
+
+def decode(image_bytes: bytes) -> Image.Image:
+    """Decode image bytes with Pillow."""
+    img = Image.open(io.BytesIO(image_bytes))
+    img.load()
+    return img
+
+
+@pytest.mark.parametrize(
+    "fill_color, back_color, expected_mode",
+    [("#000000", "#FFFFFF", "1"), ("#1A2B3C", "#F0F0F0", "P")],
+)
+def test_png_without_logo_is_two_color(fill_color, back_color, expected_mode):
+    """PNG output without a logo uses a 1-bit or two-entry palette image."""
+    img = decode(generate_qr_image(CONTENT, "png", size=300, fill_color=fill_color, back_color=back_color))
+
+    assert img.mode == expected_mode
+    assert img.size == (300, 300)
+    if expected_mode == "P":
+        assert len(img.getpalette()) // 3 == 2
+
+
+@pytest.mark.parametrize("fill_color, back_color", [("#000000", "#FFFFFF"), ("#1A2B3C", "#F0F0F0")])
+@pytest.mark.parametrize("profile", ["fast", "balanced", "archival"])
+def test_png_pixels_match_qr_matrix(fill_color, back_color, profile):
+    """Every pixel of the decoded PNG matches the module it belongs to."""
+    border = 4
+    qr = segno.make(CONTENT, error="m")
+    modules = qr.symbol_size(border=border)[0]
+    scale = 6
+
+    img = decode(generate_qr_image(
+        CONTENT, "png", size=modules * scale, fill_color=fill_color, back_color=back_color,
+        border=border, error_level="m", encoding_profile=profile,
+    )).convert("RGB")
+
+    dark, light = hex_to_rgb(fill_color), hex_to_rgb(back_color)
+    expected = Image.new("RGB", (modules, modules), light)
+    for y, row in enumerate(qr.matrix):
+        for x, value in enumerate(row):
+            if value:
+                expected.putpixel((x + border, y + border), dark)
+    expected = expected.resize(img.size, Image.NEAREST)
+
+    assert img.tobytes() == expected.tobytes()
+
+
+def test_png_pixels_match_rgb_rendering_when_resized():
+    """Sizes that are not a module multiple decode to the same pixels as an RGB encode."""
+    qr = segno.make(CONTENT, error="m")
+    modules = qr.symbol_size(border=4)[0]
+    size = 333
+    buffer = io.BytesIO()
+    qr.save(buffer, kind="png", scale=-(-size // modules), border=4)
+    buffer.seek(0)
+    reference = Image.open(buffer).convert("RGB").resize((size, size), Image.NEAREST)
+
+    img = decode(generate_qr_image(CONTENT, "png", size=size, error_level="m"))
+
+    assert img.mode == "1"
+    assert img.convert("RGB").tobytes() == reference.tobytes()
+
+
+def test_png_is_smaller_than_rgb_encoding():
+    """The two-color PNG is smaller than the same pixels stored as 24-bit RGB."""
+    image_bytes = generate_qr_image(CONTENT, "png", size=500, encoding_profile="balanced")
+    rgb_buffer = io.BytesIO()
+    decode(image_bytes).convert("RGB").save(rgb_buffer, format="PNG", compress_level=6)
+
+    assert len(image_bytes) < len(rgb_buffer.getvalue())
+
+
+@pytest.mark.parametrize("image_format, expected_mode", [("jpeg", "RGB"), ("webp", "RGB")])
+def test_lossy_formats_fall_back_to_rgb(image_format, expected_mode):
+    """Formats without palette support are still encoded as RGB."""
+    img = decode(generate_qr_image(CONTENT, image_format, size=300))
+
+    assert img.mode == expected_mode
+    assert img.size == (300, 300)
@@ -0,0 +1,73 @@
+"""
+Unit tests for the savepoint around the slow-query EXPLAIN.
+"""
+from app.core.query_instrumentation import _explain
+
+
+class FakeCursor:
+    """DBAPI cursor that records statements and fails the EXPLAIN on request."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, statement, parameters=None):
+        self.connection.executed.append(statement)
+        if statement.startswith("EXPLAIN") and self.connection.fail_explain:
+            raise RuntimeError("canceling statement due to statement timeout")
+
+    def fetchall(self):
+        return [("Seq Scan on qr_codes",), ("Execution Time: 1.0 ms",)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, autocommit=False, fail_explain=False):
+        self.autocommit = autocommit
+        self.fail_explain = fail_explain
+        self.executed = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+
+def test_explain_runs_inside_a_released_savepoint():
+    connection = FakeConnection()
+
+    plan = _explain(FakeCursor(connection), "SELECT * FROM qr_codes", {})
+
+    assert plan == "Seq Scan on qr_codes\nExecution Time: 1.0 ms"
+    assert connection.executed == [
+        "SAVEPOINT slow_query_explain",
+        "EXPLAIN (ANALYZE, BUFFERS) SELECT * FROM qr_codes",
+        "RELEASE SAVEPOINT slow_query_explain",
+    ]
+
+
+def test_failed_explain_rolls_back_to_the_savepoint_and_warns(caplog):
+    connection = FakeConnection(fail_explain=True)
+
+    plan = _explain(FakeCursor(connection), "SELECT * FROM qr_codes", {})
+
+    assert plan is None
+    assert connection.executed[-1] == "ROLLBACK TO SAVEPOINT slow_query_explain"
+    assert any(
+        record.levelname == "WARNING" and "statement timeout" in record.getMessage()
+        for record in caplog.records
+    )
+
+
+def test_autocommit_connection_skips_the_savepoint():
+    connection = FakeConnection(autocommit=True)
+
+    _explain(FakeCursor(connection), "SELECT 1", None)
+
+    assert connection.executed == ["EXPLAIN (ANALYZE, BUFFERS) SELECT 1"]
+
+
+def test_only_select_statements_are_explained():
+    connection = FakeConnection()
+
+    assert _explain(FakeCursor(connection), "UPDATE qr_codes SET scan_count = 1", {}) is None
+    assert connection.executed == []
@@ -0,0 +1,31 @@
+"""
+Unit tests for time zone handling in ScanLogExportParameters.
+"""
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas import ScanLogExportParameters
+
+
+def test_timestamps_without_offset_are_utc():
+    params = ScanLogExportParameters(start_date="2026-01-01T00:00:00", end_date="2026-01-02T00:00:00")
+
+    assert params.start_date == datetime(2026, 1, 1, tzinfo=UTC)
+    assert params.end_date == datetime(2026, 1, 2, tzinfo=UTC)
+
+
+def test_timestamps_with_offset_are_kept():
+    params = ScanLogExportParameters(start_date="2026-01-01T00:00:00+02:00")
+
+    assert params.start_date.utcoffset() == timedelta(hours=2)
+
+
+def test_date_range_compares_naive_and_offset_timestamps_in_utc():
+    # 04:00 UTC is after 05:00+02:00 (03:00 UTC)
+    with pytest.raises(ValidationError, match="start_date must be before end_date"):
+        ScanLogExportParameters(
+            start_date="2026-01-01T04:00:00",
+            end_date=datetime(2026, 1, 1, 5, tzinfo=timezone(timedelta(hours=2))),
+        )
@@ -0,0 +1,40 @@
+"""
+Unit tests for call counting and timing sampling in MetricsLogger.time_service_call.
+"""
+from prometheus_client import REGISTRY
+
+from app.core.metrics_logger import MetricsLogger
+
+
+def samples(operation: str) -> tuple:
+    """Read the call counter and the histogram count for an operation."""
+    labels = {"service_name": "TestService", "operation_name": operation}
+    return (
+        REGISTRY.get_sample_value("service_calls_total", labels) or 0,
+        REGISTRY.get_sample_value("service_call_duration_seconds_count", labels) or 0,
+    )
+
+
+def test_sampled_operation_counts_every_call():
+    @MetricsLogger.time_service_call("TestService", "sampled", sample_every=10)
+    def sampled():
+        return 1
+
+    for _ in range(25):
+        sampled()
+
+    assert samples("sampled") == (25, 3)
+
+
+def test_kill_switch_records_nothing():
+    @MetricsLogger.time_service_call("TestService", "disabled")
+    def disabled():
+        return 1
+
+    MetricsLogger.set_service_call_timing(False)
+    try:
+        disabled()
+    finally:
+        MetricsLogger.set_service_call_timing(True)
+
+    assert samples("disabled") == (0, 0)
@@ -0,0 +1,113 @@
+"""
+Unit tests for the compact SVG emitter and the legacy SVG path in app.utils.qr_imaging.
+"""
+import re
+import xml.etree.ElementTree as ET
+
+import pytest
+import segno
+
+from app.utils.qr_imaging import generate_qr_image
+from app.utils.svg_emitter import SVG_NAMESPACE, build_module_path, render_svg
+
+CONTENT = "https://example.com/r/0123456789abcdef"
+SEGMENT = re.compile(r"([Mm])(-?\d+) (-?\d+(?:\.5)?)h(\d+)")
+
+
+def path_to_matrix(path_data: str, modules: int) -> list:
+    """Draw the run-length encoded path back into a module matrix (border included)."""
+    matrix = [[0] * modules for _ in range(modules)]
+    pen_x, pen_y = 0, 0.0
+    consumed = 0
+    for match in SEGMENT.finditer(path_data):
+        assert match.start() == consumed, f"unexpected path data at {consumed}: {path_data[consumed:]}"
+        consumed = match.end()
+        command, x, y, run = match.group(1), int(match.group(2)), float(match.group(3)), int(match.group(4))
+        if command == "M":
+            pen_x, pen_y = x, y
+        else:
+            pen_x, pen_y = pen_x + x, pen_y + y
+        for column in range(pen_x, pen_x + run):
+            matrix[int(pen_y)][column] = 1
+        pen_x += run
+    assert consumed == len(path_data)
+    return matrix
+
+
+def expected_matrix(qr: segno.QRCode, border: int) -> list:
+    """The QR code matrix with its quiet zone, as 0/1 values."""
+    modules = qr.symbol_size(border=border)[0]
+    matrix = [[0] * modules for _ in range(modules)]
+    for y, row in enumerate(qr.matrix):
+        for x, value in enumerate(row):
+            matrix[y + border][x + border] = 1 if value else 0
+    return matrix
+
+
+def parse(svg: bytes) -> ET.Element:
+    """Parse an SVG document and return its root element."""
+    root = ET.fromstring(svg)
+    assert root.tag == f"{{{SVG_NAMESPACE}}}svg"
+    return root
+
+
+@pytest.mark.parametrize("version", [3, 7, 40])
+@pytest.mark.parametrize("border", [0, 4])
+def test_module_path_round_trips_to_matrix(version, border):
+    qr = segno.make(CONTENT, version=version, error="l")
+    modules = qr.symbol_size(border=border)[0]
+
+    matrix = path_to_matrix(build_module_path(qr.matrix, border), modules)
+
+    assert matrix == expected_matrix(qr, border)
+
+
+def test_empty_matrix_has_no_path():
+    assert build_module_path([[0, 0], [0, 0]], border=4) == ""
+
+
+def test_render_svg_draws_the_matrix_in_module_units():
+    qr = segno.make(CONTENT, error="m")
+    modules = qr.symbol_size(border=4)[0]
+
+    root = parse(render_svg(qr, border=4, dark="#1A2B3C", light="#FFFFFF", title="QR & code"))
+
+    assert root.get("viewBox") == f"0 0 {modules} {modules}"
+    assert root.get("width") == root.get("height") == str(modules)
+    assert root.find(f"{{{SVG_NAMESPACE}}}title").text == "QR & code"
+    background, dark = root.findall(f"{{{SVG_NAMESPACE}}}path")
+    assert background.get("fill") == "#fff"
+    assert dark.get("stroke") == "#1A2B3C"
+    assert path_to_matrix(dark.get("d"), modules) == expected_matrix(qr, 4)
+
+
+def test_render_svg_without_background():
+    root = parse(render_svg(segno.make(CONTENT), light=None))
+
+    assert len(root.findall(f"{{{SVG_NAMESPACE}}}path")) == 1
+
+
+def test_legacy_svg_uses_pixel_size():
+    """Without physical units the document is `size` pixels wide (not 10 px per module)."""
+    qr = segno.make(CONTENT, error="m")
+    modules = qr.symbol_size(border=4)[0]
+
+    root = parse(generate_qr_image(CONTENT, "svg", size=300, error_level="m"))
+
+    assert root.get("width") == root.get("height") == "300"
+    assert root.get("viewBox") == f"0 0 {modules} {modules}"
+    dark = root.findall(f"{{{SVG_NAMESPACE}}}path")[-1]
+    assert path_to_matrix(dark.get("d"), modules) == expected_matrix(qr, 4)
+
+
+@pytest.mark.parametrize("physical_size, unit, expected", [(2, "in", "2in"), (2.5, "cm", "2.5cm"), (30, "mm", "30mm")])
+def test_legacy_svg_uses_physical_units(physical_size, unit, expected):
+    qr = segno.make(CONTENT, error="m")
+    modules = qr.symbol_size(border=2)[0]
+
+    root = parse(generate_qr_image(
+        CONTENT, "svg", border=2, error_level="m", physical_size=physical_size, physical_unit=unit, dpi=300,
+    ))
+
+    assert root.get("width") == root.get("height") == expected
+    assert root.get("viewBox") == f"0 0 {modules} {modules}"